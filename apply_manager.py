@@ -1,8 +1,15 @@
+import hashlib
 import os
-import shutil
 import zipfile
 import json
-from utils.colors import info
+import deploy_state
+import hash_cache
+import mpack
+import staging
+import store_manager
+import trash
+from transfer import TransferEngine, ZipReader, extract_zip, workers_from_config
+from utils.colors import info, warn
 
 DEFAULT_TARGETS = [
     "mods",
@@ -45,66 +52,111 @@ def get_copy_targets(pack_meta: dict | None) -> list:
     return _get_copy_targets(pack_meta)
 
 
-def _safe_extract_zip(zip_path: str, extract_to: str):
-    """Safely extract a zip file into extract_to (prevents zip-slip)."""
+def _safe_extract_zip(zip_path: str, extract_to: str, workers: int | None = None):
+    """Safely extract a zip file into extract_to (prevents zip-slip).
+
+    Members are decompressed in parallel by the transfer engine.
+    """
 
     os.makedirs(extract_to, exist_ok=True)
     base = os.path.abspath(extract_to)
 
+    members = []
+    targets = {}
     with zipfile.ZipFile(zip_path, "r") as zf:
         for member in zf.infolist():
-            if member.filename.endswith("/"):
-                continue
             target_path = os.path.abspath(os.path.join(extract_to, member.filename))
             if not target_path.startswith(base + os.sep) and target_path != base:
                 raise RuntimeError(f"Unsafe zip entry path: {member.filename}")
-        zf.extractall(extract_to)
+            if member.is_dir():
+                os.makedirs(target_path, exist_ok=True)
+                continue
+            members.append(member)
+            targets[member.filename] = target_path
 
+    with TransferEngine(workers) as engine:
+        extract_zip(zip_path, members, lambda m: targets[m.filename], engine)
 
-def _resolve_pack_source_dir(pack_path: str, targets: list[str]) -> str:
-    """Return a directory that contains any of the targets.
 
-    If the pack doesn't have e.g. pack_path/mods, but contains a .zip, extract it
-    into a cache folder and use that extracted directory as the source.
-    """
+def _find_pack_archive(pack_path: str, targets: list[str], extension: str) -> str | None:
+    """Return the pack's archive with extension if it has no unpacked targets, else None."""
 
     for name in targets:
         if os.path.exists(os.path.join(pack_path, name)):
-            return pack_path
+            return None
 
-    zips = [
+    archives = [
         os.path.join(pack_path, f)
         for f in os.listdir(pack_path)
-        if f.lower().endswith(".zip") and os.path.isfile(os.path.join(pack_path, f))
+        if f.lower().endswith(extension) and os.path.isfile(os.path.join(pack_path, f))
     ]
-    if not zips:
+    if not archives:
+        return None
+
+    # If multiple archives exist, prefer the first in sorted order for determinism.
+    archives.sort()
+    return archives[0]
+
+
+def _find_pack_zip(pack_path: str, targets: list[str]) -> str | None:
+    return _find_pack_archive(pack_path, targets, ".zip")
+
+
+def _find_pack_mpack(pack_path: str, targets: list[str]) -> str | None:
+    return _find_pack_archive(pack_path, targets, mpack.MPACK_EXTENSION)
+
+
+def _zip_fingerprint(zip_path: str) -> str:
+    """Hash of the central directory (names, CRCs, sizes); no member is read."""
+
+    h = hashlib.sha256()
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        for member in sorted(zf.infolist(), key=lambda m: m.filename):
+            h.update(f"{member.filename}\0{member.CRC:08x}\0{member.file_size}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_marker(marker_path: str) -> dict:
+    try:
+        with open(marker_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _resolve_pack_source_dir(pack_path: str, targets: list[str], workers: int | None = None) -> str:
+    """Return a directory that contains any of the targets.
+
+    If the pack doesn't have e.g. pack_path/mods, but contains a .zip, extract it
+    into a cache folder and use that extracted directory as the source.
+
+    The cache is keyed on the zip's central-directory fingerprint; a zip that
+    was merely touched is re-fingerprinted but not re-extracted.
+    """
+
+    zip_path = _find_pack_zip(pack_path, targets)
+    if not zip_path:
         return pack_path
 
-    # If multiple zips exist, prefer the first in sorted order for determinism.
-    zips.sort()
-    zip_path = zips[0]
     cache_dir = os.path.join(pack_path, ".cache")
     extracted_dir = os.path.join(cache_dir, os.path.splitext(os.path.basename(zip_path))[0])
     marker_path = os.path.join(extracted_dir, ".extracted.ok")
 
-    zip_mtime = os.path.getmtime(zip_path)
-    needs_extract = True
-    if os.path.exists(marker_path):
-        try:
-            with open(marker_path, "r", encoding="utf-8") as f:
-                saved = float(f.read().strip() or "0")
-            needs_extract = saved != zip_mtime
-        except Exception:
-            needs_extract = True
-
-    if needs_extract:
+    st = os.stat(zip_path)
+    marker = _read_marker(marker_path)
+    if marker.get("size") == st.st_size and marker.get("mtime") == st.st_mtime_ns:
+        return extracted_dir
+
+    fingerprint = _zip_fingerprint(zip_path)
+    if marker.get("fingerprint") != fingerprint:
         info(f"팩 ZIP 압축 해제 중: {os.path.basename(zip_path)}")
-        if os.path.exists(extracted_dir):
-            shutil.rmtree(extracted_dir)
+        trash.discard(extracted_dir, pack_path)
         os.makedirs(extracted_dir, exist_ok=True)
-        _safe_extract_zip(zip_path, extracted_dir)
-        with open(marker_path, "w", encoding="utf-8") as f:
-            f.write(str(zip_mtime))
+        _safe_extract_zip(zip_path, extracted_dir, workers)
+
+    with open(marker_path, "w", encoding="utf-8") as f:
+        json.dump({"size": st.st_size, "mtime": st.st_mtime_ns, "fingerprint": fingerprint}, f)
 
     return extracted_dir
 
@@ -114,10 +166,11 @@ def clear_environment(minecraft_path: str, targets: list[str] | None = None):
     for name in targets:
         path = os.path.join(minecraft_path, name)
         if os.path.isdir(path):
-            shutil.rmtree(path)
+            trash.discard(path, minecraft_path)
             os.makedirs(path, exist_ok=True)
         elif os.path.exists(path):
             os.remove(path)
+    deploy_state.clear_deployment(minecraft_path)
 
 def cleanup_environment(minecraft_path: str, targets: list[str] | None = None):
     info("모드 환경 정리 중...")
@@ -125,36 +178,273 @@ def cleanup_environment(minecraft_path: str, targets: list[str] | None = None):
     for name in targets:
         path = os.path.join(minecraft_path, name)
         if os.path.isdir(path):
-            shutil.rmtree(path)
+            trash.discard(path, minecraft_path)
         elif os.path.exists(path):
             os.remove(path)
+    deploy_state.clear_deployment(minecraft_path)
 
-def apply_pack(pack_path: str, minecraft_path: str, pack_meta: dict | None = None):
-    if pack_meta is None:
-        pack_meta = _load_manifest(pack_path)
+def _deploy_file(engine: TransferEngine, entry: dict, dst: str, use_store: bool, minecraft_path: str):
+    if os.path.isdir(dst) and not os.path.islink(dst):
+        # A directory where the pack now has a file.
+        trash.discard(dst, minecraft_path)
+    if "member" in entry:
+        if os.path.lexists(dst):
+            os.remove(dst)
+        engine.submit(entry["reader"].extract, entry["member"], dst, label=dst)
+    elif use_store:
+        engine.submit(store_manager.deploy, entry["hash"], dst, label=dst)
+    else:
+        if os.path.lexists(dst):
+            os.remove(dst)
+        engine.copy(entry["src"], dst)
 
-    targets = _get_copy_targets(pack_meta)
-    src_root = _resolve_pack_source_dir(pack_path, targets)
 
+def _iter_source_files(src: str, dst: str):
+    """Yield (source file, destination file) pairs below src."""
+
+    if not os.path.isdir(src):
+        yield src, dst
+        return
+
+    for root, _dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        out_dir = dst if rel == "." else os.path.join(dst, rel)
+        for fname in files:
+            yield os.path.join(root, fname), os.path.join(out_dir, fname)
+
+
+def _rel(path: str, minecraft_path: str) -> str:
+    return os.path.relpath(path, minecraft_path).replace(os.sep, "/")
+
+
+def _build_plan(engine: TransferEngine, src_root: str, minecraft_path: str,
+                targets: list[str], use_store: bool) -> dict:
+    """Map every destination (relative to minecraft_path) to its source and digest."""
+
+    hasher = store_manager.ingest if use_store else hash_cache.file_digest
+    pairs = []
     for name in targets:
         src = os.path.join(src_root, name)
         if not os.path.exists(src):
             continue
 
-        dst = os.path.join(minecraft_path, name)
         info(f"{name} 적용 중...")
+        for s, t in _iter_source_files(src, os.path.join(minecraft_path, name)):
+            engine.submit(hasher, s, label=s)
+            pairs.append((s, _rel(t, minecraft_path)))
+
+    digests = engine.wait()
+    return {rel: {"src": s, "hash": digest} for (s, rel), digest in zip(pairs, digests)}
+
+
+def _build_zip_plan(reader: ZipReader, minecraft_path: str, targets: list[str]) -> dict:
+    """Plan deploying targets straight out of the pack zip.
+
+    Every member is zip-slip checked against its own target directory. The
+    content id is the member's CRC32 and size from the central directory.
+    """
+
+    wanted = set(targets)
+    plan = {}
+    announced = set()
+    with zipfile.ZipFile(reader.zip_path, "r") as zf:
+        for member in zf.infolist():
+            if member.is_dir():
+                continue
+            name = member.filename.replace("\\", "/")
+            top = name.split("/", 1)[0]
+            if top not in wanted:
+                continue
+
+            base = os.path.abspath(os.path.join(minecraft_path, top))
+            target_path = os.path.abspath(os.path.join(minecraft_path, name))
+            if not target_path.startswith(base + os.sep) and target_path != base:
+                raise RuntimeError(f"Unsafe zip entry path: {member.filename}")
+
+            if top not in announced:
+                announced.add(top)
+                info(f"{top} 적용 중...")
+            plan[_rel(target_path, minecraft_path)] = {
+                "reader": reader,
+                "member": member,
+                "hash": f"crc32:{member.CRC:08x}:{member.file_size}",
+            }
+    return plan
+
+
+def _build_mpack_plan(reader: mpack.MPackReader, minecraft_path: str, targets: list[str]) -> dict:
+    """Plan deploying targets straight out of a .mpack; entries carry their sha256."""
+
+    wanted = set(targets)
+    plan = {}
+    announced = set()
+    for name, entry in reader.entries.items():
+        top = name.split("/", 1)[0]
+        if top not in wanted:
+            continue
+
+        base = os.path.abspath(os.path.join(minecraft_path, top))
+        target_path = os.path.abspath(os.path.join(minecraft_path, name))
+        if not target_path.startswith(base + os.sep) and target_path != base:
+            raise RuntimeError(f"Unsafe mpack entry path: {name}")
+
+        if top not in announced:
+            announced.add(top)
+            info(f"{top} 적용 중...")
+        plan[_rel(target_path, minecraft_path)] = {"reader": reader, "member": entry, "hash": entry["hash"]}
+    return plan
+
 
-        if os.path.isdir(src):
-            os.makedirs(dst, exist_ok=True)
-            for item in os.listdir(src):
-                s = os.path.join(src, item)
-                t = os.path.join(dst, item)
-                if os.path.isdir(s):
-                    shutil.copytree(s, t, dirs_exist_ok=True)
-                else:
-                    shutil.copy2(s, t)
+def _remove_stale(minecraft_path: str, targets: list[str], plan: dict) -> int:
+    """Delete everything under targets that the plan doesn't deploy."""
+
+    removed = 0
+    for name in targets:
+        path = os.path.join(minecraft_path, name)
+        if not os.path.isdir(path):
+            if os.path.lexists(path) and name not in plan:
+                os.remove(path)
+                removed += 1
+            continue
+
+        for root, _dirs, files in os.walk(path, topdown=False):
+            for fname in files:
+                full = os.path.join(root, fname)
+                if _rel(full, minecraft_path) not in plan:
+                    os.remove(full)
+                    removed += 1
+            if root != path and not os.listdir(root):
+                os.rmdir(root)
+    return removed
+
+
+def _stage_plan(engine: TransferEngine, plan: dict, previous: dict, minecraft_path: str,
+                use_store: bool, stats: dict, records: dict) -> list:
+    """Build the complete target layout in the staging directory.
+
+    Files that are unchanged in the live tree are linked (jars) or
+    copied/reflinked (configs) from there instead of being redeployed.
+    """
+
+    stage = staging.reset_staging(minecraft_path)
+    written = []
+    for rel, entry in plan.items():
+        live = os.path.join(minecraft_path, *rel.split("/"))
+        dst = os.path.join(stage, *rel.split("/"))
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+
+        if deploy_state.is_current(live, previous.get(rel), entry["hash"]):
+            engine.submit(store_manager.link_or_copy, live, dst, store_manager.is_immutable(dst), label=dst)
+            records[rel] = previous[rel]
+            stats["unchanged"] += 1
+            continue
+
+        _deploy_file(engine, entry, dst, use_store, minecraft_path)
+        written.append((rel, dst))
+        stats["replaced" if os.path.lexists(live) else "added"] += 1
+
+    stats["removed"] = sum(1 for rel in previous if rel not in plan)
+    return written
+
+
+def rollback_pack(minecraft_path: str, targets: list[str] | None = None) -> bool:
+    """Swap the layout replaced by the last staged apply back in."""
+
+    targets = targets or list(DEFAULT_TARGETS)
+    staging.recover(minecraft_path)
+    if not staging.rollback(minecraft_path, targets):
+        return False
+    info("이전 모드팩 환경으로 롤백 완료")
+    return True
+
+
+def apply_pack(pack_path: str, minecraft_path: str, pack_meta: dict | None = None,
+               config: dict | None = None, pack_id: str | None = None) -> dict:
+    """Deploy the pack into minecraft_path.
+
+    With use_store (default on) every file goes through the content-addressed
+    store and is hardlinked/reflinked into place instead of copied. With
+    zip_mode="stream" a zipped pack is written straight from the archive into
+    minecraft_path, skipping the .cache extraction. A .mpack pack is always
+    read that way, through its memory map.
+
+    The result is recorded in a deployment manifest under pack_id (the
+    pack's directory name unless given); the next apply only writes files
+    whose hash or on-disk stat differs and deletes whatever the new pack
+    doesn't contain, so there is no need to clear_environment first.
+
+    With deploy_mode="staged" the full layout is prepared in a staging
+    directory and switched in with renames; the replaced layout is kept
+    for rollback_pack.
+    Returns counts of added/replaced/removed/unchanged files and bytes written.
+    """
+
+    if pack_meta is None:
+        pack_meta = _load_manifest(pack_path)
+    config = config or {}
+    use_store = config.get("use_store", True)
+    workers = workers_from_config(config)
+
+    targets = _get_copy_targets(pack_meta)
+    zip_path = None
+    mpack_path = _find_pack_mpack(pack_path, targets)
+    if not mpack_path and config.get("zip_mode", "cache") == "stream":
+        zip_path = _find_pack_zip(pack_path, targets)
+    if mpack_path or zip_path:
+        src_root = pack_path
+    else:
+        src_root = _resolve_pack_source_dir(pack_path, targets, workers)
+    staged = config.get("deploy_mode", "incremental") == "staged"
+    if staging.recover(minecraft_path):
+        warn("중단된 모드팩 전환을 마무리했습니다.")
+
+    previous = deploy_state.load_deployment(minecraft_path).get("files", {})
+    stats = {"added": 0, "replaced": 0, "removed": 0, "unchanged": 0, "bytes": 0}
+    records = {}
+
+    reader = mpack.MPackReader(mpack_path) if mpack_path else ZipReader(zip_path or "")
+    with TransferEngine(workers) as engine, reader:
+        if mpack_path:
+            info(f"팩 아카이브 적용: {os.path.basename(mpack_path)}")
+            plan = _build_mpack_plan(reader, minecraft_path, targets)
+        elif zip_path:
+            info(f"팩 ZIP 스트리밍 적용: {os.path.basename(zip_path)}")
+            plan = _build_zip_plan(reader, minecraft_path, targets)
+        else:
+            plan = _build_plan(engine, src_root, minecraft_path, targets, use_store)
+
+        if staged:
+            written = _stage_plan(engine, plan, previous, minecraft_path, use_store, stats, records)
         else:
-            os.makedirs(os.path.dirname(dst), exist_ok=True)
-            shutil.copy2(src, dst)
+            stats["removed"] = _remove_stale(minecraft_path, targets, plan)
+            written = []
+            for rel, entry in plan.items():
+                dst = os.path.join(minecraft_path, *rel.split("/"))
+                if deploy_state.is_current(dst, previous.get(rel), entry["hash"]):
+                    records[rel] = previous[rel]
+                    stats["unchanged"] += 1
+                    continue
+
+                existed = os.path.lexists(dst)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                _deploy_file(engine, entry, dst, use_store, minecraft_path)
+                written.append((rel, dst))
+                stats["replaced" if existed else "added"] += 1
+        engine.wait()
+
+    for rel, dst in written:
+        records[rel] = deploy_state.file_record(dst, plan[rel]["hash"])
+        stats["bytes"] += records[rel]["size"]
+
+    if staged:
+        staging.switch(minecraft_path, targets)
 
-    info("모드팩 적용 완료")
+    pack_id = pack_id or os.path.basename(os.path.normpath(pack_path))
+    deploy_state.save_deployment(minecraft_path, pack_id, records)
+    hash_cache.save()
+    info(
+        "모드팩 적용 완료 "
+        f"(추가 {stats['added']}, 교체 {stats['replaced']}, "
+        f"삭제 {stats['removed']}, 유지 {stats['unchanged']})"
+    )
+    return stats
@@ -0,0 +1,130 @@
+"""Time every phase of the apply/cleanup pipeline on synthetic packs.
+
+    python benchmarks/bench_pipeline.py --jars 200 --jar-size-kb 512 --runs 5
+    python benchmarks/bench_pipeline.py --zipped --config '{"zip_mode": "stream"}'
+
+Everything happens in a scratch directory (fake .minecraft, packs/, store,
+caches), fully offline. The result is JSON with min/p50/p90/p99/max/mean
+seconds per phase, so runs of different versions can be diffed.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import Timer, summarize  # noqa: E402
+import synth  # noqa: E402
+
+
+def run(args) -> dict:
+    import apply_manager
+    import loader_manager
+    import pack_manager
+    import trash
+    from utils import logger
+
+    config = json.loads(args.config) if args.config else {}
+    samples: dict[str, list[float]] = {}
+
+    def timed(name, fn, *a, **kw):
+        with Timer() as t, contextlib.redirect_stdout(io.StringIO()):
+            result = fn(*a, **kw)
+        samples.setdefault(name, []).append(t.elapsed)
+        return result
+
+    packs_dir = os.path.abspath(pack_manager.PACKS_DIR)
+    pack_path = synth.make_pack(
+        packs_dir, "bench-pack",
+        jars=args.jars, jar_size=args.jar_size_kb * 1024,
+        config_depth=args.config_depth, config_breadth=args.config_breadth,
+        config_files=args.config_files, zipped=args.zipped,
+    )
+    mc = synth.make_minecraft(os.path.abspath(".minecraft"))
+    meta = {"id": "bench-pack", "mc_version": "1.21", "loader": "fabric"}
+    targets = apply_manager.get_copy_targets(meta)
+    zip_path = apply_manager._find_pack_zip(pack_path, targets)
+
+    for _ in range(args.runs):
+        pack_manager._index = None
+        timed("scan_packs", pack_manager.scan_packs)
+        timed("clear_environment", apply_manager.clear_environment, mc, targets)
+        timed("apply_pack", apply_manager.apply_pack, pack_path, mc, meta, config)
+        timed("apply_pack_noop", apply_manager.apply_pack, pack_path, mc, meta, config)
+
+        if zip_path:
+            out = os.path.abspath("extract-bench")
+            timed("safe_extract_zip", apply_manager._safe_extract_zip, zip_path, out,
+                  config.get("transfer_workers"))
+            shutil.rmtree(out)
+
+        synth.make_fabric_install(mc)
+        timed("cleanup_loader", loader_manager.cleanup_loader, meta, mc, config)
+        timed("cleanup_environment", apply_manager.cleanup_environment, mc, targets)
+        # Deletion now happens in the background; time it separately so it
+        # doesn't leak into the next run's phases.
+        timed("trash_reclaim", trash.wait_idle)
+
+        # Drop the pack's .cache so every zipped run measures a real extraction.
+        shutil.rmtree(os.path.join(pack_path, ".cache"), ignore_errors=True)
+
+    logger.flush()
+    return {
+        "params": {
+            "jars": args.jars,
+            "jar_size_kb": args.jar_size_kb,
+            "config_depth": args.config_depth,
+            "config_breadth": args.config_breadth,
+            "config_files": args.config_files,
+            "zipped": args.zipped,
+            "runs": args.runs,
+            "config": config,
+        },
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "phases": {name: summarize(values) for name, values in samples.items()},
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jars", type=int, default=100)
+    ap.add_argument("--jar-size-kb", type=int, default=256)
+    ap.add_argument("--config-depth", type=int, default=2)
+    ap.add_argument("--config-breadth", type=int, default=3)
+    ap.add_argument("--config-files", type=int, default=4)
+    ap.add_argument("--zipped", action="store_true")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--config", default=None, help="JSON object merged as Modular config")
+    ap.add_argument("--dir", default=None, help="scratch directory (default: system temp)")
+    ap.add_argument("--out", default=None, help="write the JSON here instead of stdout")
+    args = ap.parse_args(argv)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        os.chdir(tmp)
+        try:
+            result = run(args)
+        finally:
+            os.chdir(cwd)
+
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
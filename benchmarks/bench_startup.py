@@ -0,0 +1,63 @@
+"""Measure how long it takes until Modular can show its prompt.
+
+    python benchmarks/bench_startup.py --runs 20
+
+Each run imports main (what `python main.py` does before print_banner) in a
+fresh interpreter. Reports wall-time percentiles, the interpreter baseline
+and which heavy modules got imported eagerly.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import summarize  # noqa: E402
+
+HEAVY_MODULES = [
+    "psutil", "subprocess", "urllib.request", "zipfile", "concurrent.futures",
+    "apply_manager", "loader_manager", "launcher", "pack_manager",
+]
+
+_PROBE = (
+    "import sys, json; import main; "
+    f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+)
+
+
+def _time(code: str) -> tuple[float, str]:
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, out.stdout
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    baseline = [_time("pass")[0] for _ in range(args.runs)]
+    samples = []
+    loaded = []
+    for _ in range(args.runs):
+        elapsed, out = _time(_PROBE)
+        samples.append(elapsed)
+        loaded = json.loads(out.strip().splitlines()[-1])
+
+    result = {
+        "python": sys.version.split()[0],
+        "interpreter_baseline": summarize(baseline),
+        "import_main": summarize(samples),
+        "eager_heavy_modules": loaded,
+    }
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
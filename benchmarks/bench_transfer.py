@@ -0,0 +1,95 @@
+"""Serial vs. TransferEngine copy/extract benchmark.
+
+    python benchmarks/bench_transfer.py --files 400 --size-kb 512 --workers 8
+
+Prints a JSON object with the timings of the old serial path (copy2 loop,
+ZipFile.extractall) and of the engine, plus the speedup.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transfer import TransferEngine, extract_zip  # noqa: E402
+
+
+def _make_tree(root: str, files: int, size: int):
+    os.makedirs(root, exist_ok=True)
+    for i in range(files):
+        with open(os.path.join(root, f"mod-{i:05d}.jar"), "wb") as f:
+            f.write(os.urandom(size))
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=400)
+    ap.add_argument("--size-kb", type=int, default=512)
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--dir", default=None, help="scratch directory (default: system temp)")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        src = os.path.join(tmp, "src")
+        _make_tree(src, args.files, args.size_kb * 1024)
+        names = sorted(os.listdir(src))
+
+        zip_path = os.path.join(tmp, "pack.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in names:
+                zf.write(os.path.join(src, name), f"mods/{name}")
+
+        def serial_copy():
+            dst = os.path.join(tmp, "serial-copy")
+            os.makedirs(dst)
+            for name in names:
+                shutil.copy2(os.path.join(src, name), os.path.join(dst, name))
+
+        def engine_copy():
+            dst = os.path.join(tmp, "engine-copy")
+            os.makedirs(dst)
+            with TransferEngine(args.workers) as engine:
+                for name in names:
+                    engine.copy(os.path.join(src, name), os.path.join(dst, name))
+                engine.wait()
+
+        def serial_extract():
+            with zipfile.ZipFile(zip_path) as zf:
+                zf.extractall(os.path.join(tmp, "serial-extract"))
+
+        def engine_extract():
+            dst = os.path.join(tmp, "engine-extract")
+            with zipfile.ZipFile(zip_path) as zf:
+                members = [m for m in zf.infolist() if not m.is_dir()]
+            with TransferEngine(args.workers) as engine:
+                extract_zip(zip_path, members, lambda m: os.path.join(dst, m.filename), engine)
+
+        result = {
+            "files": args.files,
+            "size_kb": args.size_kb,
+            "workers": args.workers,
+            "copy": {"serial_s": _timed(serial_copy), "engine_s": _timed(engine_copy)},
+            "extract": {"serial_s": _timed(serial_extract), "engine_s": _timed(engine_extract)},
+        }
+        for phase in ("copy", "extract"):
+            r = result[phase]
+            r["speedup"] = round(r["serial_s"] / r["engine_s"], 2) if r["engine_s"] else None
+
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
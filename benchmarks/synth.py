@@ -0,0 +1,101 @@
+"""Synthetic packs and a fake .minecraft for benchmarks."""
+
+import json
+import os
+import random
+import zipfile
+
+
+def make_jar(path: str, mod_id: str, size: int, rng: random.Random, mc_version: str = "1.21"):
+    """Write a jar-shaped zip with a fabric.mod.json and ~size bytes of payload."""
+
+    meta = {
+        "schemaVersion": 1,
+        "id": mod_id,
+        "version": "1.0.0",
+        "depends": {"fabricloader": ">=0.15.0", "minecraft": f"~{mc_version}"},
+    }
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+        zf.writestr("fabric.mod.json", json.dumps(meta))
+        zf.writestr(f"{mod_id}/payload.bin", rng.randbytes(max(0, size)))
+
+
+def make_config_tree(root: str, depth: int, breadth: int, files: int, rng: random.Random):
+    """breadth ** depth directories, each holding `files` small text configs."""
+
+    def _fill(path: str, level: int):
+        os.makedirs(path, exist_ok=True)
+        for i in range(files):
+            with open(os.path.join(path, f"option-{i}.toml"), "w", encoding="utf-8") as f:
+                f.write(f"value = {rng.randint(0, 1 << 30)}\n" * 8)
+        if level < depth:
+            for b in range(breadth):
+                _fill(os.path.join(path, f"sub{b}"), level + 1)
+
+    _fill(root, 0)
+
+
+def make_pack(packs_dir: str, pack_id: str, jars: int = 100, jar_size: int = 256 * 1024,
+              config_depth: int = 2, config_breadth: int = 3, config_files: int = 4,
+              zipped: bool = False, loader: str = "fabric", mc_version: str = "1.21",
+              seed: int = 0) -> str:
+    """Create packs_dir/pack_id with a manifest, mods/ and config/.
+
+    With zipped=True the mods/config trees are packed into <pack_id>.zip
+    next to the manifest instead, like a downloaded pack.
+    """
+
+    rng = random.Random(seed)
+    pack_dir = os.path.join(packs_dir, pack_id)
+    content_dir = os.path.join(pack_dir, ".src") if zipped else pack_dir
+    mods_dir = os.path.join(content_dir, "mods")
+    os.makedirs(mods_dir, exist_ok=True)
+
+    for i in range(jars):
+        make_jar(os.path.join(mods_dir, f"mod{i:04d}-1.0.0.jar"), f"mod{i:04d}", jar_size, rng, mc_version)
+    make_config_tree(os.path.join(content_dir, "config"), config_depth, config_breadth, config_files, rng)
+
+    with open(os.path.join(pack_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"id": pack_id, "mc_version": mc_version, "loader": loader}, f)
+
+    if zipped:
+        zip_path = os.path.join(pack_dir, f"{pack_id}.zip")
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for root, _dirs, files in os.walk(content_dir):
+                for fname in files:
+                    full = os.path.join(root, fname)
+                    zf.write(full, os.path.relpath(full, content_dir))
+        for root, dirs, files in os.walk(content_dir, topdown=False):
+            for fname in files:
+                os.remove(os.path.join(root, fname))
+            os.rmdir(root)
+    return pack_dir
+
+
+def make_minecraft(root: str, mc_version: str = "1.21") -> str:
+    """A fake .minecraft with a vanilla version entry and launcher files."""
+
+    os.makedirs(os.path.join(root, "versions", mc_version), exist_ok=True)
+    with open(os.path.join(root, "versions", mc_version, f"{mc_version}.json"), "w", encoding="utf-8") as f:
+        json.dump({"id": mc_version, "type": "release"}, f)
+    with open(os.path.join(root, "launcher_profiles.json"), "w", encoding="utf-8") as f:
+        json.dump({"profiles": {}}, f)
+    return root
+
+
+def make_fabric_install(minecraft_path: str, mc_version: str = "1.21", loader_version: str = "0.16.0",
+                        libraries: int = 20, lib_size: int = 64 * 1024, seed: int = 0) -> str:
+    """Pretend the Fabric installer ran: a version dir plus net/fabricmc jars."""
+
+    rng = random.Random(seed)
+    vid = f"fabric-loader-{loader_version}-{mc_version}"
+    version_dir = os.path.join(minecraft_path, "versions", vid)
+    os.makedirs(version_dir, exist_ok=True)
+    with open(os.path.join(version_dir, f"{vid}.json"), "w", encoding="utf-8") as f:
+        json.dump({"id": vid, "inheritsFrom": mc_version, "libraries": []}, f)
+    for i in range(libraries):
+        lib_dir = os.path.join(minecraft_path, "libraries", "net", "fabricmc", f"lib{i}", "1.0")
+        os.makedirs(lib_dir, exist_ok=True)
+        with open(os.path.join(lib_dir, f"lib{i}-1.0.jar"), "wb") as f:
+            f.write(rng.randbytes(lib_size))
+    return vid
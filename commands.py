@@ -1,90 +1,713 @@
-
 from utils.colors import info, warn, error
-from pack_manager import get_pack
-from apply_manager import apply_pack, clear_environment, cleanup_environment, get_copy_targets
-from loader_manager import ensure_loader, cleanup_loader
-from launcher import launch_minecraft, wait_for_exit
 import os
+import time
 
-from mc_path import load_config, ensure_minecraft_path
-cfg = load_config()
-mc_path = ensure_minecraft_path(cfg)
+STATS_WINDOW = 50
+PROFILE_TOP = 15
 
+# Exit codes for the non-interactive CLI (main.py run/list/clear).
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
 
-def handle_command(command: str, config: dict) -> bool:
-    parts = command.split()
-    cmd = parts[0]
+# Resolved on first use so the prompt doesn't wait on config/path detection.
+_mc_path: str | None = None
 
-    if cmd == "!exit":
-        info("Modular 종료")
-        return False
 
-    elif cmd == "!list":
-        from pack_manager import scan_packs
-        print("[PACKS]")
-        for pid in scan_packs():
-            print(f"- {pid}")
-        return True
+def _resume_trash(mc_path: str):
+    """Hand deletions an earlier run didn't finish to the reclaimer."""
 
-    elif cmd == "!clear":
-        if len(parts) < 2:
-            warn("사용법: !clear <팩이름>")
-            return True
+    from instance_manager import INSTANCES_DIR
+    from pack_manager import PACKS_DIR
+    from trash import child_dirs, resume
+    resume([mc_path] + child_dirs(PACKS_DIR) + child_dirs(INSTANCES_DIR))
 
-        pack_id = parts[1]
-        pack = get_pack(pack_id)
 
-        if not pack:
-            error(f"모드팩 '{pack_id}' 을(를) 찾을 수 없습니다.")
-            return True
+def get_mc_path(interactive: bool = True) -> str | None:
+    global _mc_path
+    if _mc_path is None:
+        from mc_path import load_config, ensure_minecraft_path
+        try:
+            _mc_path = ensure_minecraft_path(load_config(), prompt_once=interactive)
+        except RuntimeError as e:
+            error(str(e))
+            return None
+        _resume_trash(_mc_path)
+    return _mc_path
 
-        if not mc_path or not os.path.exists(mc_path):
-            error("minecraft_path 설정이 올바르지 않습니다.")
-            return True
 
-        info("기존 모드 환경 정리 중...")
-        targets = get_copy_targets(pack["meta"])
-        clear_environment(mc_path, targets)
-        cleanup_loader(pack["meta"], mc_path)
-        info("정리 완료")
+def _checked_mc_path(interactive: bool) -> str | None:
+    mc_path = get_mc_path(interactive)
+    if not mc_path or not os.path.exists(mc_path):
+        error("minecraft_path 설정이 올바르지 않습니다.")
+        return None
+    return mc_path
+
+
+def _find_pack(pack_id: str) -> dict | None:
+    from pack_manager import get_pack
+    pack = get_pack(pack_id)
+    if not pack:
+        error(f"모드팩 '{pack_id}' 을(를) 찾을 수 없습니다.")
+    return pack
+
+
+def _validate_pack(pack: dict, config: dict, session=None) -> bool:
+    """Check the pack's mods against its mc_version/loader before any
+    loader install or launch. False (with the reasons printed) if broken."""
+
+    if not config.get("validate_mods", True):
         return True
+    from contextlib import nullcontext
+    from mod_index import check_pack
 
-    elif cmd == "!run":
-        if len(parts) < 2:
-            warn("사용법: !run <팩이름>")
-            return True
+    with session.span("validate") if session else nullcontext({}) as span:
+        report = check_pack(pack, config)
+        span.update(mods=report["mods"], errors=len(report["errors"]))
+    for message in report["warnings"]:
+        warn(message)
+    for message in report["errors"]:
+        error(message)
+    if report["errors"]:
+        error(f"{pack['id']}: 모드 검사 실패 ({len(report['errors'])}건), 실행을 중단합니다.")
+        return False
+    return True
 
-        pack_id = parts[1]
-        pack = get_pack(pack_id)
 
-        if not pack:
-            error(f"모드팩 '{pack_id}' 을(를) 찾을 수 없습니다.")
-            return True
+def _verify_deployed(pack: dict, game_dir: str, config: dict):
+    """Pre-launch check (verify_before_launch); raises if anything is off."""
 
-        if not mc_path or not os.path.exists(mc_path):
-            error("minecraft_path 설정이 올바르지 않습니다.")
-            return True
+    from verify import problems, verify_pack
+    report = verify_pack(pack, game_dir, config)
+    found = problems(report)
+    if found:
+        for line in found:
+            error(line)
+        raise RuntimeError(f"{len(found)}개 파일 검증 실패")
+    info(f"{report['files']}개 파일 검증 완료 ({report['seconds']:.2f}s)")
+    return report
 
-        info(f"{pack_id} 팩 적용 시작")
-        targets = get_copy_targets(pack["meta"])
-        clear_environment(mc_path, targets)
-        apply_pack(pack["path"], mc_path, pack["meta"])
 
-        ensure_loader(pack["meta"], mc_path)
+def _write_launcher_profile(pack: dict, mc_path: str, loader: dict | None, config: dict) -> dict:
+    """Point the pack's launcher profile at its loader version with JVM
+    arguments sized for it; launcher_profiles.json is backed up first and
+    restored by cleanup. Skipped when no loader version was installed."""
 
-        proc = launch_minecraft()
-        wait_for_exit(proc)
+    from jvm_tuning import java_args
+    from launcher_profiles import backup_profiles, upsert_pack_profile
+
+    if not loader or not loader["version_id"]:
+        return {}
+    if not backup_profiles(mc_path):
+        return {}
+    # Instance mode shares this profile key; a normal run plays in mc_path.
+    fields = {"lastVersionId": loader["version_id"], "gameDir": None}
+    if config.get("jvm_tuning", True):
+        fields["javaArgs"] = " ".join(java_args(pack["meta"], mc_path))
+    key = upsert_pack_profile(mc_path, pack["id"], **fields)
+    if key:
+        info(f"런처 프로필 'Modular - {pack['id']}' 준비됨 ({fields.get('javaArgs', '기본 JVM 인자').split(' ')[0]})")
+    return {"profile": key, **fields}
+
+
+def _start_log_tailer(game_dir: str, config: dict, game=None):
+    """Follow the game's latest.log for boot milestones (tail_log option).
+
+    A directly launched game is read from its stdout instead, which must be
+    drained either way.
+    """
+
+    from log_tailer import LogTailer, StreamTailer
+    if game is not None and game.popen is not None:
+        return StreamTailer(game.popen.stdout).start()
+    if not config.get("tail_log", True):
+        return None
+    return LogTailer.for_game_dir(game_dir).start()
+
+
+def _launch_target(pack: dict, loader: dict | None, mc_path: str, game_dir: str, config: dict) -> dict:
+    """launch_minecraft arguments for launcher_mode "direct": the loader's
+    version (vanilla without a loader) and the tuned JVM arguments."""
+
+    if config.get("launcher_mode") != "direct":
+        return {}
+    from jvm_tuning import java_args
+    return {
+        "version_id": loader["version_id"] if loader and loader["version_id"] else pack["meta"].get("mc_version"),
+        "minecraft_path": mc_path,
+        "game_dir": game_dir,
+        "jvm_args": java_args(pack["meta"], game_dir) if config.get("jvm_tuning", True) else [],
+    }
+
+
+def _record_boot(session, tailer, game, prefix: str = ""):
+    """Stop the tailer and add a span from game start to each milestone."""
+
+    if tailer is None:
+        return
+    tailer.stop()
+    spans = tailer.tracker.spans(game.started_at)
+    for name, start, end in spans:
+        session.add_span(name, start, end, pid=game.pid)
+    for name, start, end in spans:
+        if name == "time_to_menu":
+            info(f"{prefix}메인 메뉴까지 {end - start:.1f}s")
+
+
+def _profile_mods(pack: dict, game_dir: str, game, session, config: dict):
+    """Attribute the session's boot time to mods (profile_mods option)."""
+
+    if not config.get("profile_mods", True):
+        return
+    from mod_profile import profile_session
+    from utils.logger import log
+    try:
+        record = profile_session(pack, game_dir, game, session.id, config)
+    except (OSError, ValueError) as e:
+        log("WARN", f"{pack['id']}: 모드 로딩 시간 분석 실패 ({e})")
+        return
+    if record and record["mods"]:
+        slowest = max(record["mods"].items(), key=lambda kv: sum(kv[1].values()))
+        info(f"[{pack['id']}] 가장 느린 모드: {slowest[0]} ({sum(slowest[1].values()):.2f}s, !profile {pack['id']})")
 
-        cleanup_after_run = config.get("cleanup_after_run", True)
-        if cleanup_after_run:
-            cleanup_loader(pack["meta"], mc_path)
-            cleanup_environment(mc_path, targets)
+
+def _run_instance(pack: dict, mc_path: str, config: dict, interactive: bool = True) -> int:
+    """!run in instance mode: prepare the pack's own game directory, then
+    watch its game in the background and return to the prompt.
+
+    Without a prompt to return to (main.py run) the watch is waited for, so
+    the session is recorded before the process exits.
+    """
+
+    import tracing
+    from instance_manager import prepare_instance
+    from launcher import running_instances, watch_instance
+    from loader_manager import ensure_loader
+
+    pack_id = pack["id"]
+    if pack_id in running_instances():
+        warn(f"{pack_id} 인스턴스가 이미 실행 중입니다.")
+        return EXIT_FAILED
+
+    info(f"{pack_id} 인스턴스 준비 시작")
+    session = tracing.Session(pack_id)
+    if not _validate_pack(pack, config, session):
+        session.finish()
+        return EXIT_FAILED
+    with session.span("ensure_loader") as span:
+        loader = ensure_loader(pack["meta"], mc_path, config)
+        if loader:
+            span["loader_cache"] = loader["cache"]
+            span["version_id"] = loader["version_id"]
+    with session.span("apply") as span:
+        game_dir, stats = prepare_instance(pack, mc_path, config, loader["version_id"] if loader else None)
+        span.update(stats)
+    if config.get("verify_before_launch", False):
+        try:
+            with session.span("verify"):
+                _verify_deployed(pack, game_dir, config)
+        except RuntimeError as e:
+            error(str(e))
+            session.finish()
+            return EXIT_FAILED
+
+    direct = config.get("launcher_mode") == "direct"
+    game = None
+    if direct:
+        from direct_launch import LaunchError
+        from launcher import launch_minecraft
+        try:
+            game = launch_minecraft(config, **_launch_target(pack, loader, mc_path, game_dir, config))
+        except LaunchError as e:
+            error(str(e))
+            session.finish()
+            return EXIT_FAILED
+    tailer = _start_log_tailer(game_dir, config, game)
+
+    started = False
+
+    def _finished(game):
+        nonlocal started
+        started = game.started_at is not None
+        if not started:
+            if tailer is not None:
+                tailer.stop()
+            session.finish()
+            return
+        _record_boot(session, tailer, game, prefix=f"[{pack_id}] ")
+        _profile_mods(pack, game_dir, game, session, config)
+        if game.started_at and game.exited_at:
+            session.add_span("play", game.started_at, game.exited_at, pid=game.pid)
+        session.finish()
+
+    watcher = watch_instance(pack_id, game_dir, config, on_exit=_finished, game=game)
+    if not direct:
+        hint = " (!ps 로 상태 확인)" if interactive else ""
+        info(f"런처에서 'Modular - {pack_id}' 프로필로 실행하세요.{hint}")
+    if not interactive:
+        watcher.join()
+        if not started:
+            return EXIT_FAILED
+    return EXIT_OK
+
+
+def cmd_list(args: list[str], config: dict, interactive: bool = True) -> int:
+    from pack_manager import find_packs
+    mc_version = None
+    loader = None
+    for arg in args:
+        if arg in ("fabric", "forge", "neoforge"):
+            loader = arg
         else:
-            info("cleanup_after_run=false: 모드/로더 정리 생략")
+            mc_version = arg
+    print("[PACKS]")
+    for pid, pack in find_packs(mc_version, loader).items():
+        meta = pack["meta"] if isinstance(pack["meta"], dict) else {}
+        print(f"- {pid} ({meta.get('mc_version', '?')}, {meta.get('loader', '?')})")
+    return EXIT_OK
 
-        info("세션 종료")
-        return True
 
+def cmd_clear(args: list[str], config: dict, interactive: bool = True) -> int:
+    if not args:
+        warn("사용법: !clear <팩이름>")
+        return EXIT_USAGE
+
+    pack = _find_pack(args[0])
+    if not pack:
+        return EXIT_FAILED
+    mc_path = _checked_mc_path(interactive)
+    if not mc_path:
+        return EXIT_FAILED
+
+    from apply_manager import clear_environment, get_copy_targets
+    from launcher_profiles import restore_profiles
+    from loader_manager import cleanup_loader
+
+    info("기존 모드 환경 정리 중...")
+    targets = get_copy_targets(pack["meta"])
+    clear_environment(mc_path, targets)
+    cleanup_loader(pack["meta"], mc_path, config)
+    restore_profiles(mc_path)
+    info("정리 완료")
+    return EXIT_OK
+
+
+def cmd_run(args: list[str], config: dict, interactive: bool = True) -> int:
+    if not args:
+        warn("사용법: !run <팩이름>")
+        return EXIT_USAGE
+
+    pack_id = args[0]
+    pack = _find_pack(pack_id)
+    if not pack:
+        return EXIT_FAILED
+    mc_path = _checked_mc_path(interactive)
+    if not mc_path:
+        return EXIT_FAILED
+
+    if config.get("instance_mode", False):
+        return _run_instance(pack, mc_path, config, interactive)
+
+    import tracing
+    from apply_manager import apply_pack, cleanup_environment, get_copy_targets
+    from launcher import launch_minecraft, wait_for_exit
+    from launcher_profiles import restore_profiles
+    from loader_manager import ensure_loader, cleanup_loader
+    from orchestrator import Step, StepFailed, chain, run
+
+    info(f"{pack_id} 팩 적용 시작")
+    session = tracing.Session(pack_id)
+    if not _validate_pack(pack, config, session):
+        session.finish()
+        return EXIT_FAILED
+    targets = get_copy_targets(pack["meta"])
+
+    tailer = None
+
+    direct = config.get("launcher_mode") == "direct"
+
+    def _launch(results):
+        nonlocal tailer
+        wait_start = time.time()
+        if not direct:
+            tailer = _start_log_tailer(mc_path, config)
+        proc = launch_minecraft(config, **_launch_target(pack, results["ensure_loader"], mc_path, mc_path, config))
+        if direct:
+            tailer = _start_log_tailer(mc_path, config, proc)
+        session.add_span("launch_wait", wait_start, proc.detected_at or time.time())
+        session.add_span("pre_launch", session.started_at, proc.detected_at or time.time())
+        return proc
+
+    def _play(results):
+        proc = results["launch"]
+        wait_for_exit(proc)
+        _record_boot(session, tailer, proc)
+        _profile_mods(pack, mc_path, proc, session, config)
+        if proc.started_at and proc.exited_at:
+            session.add_span("play", proc.started_at, proc.exited_at, pid=proc.pid)
+
+    def _loader_attrs(loader):
+        return {"loader_cache": loader["cache"], "version_id": loader["version_id"]} if loader else {}
+
+    # apply and ensure_loader touch disjoint parts of the game directory, so
+    # they overlap; so do the two cleanups once the game has exited. The
+    # optional verify pass overlaps with ensure_loader too. Cleanups also
+    # run when an earlier step failed. The deployed files and their manifest
+    # are kept by default (keep_deployment), so the next !run only applies
+    # what changed; cleanup then restores just the loader and launcher state.
+    steps = [
+        Step("apply", lambda r: apply_pack(pack["path"], mc_path, pack["meta"], config, pack["id"]), describe=dict),
+        Step("ensure_loader", lambda r: ensure_loader(pack["meta"], mc_path, config), describe=_loader_attrs),
+    ]
+    launch_deps = ("apply", "ensure_loader")
+    if config.get("verify_before_launch", False):
+        steps.append(Step("verify", lambda r: _verify_deployed(pack, mc_path, config),
+                          deps=("apply",), describe=lambda rep: {"files": rep["files"]}))
+        launch_deps += ("verify",)
+    write_profile = config.get("launcher_profile", True) and not direct
+    if write_profile:
+        steps.append(Step("launcher_profile", lambda r: _write_launcher_profile(pack, mc_path, r["ensure_loader"], config),
+                          deps=("apply", "ensure_loader"), describe=dict))
+        launch_deps += ("launcher_profile",)
+    steps += [
+        Step("launch", _launch, deps=launch_deps, traced=False),
+        Step("play", _play, deps=("launch",), traced=False),
+    ]
+    cleanup_after_run = config.get("cleanup_after_run", True)
+    keep_deployment = config.get("keep_deployment", True)
+    if cleanup_after_run:
+        steps.append(Step("cleanup_loader", lambda r: cleanup_loader(pack["meta"], mc_path, config),
+                          deps=("play",), always=True))
+        if not keep_deployment:
+            steps.append(Step("cleanup_environment", lambda r: cleanup_environment(mc_path, targets),
+                              deps=("play",), always=True))
+        if write_profile:
+            steps.append(Step("cleanup_profile", lambda r: restore_profiles(mc_path), deps=("play",), always=True))
+    if not config.get("parallel_run", True):
+        steps = chain(steps)
+
+    try:
+        run(steps, session)
+    except StepFailed as e:
+        if tailer is not None:
+            tailer.stop()
+        if write_profile:
+            restore_profiles(mc_path)
+        error(str(e))
+        session.finish()
+        return EXIT_FAILED
+    except KeyboardInterrupt:
+        # The game keeps running; nothing is cleaned up under it.
+        warn("실행 중단 (게임은 계속 실행될 수 있습니다)")
+        session.finish()
+        raise
+
+    if not cleanup_after_run:
+        info("cleanup_after_run=false: 모드/로더 정리 생략")
+    elif keep_deployment:
+        info("적용된 모드는 유지됩니다 (다음 실행은 변경분만 적용, !clear 로 제거)")
+
+    session.finish()
+    info(f"세션 종료 ({session.id})")
+    return EXIT_OK
+
+
+def cmd_check(args: list[str], config: dict, interactive: bool = True) -> int:
+    if not args:
+        warn("사용법: !check <팩이름>")
+        return EXIT_USAGE
+    pack = _find_pack(args[0])
+    if not pack:
+        return EXIT_FAILED
+    if not _validate_pack(pack, dict(config, validate_mods=True)):
+        return EXIT_FAILED
+    info(f"{pack['id']}: 모드 검사 통과")
+    return EXIT_OK
+
+
+def _mib(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f} MiB"
+
+
+def cmd_gc(args: list[str], config: dict, interactive: bool = True) -> int:
+    dry_run = "--dry-run" in args or "report" in args
+    from dedup import gc
+
+    # The live/rollback deployments pin store objects; without a game
+    # directory only packs and instances are considered.
+    stats = gc(get_mc_path(interactive), dry_run=dry_run)
+    print(f"[GC] 팩 파일 {stats['files']}개, {_mib(stats['bytes'])}")
+    print(f"- 중복: {_mib(stats['duplicate_bytes'])}")
+    print(f"- 오래된 .cache 압축 해제: {stats['extractions']}개")
+    print(f"- 참조 없는 저장소 객체: {stats['objects']}개")
+    if dry_run:
+        info(f"회수 가능: {_mib(stats['reclaimable'])} (!gc 로 정리)")
     else:
+        info(f"정리 완료: 링크 {stats['linked']}개, {_mib(stats['freed'])} 회수")
+    return EXIT_OK
+
+
+def _mpack_build(args: list[str], config: dict) -> int:
+    from apply_manager import _load_manifest, _resolve_pack_source_dir, get_copy_targets
+    from mpack import MPACK_EXTENSION, build
+    from pack_manager import get_pack
+    from transfer import workers_from_config
+
+    source = args[0]
+    pack = get_pack(source)
+    if pack:
+        meta = pack["meta"]
+        targets = get_copy_targets(meta)
+        src_dir = _resolve_pack_source_dir(pack["path"], targets, workers_from_config(config))
+    elif os.path.isdir(source):
+        meta = _load_manifest(source)
+        targets = get_copy_targets(meta)
+        src_dir = source
+    else:
+        error(f"모드팩 또는 폴더 '{source}' 을(를) 찾을 수 없습니다.")
+        return EXIT_FAILED
+
+    out = args[1] if len(args) > 1 else os.path.basename(os.path.normpath(source)) + MPACK_EXTENSION
+    info(f"팩 아카이브 생성 중: {out}")
+    stats = build(src_dir, out, targets, meta)
+    info(f"{stats['entries']}개 항목, {_mib(stats['size'])} -> {_mib(stats['packed'])}")
+    return EXIT_OK
+
+
+def _mpack_inspect(args: list[str], verify: bool) -> int:
+    from mpack import MPackError, MPackReader
+
+    try:
+        reader = MPackReader(args[0])
+    except (OSError, MPackError) as e:
+        error(str(e))
+        return EXIT_FAILED
+
+    with reader:
+        entries = list(reader.entries.values())
+        meta = reader.meta
+        print(f"[MPACK] {args[0]} ({meta.get('id', '?')}, {meta.get('mc_version', '?')}, {meta.get('loader', '?')})")
+        if not verify:
+            print(f"{'method':<8}{'size':>12}{'packed':>12}  path")
+            for entry in entries:
+                print(f"{entry['method']:<8}{entry['size']:>12}{entry['length']:>12}  {entry['path']}")
+        size = sum(e["size"] for e in entries)
+        packed = sum(e["length"] for e in entries)
+        print(f"{len(entries)}개 항목, {_mib(size)} -> {_mib(packed)}")
+        if verify:
+            bad = reader.verify()
+            for path in bad:
+                error(f"손상된 항목: {path}")
+            if bad:
+                return EXIT_FAILED
+            info("모든 항목의 해시가 일치합니다.")
+    return EXIT_OK
+
+
+def cmd_mpack(args: list[str], config: dict, interactive: bool = True) -> int:
+    action = args[0] if args else None
+    if action == "build" and len(args) > 1:
+        return _mpack_build(args[1:], config)
+    if action in ("inspect", "verify") and len(args) > 1:
+        return _mpack_inspect(args[1:], action == "verify")
+    warn("사용법: !mpack build <팩이름|폴더> [출력.mpack] | !mpack inspect <파일> | !mpack verify <파일>")
+    return EXIT_USAGE
+
+
+def _pack_source(source: str) -> str:
+    """A pack id resolves to its directory; anything else is taken as a path."""
+
+    from pack_manager import get_pack
+    pack = get_pack(source)
+    return pack["path"] if pack else source
+
+
+def cmd_delta(args: list[str], config: dict, interactive: bool = True) -> int:
+    import delta
+
+    action = args[0] if args else None
+    try:
+        if action == "create" and len(args) in (3, 4):
+            base, new = args[1], args[2]
+            out = args[3] if len(args) == 4 else f"{os.path.basename(os.path.normpath(new))}{delta.DELTA_EXTENSION}"
+            stats = delta.create(_pack_source(base), _pack_source(new), out)
+            info(
+                f"델타 생성: {out} (추가 {stats['added']}, 변경 {stats['changed']}, "
+                f"삭제 {stats['removed']}, {_mib(stats['packed'])})"
+            )
+            return EXIT_OK
+        if action == "apply" and len(args) == 3:
+            pack = _find_pack(args[1])
+            if not pack:
+                return EXIT_FAILED
+            stats = delta.apply(args[2], pack["path"])
+            if stats["status"] == "current":
+                info(f"{pack['id']} 은(는) 이미 최신 버전입니다.")
+            else:
+                info(f"{pack['id']} 업데이트 및 검증 완료")
+            return EXIT_OK
+    except (OSError, ValueError, delta.DeltaError) as e:
+        error(str(e))
+        return EXIT_FAILED
+
+    warn("사용법: !delta create <기준팩> <새팩> [출력.mdelta] | !delta apply <팩이름> <파일.mdelta>")
+    return EXIT_USAGE
+
+
+def cmd_verify(args: list[str], config: dict, interactive: bool = True) -> int:
+    if not args:
+        warn("사용법: !verify <팩이름>")
+        return EXIT_USAGE
+    pack = _find_pack(args[0])
+    if not pack:
+        return EXIT_FAILED
+
+    from verify import problems, verify_pack
+    report = verify_pack(pack, get_mc_path(interactive), config)
+    found = problems(report)
+    for line in found:
+        error(line)
+    for rel in report["modified"]:
+        warn(f"게임에서 변경된 설정 파일: {rel}")
+    where = "팩 + 적용된 파일" if report["deployed"] else "팩 (현재 적용된 팩이 아님)"
+    if found:
+        error(f"{pack['id']}: 검증 실패 {len(found)}건 - {where}, {report['seconds']:.2f}s")
+        return EXIT_FAILED
+    info(f"{pack['id']}: {report['files']}개 파일 검증 완료 - {where}, {report['seconds']:.2f}s")
+    return EXIT_OK
+
+
+def cmd_ps(args: list[str], config: dict, interactive: bool = True) -> int:
+    from launcher import running_instances, stop_instance
+    if args:
+        if args[0] != "kill" or len(args) != 2:
+            warn("사용법: !ps | !ps kill <팩이름>")
+            return EXIT_USAGE
+        game = stop_instance(args[1])
+        if game is None:
+            warn(f"{args[1]} 인스턴스가 실행 중이 아닙니다.")
+            return EXIT_FAILED
+        if game.pid:
+            info(f"{args[1]} 인스턴스 종료 요청 (pid {game.pid})")
+        else:
+            info(f"{args[1]} 인스턴스 실행 대기 취소")
+        return EXIT_OK
+    running = running_instances()
+    if not running:
+        info("실행 중인 인스턴스가 없습니다.")
+        return EXIT_OK
+    print("[INSTANCES]")
+    for pid, game in running.items():
+        state = f"pid {game.pid}" if game.pid else "실행 대기 중"
+        print(f"- {pid}: {state}")
+    return EXIT_OK
+
+
+def cmd_rollback(args: list[str], config: dict, interactive: bool = True) -> int:
+    mc_path = _checked_mc_path(interactive)
+    if not mc_path:
+        return EXIT_FAILED
+    from apply_manager import rollback_pack
+    if not rollback_pack(mc_path):
+        warn("롤백할 이전 환경이 없습니다. (deploy_mode=staged 에서만 보관됩니다)")
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+def cmd_stats(args: list[str], config: dict, interactive: bool = True) -> int:
+    import tracing
+    pack_id = args[0] if args else None
+    sessions = tracing.load_sessions(pack_id, limit=STATS_WINDOW)
+    if not sessions:
+        info("기록된 세션이 없습니다.")
+        return EXIT_OK
+
+    print(f"[STATS] {pack_id or '전체'} - 최근 {len(sessions)}개 세션")
+    print(f"{'phase':<20}{'p50':>10}{'p90':>10}{'p99':>10}{'n':>6}")
+    for name, st in tracing.phase_stats(sessions).items():
+        print(f"{name:<20}{st['p50']:>9.2f}s{st['p90']:>9.2f}s{st['p99']:>9.2f}s{st['count']:>6}")
+    return EXIT_OK
+
+
+def cmd_profile(args: list[str], config: dict, interactive: bool = True) -> int:
+    if not args:
+        warn("사용법: !profile <팩이름> [세션 수]")
+        return EXIT_USAGE
+    import mod_profile
+    from tracing import percentile
+    try:
+        limit = int(args[1]) if len(args) > 1 else mod_profile.HISTORY_WINDOW
+    except ValueError:
+        warn("사용법: !profile <팩이름> [세션 수]")
+        return EXIT_USAGE
+    records = mod_profile.load_history(args[0], limit)
+    if not records:
+        info(f"{args[0]}: 분석된 세션이 없습니다. (!run 후 latest.log/debug.log 에서 기록)")
+        return EXIT_OK
+
+    boots = sorted(r["boot"] for r in records if r.get("boot"))
+    print(f"[PROFILE] {args[0]} - 최근 {len(records)}개 세션"
+          + (f", 메인 메뉴까지 p50 {percentile(boots, 50):.1f}s" if boots else ""))
+    print(f"{'mod':<28}{'init':>9}{'resources':>11}{'total':>9}  jar")
+    for row in mod_profile.summarize(records)[:PROFILE_TOP]:
+        print(f"{row['mod']:<28}{row['init']:>8.2f}s{row['resources']:>10.2f}s{row['total']:>8.2f}s  {row['jar'] or '-'}")
+    found = mod_profile.regressions(records)
+    if found:
+        print("[REGRESSION] 최근 세션에서 느려진 모드")
+        for row in found:
+            print(f"- {row['mod']}: {row['before']:.2f}s -> {row['now']:.2f}s")
+    return EXIT_OK
+
+
+def cmd_trace(args: list[str], config: dict, interactive: bool = True) -> int:
+    import tracing
+    session_id = args[0] if args else "last"
+    fmt = args[1] if len(args) > 1 else "chrome"
+    data = tracing.find_session(session_id)
+    if not data:
+        error(f"세션 '{session_id}' 을(를) 찾을 수 없습니다.")
+        return EXIT_FAILED
+    try:
+        path = tracing.export(data, fmt)
+    except ValueError:
+        warn("사용법: !trace [세션ID|last] [chrome|json]")
+        return EXIT_USAGE
+    info(f"트레이스 저장: {path}")
+    return EXIT_OK
+
+
+COMMANDS = {
+    "!list": cmd_list,
+    "!clear": cmd_clear,
+    "!run": cmd_run,
+    "!check": cmd_check,
+    "!verify": cmd_verify,
+    "!ps": cmd_ps,
+    "!gc": cmd_gc,
+    "!mpack": cmd_mpack,
+    "!delta": cmd_delta,
+    "!rollback": cmd_rollback,
+    "!stats": cmd_stats,
+    "!profile": cmd_profile,
+    "!trace": cmd_trace,
+}
+
+
+def run_command(cmd: str, args: list[str], config: dict, interactive: bool = True) -> int:
+    handler = COMMANDS.get(cmd)
+    if handler is None:
         warn(f"알 수 없는 명령어: {cmd}")
-        return True
+        return EXIT_USAGE
+    return handler(args, config, interactive)
+
+
+def handle_command(command: str, config: dict) -> bool:
+    parts = command.split()
+    cmd = parts[0]
+
+    if cmd == "!exit":
+        info("Modular 종료")
+        return False
+
+    run_command(cmd, parts[1:], config)
+    return True
@@ -0,0 +1,274 @@
+import os
+import time
+import uuid
+
+import deploy_state
+import hash_cache
+import store_manager
+import trash
+from pack_manager import PACKS_DIR
+from trash import TRASH_DIR
+from utils.colors import info, warn
+
+EXTRACT_CACHE_DIR = ".cache"
+EXTRACT_MARKER = ".extracted.ok"
+
+# Leftover ingest temp files older than this are assumed abandoned.
+STALE_TMP_AGE = 3600
+
+
+def _iter_pack_files():
+    """Yield every regular file under packs/, .cache extractions included."""
+
+    if not os.path.isdir(PACKS_DIR):
+        return
+    for root, dirs, files in os.walk(PACKS_DIR):
+        dirs[:] = sorted(d for d in dirs if d != TRASH_DIR)
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if os.path.isfile(path) and not os.path.islink(path):
+                yield path
+
+
+def _store_device() -> int | None:
+    """st_dev of the store, or of the nearest existing directory above it."""
+
+    path = os.path.abspath(store_manager.OBJECTS_DIR)
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+
+def scan() -> dict:
+    """Group pack files by content.
+
+    Returns {"files", "bytes", "duplicate_bytes", "reclaimable",
+             "groups": {digest: [path, ...]}}. reclaimable counts what
+    link_duplicates() would free: one copy per distinct inode of a
+    hardlinkable file, on the store's filesystem, beyond the one kept.
+    """
+
+    groups: dict[str, list[str]] = {}
+    sizes: dict[str, int] = {}
+    total = 0
+    for path in _iter_pack_files():
+        try:
+            digest = hash_cache.file_digest(path)
+        except OSError:
+            continue
+        groups.setdefault(digest, []).append(path)
+        sizes[digest] = os.path.getsize(path)
+        total += sizes[digest]
+
+    store_dev = _store_device()
+    duplicate = 0
+    reclaimable = 0
+    for digest, paths in groups.items():
+        inodes = {(st.st_dev, st.st_ino) for st in map(os.stat, paths)}
+        obj = store_manager.object_path(digest)
+        if os.path.exists(obj):
+            st = os.stat(obj)
+            inodes.add((st.st_dev, st.st_ino))
+        duplicate += (len(inodes) - 1) * sizes[digest]
+        if store_manager.is_immutable(paths[0]):
+            # Files on another filesystem can't be linked to the store.
+            linkable = [inode for inode in inodes if inode[0] == store_dev]
+            reclaimable += max(0, len(linkable) - 1) * sizes[digest]
+
+    hash_cache.save()
+    return {
+        "files": sum(len(p) for p in groups.values()),
+        "bytes": total,
+        "duplicate_bytes": duplicate,
+        "reclaimable": reclaimable,
+        "groups": groups,
+    }
+
+
+def _seed_object(path: str, obj: str) -> bool:
+    os.makedirs(os.path.dirname(obj), exist_ok=True)
+    tmp = f"{obj}.{uuid.uuid4().hex}.tmp"
+    if not store_manager._try_hardlink(path, tmp):
+        return False
+    os.replace(tmp, obj)
+    return True
+
+
+def link_duplicates(groups: dict[str, list[str]]) -> dict:
+    """Replace every hardlinkable pack file with a link to its store object.
+
+    Only jars/zips are linked, for the same reason store_manager.deploy only
+    hardlinks those: a config edited in place would change every copy. A
+    missing store object is seeded by linking one of the files, never by
+    copying, so a store on another filesystem costs no space.
+    Returns {"linked": n, "freed": bytes}.
+    """
+
+    linked = 0
+    freed = 0
+    for digest, paths in groups.items():
+        if not store_manager.is_immutable(paths[0]):
+            continue
+        obj = store_manager.object_path(digest)
+        if not os.path.exists(obj) and not any(_seed_object(path, obj) for path in paths):
+            continue
+        for path in paths:
+            st = os.stat(path)
+            obj_st = os.stat(obj)
+            if (st.st_dev, st.st_ino) == (obj_st.st_dev, obj_st.st_ino):
+                continue
+
+            tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+            if not store_manager._try_hardlink(obj, tmp):
+                continue
+            os.replace(tmp, path)
+            hash_cache.remember(path, digest)
+            linked += 1
+            if st.st_nlink == 1:
+                freed += st.st_size
+
+    hash_cache.save()
+    return {"linked": linked, "freed": freed}
+
+
+def stale_extractions() -> list[str]:
+    """.cache extractions whose zip is gone or that never finished."""
+
+    stale = []
+    if not os.path.isdir(PACKS_DIR):
+        return stale
+    for pack in sorted(os.listdir(PACKS_DIR)):
+        cache_dir = os.path.join(PACKS_DIR, pack, EXTRACT_CACHE_DIR)
+        if not os.path.isdir(cache_dir):
+            continue
+        for name in sorted(os.listdir(cache_dir)):
+            extracted = os.path.join(cache_dir, name)
+            zip_path = os.path.join(PACKS_DIR, pack, name + ".zip")
+            if not os.path.isfile(zip_path) or not os.path.exists(os.path.join(extracted, EXTRACT_MARKER)):
+                stale.append(extracted)
+    return stale
+
+
+def _dir_size(path: str) -> int:
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _deployment_dirs(minecraft_path: str | None) -> list[str]:
+    from instance_manager import INSTANCES_DIR
+    from staging import PREVIOUS_DIR
+
+    dirs = []
+    if minecraft_path:
+        dirs += [minecraft_path, os.path.join(minecraft_path, PREVIOUS_DIR)]
+    if os.path.isdir(INSTANCES_DIR):
+        for name in sorted(os.listdir(INSTANCES_DIR)):
+            instance = os.path.join(INSTANCES_DIR, name)
+            dirs += [instance, os.path.join(instance, PREVIOUS_DIR)]
+    return dirs
+
+
+def referenced_digests(groups: dict[str, list[str]], minecraft_path: str | None) -> set[str]:
+    """Digests still needed: every pack file plus every deployed/rollback file."""
+
+    digests = set(groups)
+    for path in _deployment_dirs(minecraft_path):
+        for record in deploy_state.load_deployment(path).get("files", {}).values():
+            digests.add(record.get("hash"))
+    return digests
+
+
+def unreferenced_objects(referenced: set[str]) -> list[str]:
+    """Store objects (and abandoned ingest temp files) nothing refers to."""
+
+    found = []
+    if not os.path.isdir(store_manager.OBJECTS_DIR):
+        return found
+    now = time.time()
+    for prefix in sorted(os.listdir(store_manager.OBJECTS_DIR)):
+        prefix_dir = os.path.join(store_manager.OBJECTS_DIR, prefix)
+        for name in sorted(os.listdir(prefix_dir)):
+            path = os.path.join(prefix_dir, name)
+            if name.endswith(".tmp"):
+                if now - os.path.getmtime(path) > STALE_TMP_AGE:
+                    found.append(path)
+                continue
+            # A link count above one means a pack or game dir still uses it.
+            if name not in referenced and os.stat(path).st_nlink == 1:
+                found.append(path)
+    return found
+
+
+def gc(minecraft_path: str | None = None, dry_run: bool = False) -> dict:
+    """Deduplicate packs against the store, then prune stale .cache
+    extractions and unreferenced store objects.
+
+    With dry_run nothing is changed; the result says what would be.
+    """
+
+    info("팩 파일 스캔 중...")
+    report = scan()
+    stats = {
+        "files": report["files"],
+        "bytes": report["bytes"],
+        "duplicate_bytes": report["duplicate_bytes"],
+        "reclaimable": report["reclaimable"],
+        "linked": 0,
+        "freed": 0,
+        "extractions": 0,
+        "objects": 0,
+    }
+
+    stale = stale_extractions()
+    groups = report["groups"]
+    if stale:
+        # Files inside the pruned extractions are neither linked into the
+        # store nor do they pin their objects.
+        prefixes = tuple(path + os.sep for path in stale)
+        groups = {d: [p for p in paths if not p.startswith(prefixes)] for d, paths in groups.items()}
+        groups = {d: paths for d, paths in groups.items() if paths}
+
+    if not dry_run:
+        linked = link_duplicates(groups)
+        stats["linked"] = linked["linked"]
+        stats["freed"] += linked["freed"]
+
+    stats["extractions"] = len(stale)
+    for path in stale:
+        size = _dir_size(path)
+        stats["reclaimable"] += size
+        if not dry_run:
+            # Renamed out of .cache at once, so an interrupted gc never
+            # leaves a half-deleted extraction; packs/<pack> is the root.
+            trash.discard(path, os.path.dirname(os.path.dirname(path)))
+            stats["freed"] += size
+
+    orphans = unreferenced_objects(referenced_digests(groups, minecraft_path))
+    stats["objects"] = len(orphans)
+    for path in orphans:
+        size = os.path.getsize(path)
+        stats["reclaimable"] += size
+        if not dry_run:
+            try:
+                os.remove(path)
+                stats["freed"] += size
+            except OSError as e:
+                warn(f"저장소 객체 삭제 실패: {path} ({e})")
+
+    if not dry_run:
+        hash_cache.prune()
+        hash_cache.save()
+    return stats
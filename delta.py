@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import uuid
+
+import hash_cache
+from mpack import MPACK_EXTENSION, MPackReader, MPackWriter
+from utils.colors import info
+
+DELTA_EXTENSION = ".mdelta"
+DELTA_FORMAT = 1
+
+
+class DeltaError(RuntimeError):
+    pass
+
+
+def listing_digest(files: dict[str, str]) -> str:
+    """Fingerprint of a whole pack version: sorted (path, sha256) pairs."""
+
+    h = hashlib.sha256()
+    for rel in sorted(files):
+        h.update(f"{rel}\0{files[rel]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+class PackVersion:
+    """One version of a pack: a loose pack directory or a .mpack.
+
+    files maps every deployable path to its sha256.
+    """
+
+    def __init__(self, source: str):
+        from apply_manager import _find_pack_mpack, _find_pack_zip, _load_manifest, get_copy_targets
+        from mpack import _iter_files
+
+        self.source = source
+        self.reader = None
+        self.mpack_path = None
+        if os.path.isfile(source) and source.lower().endswith(MPACK_EXTENSION):
+            self.mpack_path = source
+            self.dir = os.path.dirname(source)
+            self.meta = {}
+        elif os.path.isdir(source):
+            self.dir = source
+            self.meta = _load_manifest(source)
+            targets = get_copy_targets(self.meta)
+            self.mpack_path = _find_pack_mpack(source, targets)
+            if not self.mpack_path and _find_pack_zip(source, targets):
+                raise DeltaError(f"{source}: zip 팩은 먼저 !mpack build 로 .mpack 으로 변환하세요")
+        else:
+            raise DeltaError(f"팩 '{source}' 을(를) 찾을 수 없습니다")
+
+        if self.mpack_path:
+            self.reader = MPackReader(self.mpack_path)
+            self.meta = self.meta or self.reader.meta
+            self.files = {rel: e["hash"] for rel, e in self.reader.entries.items()}
+        else:
+            self.paths = dict(_iter_files(source, get_copy_targets(self.meta)))
+            self.files = {rel: hash_cache.file_digest(path) for rel, path in self.paths.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def add_to(self, writer: MPackWriter, rel: str):
+        if self.reader is not None:
+            writer.add_entry(self.reader, self.reader.entries[rel])
+        else:
+            writer.add_file(rel, self.paths[rel])
+
+    def digest(self) -> str:
+        return listing_digest(self.files)
+
+
+def create(base_source: str, new_source: str, out_path: str) -> dict:
+    """Write a delta that turns base into new.
+
+    The delta is a .mpack holding only added and changed entries; its meta
+    records removed paths, the base hash of every touched path, and the
+    listing fingerprints of both versions.
+    """
+
+    with PackVersion(base_source) as base, PackVersion(new_source) as new:
+        added = sorted(set(new.files) - set(base.files))
+        removed = sorted(set(base.files) - set(new.files))
+        changed = sorted(rel for rel in set(base.files) & set(new.files) if base.files[rel] != new.files[rel])
+
+        meta = {
+            "delta": {
+                "format": DELTA_FORMAT,
+                "pack": new.meta.get("id") or base.meta.get("id"),
+                "base": base.digest(),
+                "target": new.digest(),
+                "added": added,
+                "removed": removed,
+                "changed": {rel: base.files[rel] for rel in changed},
+                "manifest": new.meta,
+            }
+        }
+        with MPackWriter(out_path) as writer:
+            for rel in added + changed:
+                new.add_to(writer, rel)
+            stats = writer.finish(meta)
+
+    stats.update(added=len(added), removed=len(removed), changed=len(changed))
+    return stats
+
+
+def _read_delta(reader: MPackReader) -> dict:
+    delta = reader.meta.get("delta")
+    if (
+        not isinstance(delta, dict)
+        or delta.get("format") != DELTA_FORMAT
+        or not isinstance(delta.get("added"), list)
+        or not isinstance(delta.get("removed"), list)
+        or not isinstance(delta.get("changed"), dict)
+    ):
+        raise DeltaError(f"{reader.path}: 델타 파일이 아닙니다")
+    return delta
+
+
+def _rel_path(path: str, base: str) -> str:
+    return os.path.relpath(path, base).replace(os.sep, "/")
+
+
+def _check_paths(delta: dict, patch: MPackReader, current: PackVersion):
+    """Reject a delta naming a path outside the pack's targets, the same
+    guard apply_pack uses against zip-slip."""
+
+    from apply_manager import get_copy_targets
+
+    base = os.path.abspath(current.dir)
+    targets = set(get_copy_targets(current.meta))
+    for rel in delta["added"] + list(delta["changed"]) + delta["removed"]:
+        target = os.path.abspath(os.path.join(current.dir, *str(rel).split("/")))
+        if (
+            not isinstance(rel, str)
+            or not target.startswith(base + os.sep)
+            or _rel_path(target, base) != rel
+            or rel.split("/", 1)[0] not in targets
+        ):
+            raise DeltaError(f"{patch.path}: 안전하지 않은 항목 경로: {rel}")
+
+
+def _base_mismatches(delta: dict, patch: MPackReader, current: PackVersion) -> list[str]:
+    """Touched paths that don't fit the current files: added ones must be
+    new, changed ones must hold the delta's base hash, removed ones must
+    exist, and the patch must carry every file it writes."""
+
+    bad = [rel for rel in delta["added"] if rel in current.files or rel not in patch.entries]
+    bad += [
+        rel for rel, h in delta["changed"].items()
+        if current.files.get(rel) != h or rel not in patch.entries
+    ]
+    bad += [rel for rel in delta["removed"] if rel not in current.files]
+    return bad
+
+
+def _write_manifest(pack_dir: str, meta: dict):
+    path = os.path.join(pack_dir, "manifest.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _apply_to_mpack(current: PackVersion, patch: MPackReader, delta: dict):
+    """Rebuild the pack's .mpack from unchanged base entries and the delta,
+    copying compressed bytes without recompressing anything."""
+
+    removed = set(delta["removed"])
+    touched = set(delta["added"]) | set(delta["changed"])
+    with MPackWriter(current.mpack_path) as writer:
+        for rel, entry in current.reader.entries.items():
+            if rel not in removed and rel not in touched:
+                writer.add_entry(current.reader, entry)
+        for rel in delta["added"] + sorted(delta["changed"]):
+            writer.add_entry(patch, patch.entries[rel])
+        manifest = delta.get("manifest") or current.reader.meta
+        # The old mapping must be gone before the archive is replaced (Windows).
+        current.close()
+        writer.finish(manifest)
+
+
+def _apply_to_dir(current: PackVersion, patch: MPackReader, delta: dict):
+    """Stage every new file beside its destination, then rename them all in."""
+
+    staged = []
+    try:
+        for rel in delta["added"] + sorted(delta["changed"]):
+            dst = os.path.join(current.dir, *rel.split("/"))
+            tmp = f"{dst}.{uuid.uuid4().hex}.tmp"
+            patch.extract(patch.entries[rel], tmp)
+            staged.append((tmp, dst))
+    except BaseException:
+        for tmp, _ in staged:
+            os.remove(tmp)
+        raise
+
+    for tmp, dst in staged:
+        os.replace(tmp, dst)
+    for rel in delta["removed"]:
+        path = os.path.join(current.dir, *rel.split("/"))
+        if os.path.lexists(path):
+            os.remove(path)
+        parent = os.path.dirname(path)
+        while parent != current.dir and os.path.isdir(parent) and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+
+
+def apply(delta_path: str, pack_dir: str) -> dict:
+    """Update the pack at pack_dir in place.
+
+    The pack must be exactly the delta's base version (checked against the
+    listing fingerprint and the base hash of every touched path); afterwards
+    the whole updated pack is re-read and must match the target fingerprint.
+    Returns {"added", "removed", "changed", "status"}.
+    """
+
+    with MPackReader(delta_path) as patch:
+        delta = _read_delta(patch)
+        stats = {"added": len(delta["added"]), "removed": len(delta["removed"]), "changed": len(delta["changed"])}
+
+        with PackVersion(pack_dir) as current:
+            _check_paths(delta, patch, current)
+            digest = current.digest()
+            if digest == delta["target"]:
+                stats["status"] = "current"
+                return stats
+            bad = _base_mismatches(delta, patch, current)
+            if digest != delta["base"] or bad:
+                detail = f" ({', '.join(bad[:5])})" if bad else ""
+                raise DeltaError(f"{pack_dir}: 델타의 기준 버전과 다릅니다{detail}")
+            bad = patch.verify()
+            if bad:
+                raise DeltaError(f"{delta_path}: 손상된 항목 {', '.join(bad[:5])}")
+
+            info(f"델타 적용 중: 추가 {stats['added']}, 변경 {stats['changed']}, 삭제 {stats['removed']}")
+            if current.mpack_path:
+                _apply_to_mpack(current, patch, delta)
+            else:
+                _apply_to_dir(current, patch, delta)
+            if delta.get("manifest") and delta["manifest"] != current.meta:
+                _write_manifest(pack_dir, delta["manifest"])
+
+    with PackVersion(pack_dir) as updated:
+        if updated.reader is not None and updated.reader.verify():
+            raise DeltaError(f"{pack_dir}: 업데이트된 아카이브 검증 실패")
+        if updated.digest() != delta["target"]:
+            raise DeltaError(f"{pack_dir}: 업데이트 후 검증 실패")
+    hash_cache.save()
+    stats["status"] = "updated"
+    return stats
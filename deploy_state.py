@@ -0,0 +1,53 @@
+import json
+import os
+
+DEPLOY_MANIFEST = ".modular-deploy.json"
+
+
+def manifest_path(minecraft_path: str) -> str:
+    return os.path.join(minecraft_path, DEPLOY_MANIFEST)
+
+
+def load_deployment(minecraft_path: str) -> dict:
+    """Return the last deployment manifest ({} if none/unreadable)."""
+
+    try:
+        with open(manifest_path(minecraft_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or not isinstance(data.get("files"), dict):
+        return {}
+    return data
+
+
+def save_deployment(minecraft_path: str, pack_id: str | None, files: dict):
+    path = manifest_path(minecraft_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"pack": pack_id, "files": files}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def clear_deployment(minecraft_path: str):
+    path = manifest_path(minecraft_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def file_record(path: str, digest: str) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime": st.st_mtime_ns, "hash": digest}
+
+
+def is_current(path: str, record: dict | None, digest: str) -> bool:
+    """True if path still holds exactly what record says was deployed."""
+
+    if not record or record.get("hash") != digest:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == record.get("size") and st.st_mtime_ns == record.get("mtime")
+
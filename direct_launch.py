@@ -0,0 +1,267 @@
+import glob
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import uuid
+import zipfile
+
+from fabric_native import maven_path
+
+LAUNCHER_NAME = "modular"
+LAUNCHER_VERSION = "1.0"
+DEFAULT_PLAYER_NAME = "Player"
+
+_MAX_INHERITANCE = 8
+_PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+# Pre-1.13 versions only have a minecraftArguments string.
+_LEGACY_JVM_ARGS = ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"]
+
+
+class LaunchError(RuntimeError):
+    pass
+
+
+def _os_name() -> str:
+    if sys.platform.startswith("win"):
+        return "windows"
+    if sys.platform == "darwin":
+        return "osx"
+    return "linux"
+
+
+def _rules_allow(rules: list | None) -> bool:
+    """Evaluate a version JSON rule list; no launcher features are enabled."""
+
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        os_rule = rule.get("os", {})
+        if os_rule.get("name") and os_rule["name"] != _os_name():
+            continue
+        if os_rule.get("arch") == "x86" and platform.machine().endswith("64"):
+            continue
+        if any(rule.get("features", {}).values()):
+            continue
+        allowed = rule.get("action") == "allow"
+    return allowed
+
+
+def _load_version(minecraft_path: str, version_id: str) -> dict:
+    path = os.path.join(minecraft_path, "versions", version_id, f"{version_id}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        raise LaunchError(f"버전 '{version_id}' 이(가) 설치되어 있지 않습니다 ({path})")
+    except ValueError as e:
+        raise LaunchError(f"{path}: 버전 JSON 을 읽을 수 없습니다 ({e})")
+
+
+def _library_key(lib: dict) -> str:
+    parts = lib.get("name", "").split(":")
+    return ":".join(parts[:2] + parts[3:])
+
+
+def resolve_version(minecraft_path: str, version_id: str) -> dict:
+    """Merge a version JSON with everything it inheritsFrom.
+
+    The child's libraries come first and replace the parent's copy of the
+    same artifact; argument lists are concatenated parent first; other keys
+    are taken from the closest version that has them. "jar" names the
+    version whose client jar is launched.
+    """
+
+    chain = [_load_version(minecraft_path, version_id)]
+    while chain[-1].get("inheritsFrom"):
+        if len(chain) > _MAX_INHERITANCE:
+            raise LaunchError(f"버전 '{version_id}' 의 inheritsFrom 체인이 너무 깁니다")
+        chain.append(_load_version(minecraft_path, chain[-1]["inheritsFrom"]))
+
+    merged = {"id": version_id, "libraries": [], "arguments": {"game": [], "jvm": []}}
+    seen = set()
+    for data in chain:
+        for lib in data.get("libraries", []):
+            key = _library_key(lib)
+            if key not in seen:
+                seen.add(key)
+                merged["libraries"].append(lib)
+    for data in reversed(chain):
+        for kind in ("game", "jvm"):
+            merged["arguments"][kind] += data.get("arguments", {}).get(kind, [])
+        for key, value in data.items():
+            if key not in ("libraries", "arguments", "inheritsFrom", "id"):
+                merged[key] = value
+    merged.setdefault("jar", chain[-1].get("id", version_id))
+    return merged
+
+
+def _library_path(lib: dict) -> str | None:
+    artifact = lib.get("downloads", {}).get("artifact")
+    if artifact and artifact.get("path"):
+        return artifact["path"]
+    if "downloads" in lib and not artifact:
+        return None
+    return maven_path(lib.get("name", ""))
+
+
+def _extract_natives(lib: dict, libraries_dir: str, natives_dir: str):
+    """Old-style "natives" libraries: unpack the platform classifier jar."""
+
+    classifier = lib["natives"].get(_os_name(), "").replace("${arch}", "64" if sys.maxsize > 2**32 else "32")
+    download = lib.get("downloads", {}).get("classifiers", {}).get(classifier)
+    rel = download["path"] if download else maven_path(f"{lib.get('name', '')}:{classifier}")
+    if not rel:
+        return
+    exclude = lib.get("extract", {}).get("exclude", [])
+    with zipfile.ZipFile(os.path.join(libraries_dir, rel)) as zf:
+        for member in zf.infolist():
+            if member.is_dir() or any(member.filename.startswith(e) for e in exclude):
+                continue
+            target = os.path.join(natives_dir, os.path.basename(member.filename))
+            if not os.path.exists(target):
+                with zf.open(member) as src, open(target, "wb") as dst:
+                    dst.write(src.read())
+
+
+def build_classpath(minecraft_path: str, version: dict, natives_dir: str) -> list[str]:
+    libraries_dir = os.path.join(minecraft_path, "libraries")
+    classpath = []
+    missing = []
+    for lib in version["libraries"]:
+        if not _rules_allow(lib.get("rules")):
+            continue
+        if "natives" in lib:
+            try:
+                _extract_natives(lib, libraries_dir, natives_dir)
+            except (OSError, zipfile.BadZipFile):
+                missing.append(lib.get("name", "?"))
+        rel = _library_path(lib)
+        if not rel:
+            continue
+        path = os.path.join(libraries_dir, *rel.replace("\\", "/").split("/"))
+        if not os.path.isfile(path):
+            missing.append(lib.get("name", rel))
+            continue
+        if path not in classpath:
+            classpath.append(path)
+
+    jar = os.path.join(minecraft_path, "versions", version["jar"], f"{version['jar']}.jar")
+    if not os.path.isfile(jar):
+        missing.append(f"{version['jar']}.jar")
+    if missing:
+        raise LaunchError(
+            f"{len(missing)}개 라이브러리가 없습니다 ({', '.join(missing[:3])}). "
+            "공식 런처로 이 버전을 한 번 실행해 받아 두세요"
+        )
+    return classpath + [jar]
+
+
+def offline_uuid(name: str) -> str:
+    """Same UUID the vanilla server gives an offline-mode player."""
+
+    digest = hashlib.md5(f"OfflinePlayer:{name}".encode("utf-8")).digest()
+    return uuid.UUID(bytes=digest, version=3).hex
+
+
+def _expand(args: list, variables: dict) -> list[str]:
+    out = []
+    for arg in args:
+        if isinstance(arg, dict):
+            if not _rules_allow(arg.get("rules")):
+                continue
+            value = arg.get("value", [])
+            arg_list = value if isinstance(value, list) else [value]
+        else:
+            arg_list = [arg]
+        for a in arg_list:
+            out.append(_PLACEHOLDER.sub(lambda m: str(variables.get(m.group(1), m.group(0))), a))
+    return out
+
+
+def find_java(minecraft_path: str, version: dict, config: dict | None = None) -> str:
+    """java_path from config, else the launcher's bundled runtime for the
+    version's javaVersion, else java/javaw from PATH."""
+
+    configured = (config or {}).get("java_path")
+    if configured:
+        return configured
+    exe = "javaw.exe" if sys.platform.startswith("win") else "java"
+    component = version.get("javaVersion", {}).get("component")
+    if component:
+        pattern = os.path.join(minecraft_path, "runtime", component, "*", component, "bin", exe)
+        found = sorted(glob.glob(pattern))
+        if found:
+            return found[0]
+    return "javaw" if sys.platform.startswith("win") else "java"
+
+
+def build_command(minecraft_path: str, version_id: str, game_dir: str, config: dict | None = None,
+                  jvm_args: list[str] | None = None) -> list[str]:
+    """Full java command line for version_id with offline authentication."""
+
+    config = config or {}
+    version = resolve_version(minecraft_path, version_id)
+    if not version.get("mainClass"):
+        raise LaunchError(f"버전 '{version_id}' 에 mainClass 가 없습니다")
+    natives_dir = os.path.join(minecraft_path, "versions", version_id, "natives")
+    os.makedirs(natives_dir, exist_ok=True)
+    classpath = build_classpath(minecraft_path, version, natives_dir)
+
+    player = config.get("player_name", DEFAULT_PLAYER_NAME)
+    asset_index = version.get("assetIndex", {}).get("id") or version.get("assets", "legacy")
+    variables = {
+        "auth_player_name": player,
+        "auth_uuid": offline_uuid(player),
+        "auth_access_token": "0",
+        "auth_session": "0",
+        "auth_xuid": "0",
+        "clientid": "0",
+        "user_type": "legacy",
+        "user_properties": "{}",
+        "version_name": version_id,
+        "version_type": version.get("type", "release"),
+        "game_directory": game_dir,
+        "assets_root": os.path.join(minecraft_path, "assets"),
+        "game_assets": os.path.join(minecraft_path, "assets"),
+        "assets_index_name": asset_index,
+        "natives_directory": natives_dir,
+        "library_directory": os.path.join(minecraft_path, "libraries"),
+        "classpath": os.pathsep.join(classpath),
+        "classpath_separator": os.pathsep,
+        "launcher_name": LAUNCHER_NAME,
+        "launcher_version": LAUNCHER_VERSION,
+    }
+
+    if version["arguments"]["jvm"] or version["arguments"]["game"]:
+        jvm = _expand(version["arguments"]["jvm"], variables)
+        game = _expand(version["arguments"]["game"], variables)
+    else:
+        jvm = _expand(_LEGACY_JVM_ARGS, variables)
+        game = _expand(version.get("minecraftArguments", "").split(), variables)
+    return [find_java(minecraft_path, version, config)] + (jvm_args or []) + jvm + [version["mainClass"]] + game
+
+
+def launch(minecraft_path: str, version_id: str, game_dir: str, config: dict | None = None,
+           jvm_args: list[str] | None = None) -> subprocess.Popen:
+    """Start the game; stdout and stderr come back merged as text."""
+
+    command = build_command(minecraft_path, version_id, game_dir, config, jvm_args)
+    os.makedirs(game_dir, exist_ok=True)
+    try:
+        return subprocess.Popen(
+            command,
+            cwd=game_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            errors="replace",
+        )
+    except OSError as e:
+        raise LaunchError(f"java 실행 실패: {command[0]} ({e})")
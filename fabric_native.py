@@ -0,0 +1,155 @@
+"""Pure-Python Fabric client install from locally cached metadata.
+
+The Fabric installer's client mode only writes versions/<id>/<id>.json
+(the loader profile), an empty <id>.jar and a launcher profile entry.
+This module does the same from files kept under installers/fabric:
+
+- meta/<mc_version>/<loader_version>.json: the loader profile JSON, as
+  served by meta.fabricmc.net /v2/versions/loader/<mc>/<loader>/profile/json
+  or harvested from a previous installer run
+- libraries/<maven path>: optional local copies of the profile's libraries
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+from store_manager import link_or_copy
+
+FABRIC_DIR = os.path.join("installers", "fabric")
+META_DIR = os.path.join(FABRIC_DIR, "meta")
+LIBRARIES_DIR = os.path.join(FABRIC_DIR, "libraries")
+
+
+def _version_key(version: str) -> tuple:
+    return tuple(int(p) if p.isdigit() else 0 for p in re.split(r"[.+\-]", version))
+
+
+def cached_loader_versions(mc_version: str) -> list[str]:
+    """Loader versions with cached metadata for mc_version, newest first."""
+
+    base = os.path.join(META_DIR, mc_version)
+    if not os.path.isdir(base):
+        return []
+    versions = [f[:-5] for f in os.listdir(base) if f.endswith(".json")]
+    return sorted(versions, key=_version_key, reverse=True)
+
+
+def load_profile(mc_version: str, loader_version: str | None = None) -> dict | None:
+    if not loader_version:
+        versions = cached_loader_versions(mc_version)
+        if not versions:
+            return None
+        loader_version = versions[0]
+
+    path = os.path.join(META_DIR, mc_version, f"{loader_version}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(profile, dict) or not profile.get("id"):
+        return None
+    return profile
+
+
+def maven_path(name: str) -> str | None:
+    """group:artifact:version[:classifier] -> relative jar path."""
+
+    parts = name.split(":")
+    if len(parts) < 3:
+        return None
+    group, artifact, version = parts[:3]
+    classifier = f"-{parts[3]}" if len(parts) > 3 else ""
+    return os.path.join(*group.split("."), artifact, version, f"{artifact}-{version}{classifier}.jar")
+
+
+def _update_launcher_profile(minecraft_path: str, mc_version: str, vid: str):
+    path = os.path.join(minecraft_path, "launcher_profiles.json")
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    name = f"fabric-loader-{mc_version}"
+    profiles = data.setdefault("profiles", {})
+    profile = profiles.setdefault(name, {"name": name, "type": "custom", "created": now})
+    profile["lastVersionId"] = vid
+    profile["lastUsed"] = now
+
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def install(mc_version: str, loader_version: str | None, minecraft_path: str) -> str | None:
+    """Install Fabric without a JVM. Returns the version id, or None when
+    no metadata is cached for this version (caller falls back)."""
+
+    profile = load_profile(mc_version, loader_version)
+    if not profile:
+        return None
+
+    vid = profile["id"]
+    version_dir = os.path.join(minecraft_path, "versions", vid)
+    os.makedirs(version_dir, exist_ok=True)
+
+    tmp = os.path.join(version_dir, f"{vid}.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, os.path.join(version_dir, f"{vid}.json"))
+
+    jar = os.path.join(version_dir, f"{vid}.jar")
+    if not os.path.exists(jar):
+        open(jar, "wb").close()
+
+    for lib in profile.get("libraries", []):
+        rel = maven_path(lib.get("name", "")) if isinstance(lib, dict) else None
+        if not rel:
+            continue
+        src = os.path.join(LIBRARIES_DIR, rel)
+        dst = os.path.join(minecraft_path, "libraries", rel)
+        if os.path.exists(src) and not os.path.exists(dst):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            link_or_copy(src, dst)
+
+    _update_launcher_profile(minecraft_path, mc_version, vid)
+    return vid
+
+
+def harvest(vid: str, minecraft_path: str) -> bool:
+    """Copy an installed loader's profile and libraries into the local
+    metadata cache so the next install of this version works offline."""
+
+    path = os.path.join(minecraft_path, "versions", vid, f"{vid}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    m = re.match(r"fabric-loader-(.+)-" + re.escape(str(profile.get("inheritsFrom", ""))) + r"$", vid)
+    if not m:
+        return False
+    mc_version = profile["inheritsFrom"]
+    loader_version = m.group(1)
+
+    meta_path = os.path.join(META_DIR, mc_version, f"{loader_version}.json")
+    if not os.path.exists(meta_path):
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+
+    for lib in profile.get("libraries", []):
+        rel = maven_path(lib.get("name", "")) if isinstance(lib, dict) else None
+        if not rel:
+            continue
+        src = os.path.join(minecraft_path, "libraries", rel)
+        dst = os.path.join(LIBRARIES_DIR, rel)
+        if os.path.exists(src) and not os.path.exists(dst):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            link_or_copy(src, dst)
+    return True
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+
+CACHE_DIR = "cache"
+CACHE_FILE = "hashes.json"
+
+_CHUNK_SIZE = 8 * 1024 * 1024
+
+_lock = threading.Lock()
+_entries: dict | None = None
+_dirty = False
+
+
+def _cache_path() -> str:
+    return os.path.join(CACHE_DIR, CACHE_FILE)
+
+
+def _load() -> dict:
+    global _entries
+    if _entries is None:
+        try:
+            with open(_cache_path(), "r", encoding="utf-8") as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+
+def _stat_key(st: os.stat_result) -> list:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def hash_file(path: str) -> str:
+    """Return the sha256 hex digest of path, always reading the file.
+
+    The file is memory-mapped and fed to hashlib in large slices; hashlib
+    drops the GIL while hashing, so several threads hash in parallel.
+    """
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return h.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            for offset in range(0, len(view), _CHUNK_SIZE):
+                h.update(view[offset:offset + _CHUNK_SIZE])
+    return h.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """Return the sha256 of path, reusing the cached value while
+    (size, mtime, inode) are unchanged."""
+
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    stat_key = _stat_key(st)
+
+    with _lock:
+        entry = _load().get(key)
+    if entry and entry[:3] == stat_key:
+        return entry[3]
+
+    digest = hash_file(key)
+    with _lock:
+        global _dirty
+        _load()[key] = stat_key + [digest]
+        _dirty = True
+    return digest
+
+
+def remember(path: str, digest: str):
+    """Record digest for path's current stat, e.g. after relinking it to a
+    file whose content is known."""
+
+    global _dirty
+    key = os.path.abspath(path)
+    stat_key = _stat_key(os.stat(key))
+    with _lock:
+        _load()[key] = stat_key + [digest]
+        _dirty = True
+
+
+def prune() -> int:
+    """Drop entries for files that no longer exist; returns how many."""
+
+    global _dirty
+    with _lock:
+        entries = _load()
+        missing = [key for key in entries if not os.path.exists(key)]
+        for key in missing:
+            del entries[key]
+        if missing:
+            _dirty = True
+    return len(missing)
+
+
+def save():
+    """Persist the cache if anything changed since the last save."""
+
+    global _dirty
+    with _lock:
+        if not _dirty or _entries is None:
+            return
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = _cache_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_entries, f)
+        os.replace(tmp, _cache_path())
+        _dirty = False
@@ -0,0 +1,85 @@
+import os
+import sys
+
+from apply_manager import apply_pack
+from jvm_tuning import java_args
+from launcher_profiles import upsert_pack_profile
+from utils.colors import info, warn
+
+INSTANCES_DIR = "instances"
+
+# Read-mostly game data shared by every instance through links into the
+# main .minecraft, so loaders/assets are installed and downloaded once.
+SHARED_DIRS = ["versions", "libraries", "assets"]
+
+
+def instance_path(pack_id: str) -> str:
+    return os.path.abspath(os.path.join(INSTANCES_DIR, pack_id))
+
+
+def _link_dir(src: str, dst: str) -> bool:
+    """Symlink dst -> src; on Windows fall back to a directory junction."""
+
+    try:
+        os.symlink(src, dst, target_is_directory=True)
+        return True
+    except OSError:
+        pass
+    if sys.platform.startswith("win"):
+        try:
+            import _winapi
+            _winapi.CreateJunction(src, dst)
+            return True
+        except (ImportError, OSError):
+            pass
+    return False
+
+
+def _is_link(path: str) -> bool:
+    if os.path.islink(path):
+        return True
+    isjunction = getattr(os.path, "isjunction", None)
+    return bool(isjunction and isjunction(path))
+
+
+def _link_shared(instance_dir: str, minecraft_path: str):
+    for name in SHARED_DIRS:
+        src = os.path.abspath(os.path.join(minecraft_path, name))
+        dst = os.path.join(instance_dir, name)
+        os.makedirs(src, exist_ok=True)
+
+        if _is_link(dst):
+            if os.path.realpath(dst) == os.path.realpath(src):
+                continue
+            os.unlink(dst)
+        elif os.path.exists(dst):
+            warn(f"인스턴스 {name} 폴더가 링크가 아니라 그대로 둡니다: {dst}")
+            continue
+
+        if not _link_dir(src, dst):
+            warn(f"{name} 링크 생성 실패: {dst}")
+
+
+def prepare_instance(pack: dict, minecraft_path: str, config: dict | None = None,
+                     version_id: str | None = None) -> tuple[str, dict]:
+    """Bring the pack's persistent instance directory up to date.
+
+    Shared dirs are linked from minecraft_path, the pack is applied
+    incrementally (usually a no-op), and a launcher profile pointing its
+    gameDir at the instance (and javaArgs sized for the pack) is written. Returns (instance_dir, apply stats).
+    """
+
+    instance_dir = instance_path(pack["id"])
+    os.makedirs(instance_dir, exist_ok=True)
+    _link_shared(instance_dir, minecraft_path)
+
+    info(f"인스턴스 준비: {instance_dir}")
+    stats = apply_pack(pack["path"], instance_dir, pack["meta"], config, pack["id"])
+
+    fields = {"gameDir": instance_dir}
+    if version_id:
+        fields["lastVersionId"] = version_id
+    if (config or {}).get("jvm_tuning", True):
+        fields["javaArgs"] = " ".join(java_args(pack["meta"], instance_dir))
+    upsert_pack_profile(minecraft_path, pack["id"], **fields)
+    return instance_dir, stats
@@ -0,0 +1,133 @@
+import math
+import os
+
+import psutil
+
+# Baseline the vanilla client needs, plus a per-mod allowance and a multiple
+# of the jars' size for loaded classes, registries and baked resources.
+BASE_HEAP_MB = 1024
+PER_MOD_MB = 16
+JAR_FACTOR = 1.5
+MIN_HEAP_MB = 2048
+MAX_HEAP_MB = 16384
+# Never take more than this share of physical memory, and leave the OS room.
+HOST_SHARE = 0.5
+HOST_RESERVE_MB = 2048
+
+GC_FLAGS = {
+    "g1": [
+        "-XX:+UseG1GC",
+        "-XX:+ParallelRefProcEnabled",
+        "-XX:MaxGCPauseMillis=200",
+        "-XX:+UnlockExperimentalVMOptions",
+        "-XX:+DisableExplicitGC",
+        "-XX:G1NewSizePercent=30",
+        "-XX:G1MaxNewSizePercent=40",
+        "-XX:G1HeapRegionSize=8M",
+        "-XX:G1ReservePercent=20",
+        "-XX:G1HeapWastePercent=5",
+        "-XX:G1MixedGCCountTarget=4",
+        "-XX:InitiatingHeapOccupancyPercent=15",
+        "-XX:G1MixedGCLiveThresholdPercent=90",
+        "-XX:G1RSetUpdatingPauseTimePercent=5",
+        "-XX:SurvivorRatio=32",
+        "-XX:+PerfDisableSharedMem",
+        "-XX:MaxTenuringThreshold=1",
+    ],
+    "zgc": ["-XX:+UseZGC", "-XX:+DisableExplicitGC"],
+    "default": [],
+}
+DEFAULT_GC = "g1"
+# ZGC is production ready from Java 15; generational ZGC only exists from
+# Java 21, and older JVMs refuse to start on the unknown flag.
+ZGC_MIN_JAVA = 15
+GENERATIONAL_ZGC_JAVA = 21
+
+# First Minecraft release requiring each Java version, newest first.
+_JAVA_BY_MC = [((1, 20, 5), 21), ((1, 18), 17), ((1, 17), 16)]
+
+
+def pack_footprint(game_dir: str) -> tuple[int, int]:
+    """(jar count, total jar bytes) in game_dir/mods."""
+
+    mods_dir = os.path.join(game_dir, "mods")
+    count = size = 0
+    try:
+        entries = list(os.scandir(mods_dir))
+    except OSError:
+        return 0, 0
+    for entry in entries:
+        if entry.name.lower().endswith(".jar") and entry.is_file():
+            count += 1
+            size += entry.stat().st_size
+    return count, size
+
+
+def host_memory_mb() -> int | None:
+    try:
+        return psutil.virtual_memory().total // (1024 * 1024)
+    except (OSError, AttributeError):
+        return None
+
+
+def heap_mb(mods: int, jar_bytes: int, host_mb: int | None = None) -> int:
+    """Max heap for a pack, rounded up to 512 MB and capped by host RAM."""
+
+    wanted = BASE_HEAP_MB + PER_MOD_MB * mods + JAR_FACTOR * jar_bytes / (1024 * 1024)
+    heap = max(MIN_HEAP_MB, int(math.ceil(wanted / 512.0)) * 512)
+    cap = MAX_HEAP_MB
+    if host_mb:
+        cap = min(cap, max(1024, int(min(host_mb * HOST_SHARE, host_mb - HOST_RESERVE_MB)) // 512 * 512))
+    return min(heap, cap)
+
+
+def java_version(meta: dict) -> int:
+    """Java feature version the pack's Minecraft runs on.
+
+    "jvm": {"java": 21} in manifest.json wins over the mc_version mapping.
+    """
+
+    overrides = meta.get("jvm") if isinstance(meta.get("jvm"), dict) else {}
+    if isinstance(overrides.get("java"), int):
+        return overrides["java"]
+    numbers = []
+    for part in str(meta.get("mc_version") or "").split("-", 1)[0].split("."):
+        if not part.isdigit():
+            break
+        numbers.append(int(part))
+    if not numbers:
+        # Unknown: assume the oldest Java current packs need, so no flag
+        # is passed that the JVM might reject.
+        return 17
+    for first, java in _JAVA_BY_MC:
+        if tuple(numbers) >= first:
+            return java
+    return 8
+
+
+def gc_flags(gc: str, java: int) -> list[str]:
+    if gc == "zgc" and java < ZGC_MIN_JAVA:
+        gc = DEFAULT_GC
+    flags = list(GC_FLAGS.get(gc, GC_FLAGS[DEFAULT_GC]))
+    if gc == "zgc" and java >= GENERATIONAL_ZGC_JAVA:
+        flags.insert(1, "-XX:+ZGenerational")
+    return flags
+
+
+def java_args(meta: dict, game_dir: str) -> list[str]:
+    """JVM arguments for the pack deployed in game_dir.
+
+    manifest.json may override them with
+    "jvm": {"heap_mb": 6144, "gc": "g1" | "zgc" | "default", "java": 21, "extra_args": [...]}.
+    """
+
+    overrides = meta.get("jvm") if isinstance(meta.get("jvm"), dict) else {}
+    heap = overrides.get("heap_mb")
+    if not isinstance(heap, int) or heap <= 0:
+        heap = heap_mb(*pack_footprint(game_dir), host_memory_mb())
+    gc = overrides.get("gc", DEFAULT_GC)
+    args = [f"-Xmx{heap}M", f"-Xms{heap}M"] + gc_flags(gc, java_version(meta))
+    extra = overrides.get("extra_args")
+    if isinstance(extra, list):
+        args += [str(a) for a in extra]
+    return args
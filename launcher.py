@@ -1,39 +1,105 @@
-import time
-import psutil
-from utils.colors import info
+import threading
+from utils.colors import info, warn
+from process_watcher import DEFAULT_TARGET_PROCESSES, GameProcess, format_ts, target_processes
 
-TARGET_PROCESSES = [
-    "MinecraftLauncher.exe",
-    "Minecraft.exe",
-    "javaw.exe"
-]
+TARGET_PROCESSES = DEFAULT_TARGET_PROCESSES
 
-def wait_for_minecraft_start():
+def wait_for_minecraft_start(config: dict | None = None) -> GameProcess:
     info("Minecraft 실행 대기 중...")
-    while True:
-        for p in psutil.process_iter(["name"]):
-            if p.info["name"] in TARGET_PROCESSES:
-                info(f"{p.info['name']} 감지됨")
-                return
-        time.sleep(1)
+    game = GameProcess(target_processes(config))
+    game.wait_start()
+    info(f"{game.name} 감지됨 (pid {game.pid}, {format_ts(game.started_at)})")
+    return game
 
-def wait_for_minecraft_exit():
+def wait_for_minecraft_exit(game: GameProcess):
     info("Minecraft 종료 대기 중...")
-    while True:
-        running = False
-        for p in psutil.process_iter(["name"]):
-            if p.info["name"] in TARGET_PROCESSES:
-                running = True
-                break
-        if not running:
-            info("Minecraft 종료 감지")
-            return
-        time.sleep(2)
-
-def launch_minecraft():
-    wait_for_minecraft_start()
-    return None
-
-
-def wait_for_exit(_proc=None):
-    wait_for_minecraft_exit()
+    game.wait_exit()
+    info(f"Minecraft 종료 감지 ({format_ts(game.exited_at)}, {game.summary()['duration']:.3f}s)")
+
+def launch_minecraft(config: dict | None = None, version_id: str | None = None, minecraft_path: str | None = None,
+                     game_dir: str | None = None, jvm_args: list[str] | None = None) -> GameProcess:
+    """launcher_mode "direct" starts the JVM for version_id in game_dir
+    itself; otherwise wait for the game started from the official launcher."""
+
+    if (config or {}).get("launcher_mode") != "direct":
+        return wait_for_minecraft_start(config)
+
+    import direct_launch
+    minecraft_path = minecraft_path or config["minecraft_path"]
+    if not version_id:
+        raise direct_launch.LaunchError("direct 모드에는 실행할 버전이 필요합니다")
+    info(f"Minecraft 직접 실행: {version_id}")
+    popen = direct_launch.launch(minecraft_path, version_id, game_dir or minecraft_path, config, jvm_args)
+    # No names: once the JVM exits there is no successor process to adopt.
+    game = GameProcess([], popen=popen)
+    info(f"{game.name} 실행됨 (pid {game.pid}, {format_ts(game.started_at)})")
+    return game
+
+
+def wait_for_exit(proc: GameProcess | None = None, config: dict | None = None):
+    if proc is None:
+        proc = wait_for_minecraft_start(config)
+    wait_for_minecraft_exit(proc)
+    return proc
+
+
+_instances: dict[str, GameProcess] = {}
+_instances_lock = threading.Lock()
+
+# An instance whose game isn't started within this many seconds is given up
+# (instance_start_timeout option), so the pack can be run again.
+INSTANCE_START_TIMEOUT = 600
+
+
+def watch_instance(pack_id: str, game_dir: str, config: dict | None = None, on_exit=None,
+                   game: GameProcess | None = None) -> threading.Thread:
+    """Track the game running from game_dir in the background.
+
+    Several instances can be watched at once; each watcher only accepts a
+    process started with its own --gameDir. game is an already launched
+    process (direct mode) to watch instead. on_exit(game) is called when
+    the watch ends; game.started_at is None if the game never started.
+    """
+
+    if game is None:
+        game = GameProcess(target_processes(config), game_dir=game_dir)
+    with _instances_lock:
+        _instances[pack_id] = game
+    start_timeout = (config or {}).get("instance_start_timeout", INSTANCE_START_TIMEOUT)
+
+    def _run():
+        try:
+            if not game.wait_start(timeout=start_timeout):
+                warn(f"[{pack_id}] 게임이 시작되지 않아 감시를 중단합니다.")
+                if on_exit:
+                    on_exit(game)
+                return
+            info(f"[{pack_id}] {game.name} 감지됨 (pid {game.pid}, {format_ts(game.started_at)})")
+            game.wait_exit()
+            info(f"[{pack_id}] Minecraft 종료 감지 ({format_ts(game.exited_at)})")
+            if on_exit:
+                on_exit(game)
+        finally:
+            with _instances_lock:
+                if _instances.get(pack_id) is game:
+                    del _instances[pack_id]
+
+    thread = threading.Thread(target=_run, name=f"instance-{pack_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+def running_instances() -> dict[str, GameProcess]:
+    with _instances_lock:
+        return dict(_instances)
+
+
+def stop_instance(pack_id: str) -> GameProcess | None:
+    """Give up on a watched instance that hasn't started, or terminate its
+    game. None if the pack isn't being watched."""
+
+    with _instances_lock:
+        game = _instances.get(pack_id)
+    if game is not None:
+        game.stop()
+    return game
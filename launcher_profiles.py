@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+PROFILES_FILE = "launcher_profiles.json"
+PROFILE_PREFIX = "modular-"
+BACKUP_SUFFIX = ".modular-backup"
+
+
+def profiles_path(minecraft_path: str) -> str:
+    return os.path.join(minecraft_path, PROFILES_FILE)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def load_profiles(minecraft_path: str) -> dict | None:
+    try:
+        with open(profiles_path(minecraft_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def save_profiles(minecraft_path: str, data: dict):
+    path = profiles_path(minecraft_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def backup_path(minecraft_path: str) -> str:
+    return profiles_path(minecraft_path) + BACKUP_SUFFIX
+
+
+def backup_profiles(minecraft_path: str) -> bool:
+    """Keep a copy of launcher_profiles.json until restore_profiles().
+
+    An existing backup is left alone: it is the original from a session
+    that never got to restore it.
+    """
+
+    path = profiles_path(minecraft_path)
+    backup = backup_path(minecraft_path)
+    if os.path.exists(backup):
+        return True
+    if not os.path.exists(path):
+        return False
+    tmp = backup + ".tmp"
+    shutil.copy2(path, tmp)
+    os.replace(tmp, backup)
+    return True
+
+
+def restore_profiles(minecraft_path: str) -> bool:
+    """Put the backed up launcher_profiles.json back, if there is one."""
+
+    backup = backup_path(minecraft_path)
+    if not os.path.exists(backup):
+        return False
+    os.replace(backup, profiles_path(minecraft_path))
+    return True
+
+
+def upsert_pack_profile(minecraft_path: str, pack_id: str, **fields) -> str | None:
+    """Create/update the launcher profile for pack_id; returns its key.
+
+    fields are merged into the profile (lastVersionId, gameDir, javaArgs...);
+    a None value removes the key. Does nothing if the launcher has never
+    written launcher_profiles.json.
+    """
+
+    data = load_profiles(minecraft_path)
+    if data is None:
+        return None
+
+    key = f"{PROFILE_PREFIX}{pack_id}"
+    now = _now()
+    profiles = data.setdefault("profiles", {})
+    profile = profiles.setdefault(key, {"name": f"Modular - {pack_id}", "type": "custom", "created": now})
+    for name, value in fields.items():
+        if value is None:
+            profile.pop(name, None)
+        else:
+            profile[name] = value
+    profile["lastUsed"] = now
+
+    save_profiles(minecraft_path, data)
+    return key
@@ -0,0 +1,151 @@
+import json
+import os
+import time
+
+from store_manager import is_immutable, link_or_copy
+
+LOADER_CACHE_DIR = os.path.join("cache", "loaders")
+SNAPSHOT_FILE = "snapshot.json"
+
+# libraries/ subtrees owned by each loader (the same ones cleanup_loader removes).
+LOADER_LIBRARY_DIRS = {
+    "fabric": [os.path.join("net", "fabricmc")],
+    "forge": [os.path.join("net", "minecraftforge")],
+    "neoforge": [os.path.join("net", "neoforged")],
+}
+
+
+def version_prefix(loader: str, mc_version: str) -> str:
+    if loader == "fabric":
+        return "fabric-loader-"
+    return f"{loader}-{mc_version}-"
+
+
+def version_id(loader: str, mc_version: str, loader_version: str) -> str:
+    if loader == "fabric":
+        return f"fabric-loader-{loader_version}-{mc_version}"
+    return f"{loader}-{mc_version}-{loader_version}"
+
+
+def find_installed(loader: str, mc_version: str, minecraft_path: str,
+                   loader_version: str | None = None) -> tuple[str, str] | None:
+    """Return (version_id, loader_version) of an installed loader, newest first."""
+
+    versions_dir = os.path.join(minecraft_path, "versions")
+    if loader_version:
+        vid = version_id(loader, mc_version, loader_version)
+        return (vid, loader_version) if os.path.isdir(os.path.join(versions_dir, vid)) else None
+
+    if not os.path.isdir(versions_dir):
+        return None
+
+    prefix = version_prefix(loader, mc_version)
+    found = []
+    for name in os.listdir(versions_dir):
+        if not name.startswith(prefix):
+            continue
+        if loader == "fabric":
+            if not name.endswith(f"-{mc_version}"):
+                continue
+            lv = name[len(prefix):-len(mc_version) - 1]
+        else:
+            lv = name[len(prefix):]
+        path = os.path.join(versions_dir, name)
+        if lv and os.path.isdir(path):
+            found.append((os.path.getmtime(path), name, lv))
+    if not found:
+        return None
+    found.sort(reverse=True)
+    return found[0][1], found[0][2]
+
+
+def _entry_dir(loader: str, mc_version: str, loader_version: str) -> str:
+    return os.path.join(LOADER_CACHE_DIR, loader, mc_version, loader_version)
+
+
+def _merge_tree(src: str, dst: str) -> int:
+    """Link/copy every file of src missing from dst. Returns files added."""
+
+    added = 0
+    for root, _dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        out_dir = dst if rel == "." else os.path.join(dst, rel)
+        for fname in files:
+            target = os.path.join(out_dir, fname)
+            if os.path.exists(target):
+                continue
+            os.makedirs(out_dir, exist_ok=True)
+            link_or_copy(os.path.join(root, fname), target, hardlink=is_immutable(target))
+            added += 1
+    return added
+
+
+def lookup(loader: str, mc_version: str, loader_version: str | None = None) -> dict | None:
+    """Return the snapshot record for (loader, mc_version, loader_version).
+
+    Without loader_version the most recently stored snapshot for that
+    Minecraft version is used.
+    """
+
+    if loader_version:
+        candidates = [_entry_dir(loader, mc_version, loader_version)]
+    else:
+        base = os.path.join(LOADER_CACHE_DIR, loader, mc_version)
+        if not os.path.isdir(base):
+            return None
+        candidates = [os.path.join(base, d) for d in os.listdir(base)]
+
+    best = None
+    for entry_dir in candidates:
+        try:
+            with open(os.path.join(entry_dir, SNAPSHOT_FILE), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        record["dir"] = entry_dir
+        if best is None or record.get("stored_at", 0) > best.get("stored_at", 0):
+            best = record
+    return best
+
+
+def store(loader: str, mc_version: str, loader_version: str, vid: str, minecraft_path: str) -> int:
+    """Snapshot the installed loader into the cache, merging new files
+    (e.g. libraries the launcher downloaded since the last snapshot)."""
+
+    entry_dir = _entry_dir(loader, mc_version, loader_version)
+    added = _merge_tree(
+        os.path.join(minecraft_path, "versions", vid),
+        os.path.join(entry_dir, "versions", vid),
+    )
+    for lib in LOADER_LIBRARY_DIRS.get(loader, []):
+        src = os.path.join(minecraft_path, "libraries", lib)
+        if os.path.isdir(src):
+            added += _merge_tree(src, os.path.join(entry_dir, "libraries", lib))
+
+    snapshot_path = os.path.join(entry_dir, SNAPSHOT_FILE)
+    if added or not os.path.exists(snapshot_path):
+        os.makedirs(entry_dir, exist_ok=True)
+        with open(snapshot_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "loader": loader,
+                "mc_version": mc_version,
+                "loader_version": loader_version,
+                "version_id": vid,
+                "stored_at": time.time(),
+            }, f, ensure_ascii=False)
+    return added
+
+
+def restore(record: dict, minecraft_path: str) -> int:
+    """Materialize a snapshot into minecraft_path. Returns files placed."""
+
+    entry_dir = record["dir"]
+    vid = record["version_id"]
+    placed = _merge_tree(
+        os.path.join(entry_dir, "versions", vid),
+        os.path.join(minecraft_path, "versions", vid),
+    )
+    libs = os.path.join(entry_dir, "libraries")
+    if os.path.isdir(libs):
+        placed += _merge_tree(libs, os.path.join(minecraft_path, "libraries"))
+    return placed
@@ -1,10 +1,9 @@
 import glob
 import os
 import re
-import shutil
-import subprocess
-import urllib.error
-import urllib.request
+import fabric_native
+import loader_cache
+import trash
 from utils.colors import info, warn
 
 INSTALLERS_DIR = "installers"
@@ -81,6 +80,9 @@ def _parse_fabric_installer_version(path: str) -> str | None:
 
 
 def _download_fabric_installer_jar(version: str, dest_path: str) -> bool:
+    import urllib.error
+    import urllib.request
+
     url = (
         "https://maven.fabricmc.net/net/fabricmc/fabric-installer/"
         f"{version}/fabric-installer-{version}.jar"
@@ -96,10 +98,49 @@ def _download_fabric_installer_jar(version: str, dest_path: str) -> bool:
         return False
 
 
-def ensure_loader(meta: dict, minecraft_path: str):
+def _snapshot_loader(meta: dict, minecraft_path: str) -> str | None:
+    """Store the installed loader in the loader cache; returns its version id."""
+
+    loader = meta.get("loader")
+    mc_version = meta.get("mc_version")
+    if not mc_version or loader not in loader_cache.LOADER_LIBRARY_DIRS:
+        return None
+
+    installed = loader_cache.find_installed(loader, mc_version, minecraft_path, meta.get("loader_version"))
+    if not installed:
+        return None
+    vid, loader_version = installed
+    try:
+        if loader_cache.store(loader, mc_version, loader_version, vid, minecraft_path):
+            info(f"로더 캐시 저장: {vid}")
+    except OSError as e:
+        warn(f"로더 캐시 저장 실패: {e}")
+    return vid
+
+
+def ensure_loader(meta: dict, minecraft_path: str, config: dict | None = None) -> dict | None:
+    """Install the pack's loader.
+
+    With loader_cache (default on) a snapshot of a previous install is
+    restored instead of running the installer; a real install is
+    snapshotted afterwards. Returns {"loader", "version_id", "cache"}.
+    """
+
     loader = meta.get("loader") if isinstance(meta, dict) else None
     if not loader:
-        return
+        return None
+
+    use_cache = (config or {}).get("loader_cache", True)
+    mc_version = meta.get("mc_version")
+    if use_cache and mc_version:
+        record = loader_cache.lookup(loader, mc_version, meta.get("loader_version"))
+        if record:
+            try:
+                placed = loader_cache.restore(record, minecraft_path)
+                info(f"로더 캐시 복원: {record['version_id']} ({placed}개 파일)")
+                return {"loader": loader, "version_id": record["version_id"], "cache": "hit"}
+            except OSError as e:
+                warn(f"로더 캐시 복원 실패, 설치로 진행: {e}")
 
     if loader == "forge":
         install_forge(meta, minecraft_path)
@@ -109,9 +150,19 @@ def ensure_loader(meta: dict, minecraft_path: str):
         install_fabric(meta, minecraft_path)
     else:
         warn(f"알 수 없는 로더 타입: {loader}")
+        return None
+
+    if use_cache:
+        vid = _snapshot_loader(meta, minecraft_path)
+    else:
+        installed = loader_cache.find_installed(loader, mc_version or "", minecraft_path, meta.get("loader_version"))
+        vid = installed[0] if installed else None
+    return {"loader": loader, "version_id": vid, "cache": "miss"}
 
 
 def install_forge(meta: dict, minecraft_path: str):
+    import subprocess
+
     mc_version = meta.get("mc_version")
     loader_version = meta.get("loader_version")
 
@@ -149,6 +200,15 @@ def install_fabric(meta: dict, minecraft_path: str):
         warn("Fabric 설치 메타 정보 부족 (mc_version)")
         return
 
+    try:
+        vid = fabric_native.install(mc_version, meta.get("loader_version"), minecraft_path)
+    except (OSError, ValueError) as e:
+        warn(f"Fabric 오프라인 설치 실패, 인스톨러로 진행: {e}")
+        vid = None
+    if vid:
+        info(f"Fabric 로더 설치 완료 (오프라인): {vid}")
+        return
+
     installer_path = _find_fabric_installer_path()
     if not installer_path:
         warn(
@@ -167,6 +227,8 @@ def install_fabric(meta: dict, minecraft_path: str):
         else:
             installer_path = jar_dest
 
+    import subprocess
+
     info("Fabric 로더 설치 중...")
     try:
         if installer_path.lower().endswith(".jar"):
@@ -197,9 +259,16 @@ def install_fabric(meta: dict, minecraft_path: str):
         )
     except Exception as e:
         warn(f"Fabric 로더 설치 실패: {e}")
+        return
+
+    installed = loader_cache.find_installed("fabric", mc_version, minecraft_path, meta.get("loader_version"))
+    if installed:
+        fabric_native.harvest(installed[0], minecraft_path)
 
 
 def install_neoforge(meta: dict, minecraft_path: str):
+    import subprocess
+
     mc_version = meta.get("mc_version")
     loader_version = meta.get("loader_version")
 
@@ -232,11 +301,15 @@ def install_neoforge(meta: dict, minecraft_path: str):
         warn(f"NeoForge 로더 설치 실패: {e}")
 
 
-def cleanup_loader(meta: dict, minecraft_path: str):
+def cleanup_loader(meta: dict, minecraft_path: str, config: dict | None = None):
     loader = meta.get("loader") if isinstance(meta, dict) else None
     if not loader:
         return
 
+    # Libraries the launcher fetched during the session only exist now.
+    if (config or {}).get("loader_cache", True):
+        _snapshot_loader(meta, minecraft_path)
+
     mc_version = meta.get("mc_version")
     loader_version = meta.get("loader_version")
 
@@ -254,6 +327,9 @@ def cleanup_loader(meta: dict, minecraft_path: str):
         if not mc_version:
             warn("Fabric 제거 메타 정보 부족 (mc_version)")
             return
+        installed = loader_cache.find_installed("fabric", mc_version, minecraft_path, loader_version)
+        if installed:
+            fabric_native.harvest(installed[0], minecraft_path)
         _remove_fabric(mc_version, minecraft_path)
     else:
         warn(f"알 수 없는 로더 타입: {loader}")
@@ -266,14 +342,14 @@ def _remove_forge(mc_version: str, loader_version: str, minecraft_path: str):
     if os.path.exists(version_dir):
         info(f"Forge 로더 제거 중: {version_id}")
         try:
-            shutil.rmtree(version_dir)
+            trash.discard(version_dir, minecraft_path)
         except Exception as e:
             warn(f"Forge 버전 폴더 제거 실패: {e}")
 
     lib_dir = os.path.join(minecraft_path, "libraries", "net", "minecraftforge")
     if os.path.exists(lib_dir):
         try:
-            shutil.rmtree(lib_dir)
+            trash.discard(lib_dir, minecraft_path)
         except Exception as e:
             warn(f"Forge 라이브러리 제거 실패: {e}")
 
@@ -289,7 +365,7 @@ def _remove_fabric(mc_version: str, minecraft_path: str):
                 path = os.path.join(versions_dir, name)
                 info(f"Fabric 로더 제거 중: {name}")
                 try:
-                    shutil.rmtree(path)
+                    trash.discard(path, minecraft_path)
                 except Exception as e:
                     warn(f"Fabric 버전 폴더 제거 실패: {e}")
     except Exception as e:
@@ -298,7 +374,7 @@ def _remove_fabric(mc_version: str, minecraft_path: str):
     lib_dir = os.path.join(minecraft_path, "libraries", "net", "fabricmc")
     if os.path.exists(lib_dir):
         try:
-            shutil.rmtree(lib_dir)
+            trash.discard(lib_dir, minecraft_path)
         except Exception as e:
             warn(f"Fabric 라이브러리 제거 실패: {e}")
 
@@ -310,13 +386,13 @@ def _remove_neoforge(mc_version: str, loader_version: str, minecraft_path: str):
     if os.path.exists(version_dir):
         info(f"NeoForge 로더 제거 중: {version_id}")
         try:
-            shutil.rmtree(version_dir)
+            trash.discard(version_dir, minecraft_path)
         except Exception as e:
             warn(f"NeoForge 버전 폴더 제거 실패: {e}")
 
     lib_dir = os.path.join(minecraft_path, "libraries", "net", "neoforged")
     if os.path.exists(lib_dir):
         try:
-            shutil.rmtree(lib_dir)
+            trash.discard(lib_dir, minecraft_path)
         except Exception as e:
             warn(f"NeoForge 라이브러리 제거 실패: {e}")
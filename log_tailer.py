@@ -0,0 +1,197 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+POLL_INTERVAL = 0.2
+
+# First line matching each pattern marks the milestone, in boot order.
+MILESTONES = [
+    ("loader_init", re.compile(r"with Fabric Loader|ModLauncher running|Launching target '\w*client")),
+    ("mod_init", re.compile(r"Loading \d+ mods|modloading-worker")),
+    ("resource_reload", re.compile(r"Reloading ResourceManager")),
+    ("main_menu", re.compile(r"Sound engine started")),
+    ("world_join", re.compile(r"joined the game|Connecting to \S+, \d+|Started serving on")),
+]
+
+_SPAN_NAMES = {"main_menu": "time_to_menu"}
+
+# "[12:34:56]", "[12:34:56.789]" or Forge's "[12Oct2024 12:34:56.789]".
+_LINE_TIME = re.compile(r"^\[(?:\d{2}[A-Za-z]{3}\d{4} )?(\d{2}):(\d{2}):(\d{2})(?:\.(\d{3}))?\]")
+
+
+def line_time(line: str, received: float) -> float:
+    """Wall-clock time a log line was written, falling back to received.
+
+    Log lines only carry a time of day; the date is taken from received.
+    """
+
+    m = _LINE_TIME.match(line)
+    if not m:
+        return received
+    day = datetime.fromtimestamp(received)
+    ts = day.replace(
+        hour=int(m.group(1)), minute=int(m.group(2)), second=int(m.group(3)),
+        microsecond=int(m.group(4) or 0) * 1000,
+    )
+    if ts.timestamp() > received + 60:
+        # Written before midnight, read after it.
+        ts -= timedelta(days=1)
+    return ts.timestamp()
+
+
+class MilestoneTracker:
+    """Turns game log lines into {milestone: timestamp}."""
+
+    def __init__(self, on_milestone=None):
+        self.milestones: dict[str, float] = {}
+        self.on_milestone = on_milestone
+        self._lock = threading.Lock()
+
+    def feed(self, line: str, received: float | None = None):
+        received = received if received is not None else time.time()
+        for name, pattern in MILESTONES:
+            if name in self.milestones or not pattern.search(line):
+                continue
+            with self._lock:
+                if name in self.milestones:
+                    continue
+                self.milestones[name] = line_time(line, received)
+            if self.on_milestone:
+                self.on_milestone(name, self.milestones[name])
+
+    def spans(self, started_at: float | None) -> list[tuple[str, float, float]]:
+        """(span name, start, end) from game start to every milestone seen."""
+
+        if started_at is None:
+            return []
+        with self._lock:
+            seen = sorted(self.milestones.items(), key=lambda kv: kv[1])
+        return [(_SPAN_NAMES.get(name, f"to_{name}"), started_at, max(started_at, ts)) for name, ts in seen]
+
+
+def _identity(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_dev
+
+
+class LogTailer:
+    """Follow <game dir>/logs/latest.log for one session in a daemon thread.
+
+    The file present when the tailer starts belongs to the previous session
+    and is ignored; the game rotates it on startup, and the new file is
+    read from its first line. Truncation or another rotation reopens it.
+    """
+
+    def __init__(self, log_path: str, on_milestone=None):
+        self.log_path = log_path
+        self.tracker = MilestoneTracker(on_milestone)
+        self._stale = _identity(log_path)
+        self._stale_size = os.path.getsize(log_path) if self._stale else 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def for_game_dir(cls, game_dir: str, on_milestone=None) -> "LogTailer":
+        return cls(os.path.join(game_dir, "logs", "latest.log"), on_milestone)
+
+    @property
+    def milestones(self) -> dict[str, float]:
+        return self.tracker.milestones
+
+    def start(self) -> "LogTailer":
+        self._thread = threading.Thread(target=self._run, name="log-tailer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        """Read what is left in the log, then stop."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _open(self):
+        identity = _identity(self.log_path)
+        if identity is None:
+            return None, None
+        if identity == self._stale:
+            try:
+                if os.path.getsize(self.log_path) >= self._stale_size:
+                    return None, None
+            except OSError:
+                return None, None
+        try:
+            return open(self.log_path, "r", encoding="utf-8", errors="replace"), identity
+        except OSError:
+            return None, None
+
+    def _run(self):
+        f, identity = None, None
+        partial = ""
+        while True:
+            stopping = self._stop.is_set()
+            if f is None:
+                f, identity = self._open()
+            if f is not None:
+                chunk = f.read()
+                if chunk:
+                    received = time.time()
+                    lines = (partial + chunk).split("\n")
+                    partial = lines.pop()
+                    for line in lines:
+                        self.tracker.feed(line, received)
+                else:
+                    current = _identity(self.log_path)
+                    try:
+                        truncated = os.path.getsize(self.log_path) < f.tell()
+                    except OSError:
+                        truncated = False
+                    if current != identity or truncated:
+                        f.close()
+                        f, partial = None, ""
+                        self._stale = None
+                        continue
+            if stopping:
+                break
+            self._stop.wait(POLL_INTERVAL)
+        if f is not None:
+            if partial:
+                self.tracker.feed(partial)
+            f.close()
+
+
+class StreamTailer:
+    """Feed a launched game's stdout to a MilestoneTracker (direct launch).
+
+    The thread ends by itself when the game closes the stream.
+    """
+
+    def __init__(self, stream, on_milestone=None):
+        self.stream = stream
+        self.tracker = MilestoneTracker(on_milestone)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def milestones(self) -> dict[str, float]:
+        return self.tracker.milestones
+
+    def start(self) -> "StreamTailer":
+        self._thread = threading.Thread(target=self._run, name="stdout-tailer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            for line in self.stream:
+                self.tracker.feed(line.rstrip("\r\n"))
+        except (OSError, ValueError):
+            pass
@@ -1,6 +1,7 @@
-from commands import handle_command
+from commands import handle_command, run_command
 from utils.banner import print_banner
 from utils.colors import info, error
+from utils.logger import configure as configure_logging
 import json
 import os
 import sys
@@ -14,9 +15,97 @@ def load_config():
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="modular", description="Modular - Offline Minecraft Mod Launcher")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="팩을 적용하고 게임 세션을 관리합니다")
+    p.add_argument("pack")
+
+    p = sub.add_parser("check", help="팩의 모드 의존성/버전을 검사합니다")
+    p.add_argument("pack")
+
+    p = sub.add_parser("verify", help="팩과 적용된 파일의 무결성을 검사합니다")
+    p.add_argument("pack")
+
+    p = sub.add_parser("profile", help="모드별 로딩 시간 기록을 보고합니다")
+    p.add_argument("pack")
+    p.add_argument("sessions", nargs="?", type=int)
+
+    p = sub.add_parser("list", help="팩 목록 (mc_version / loader 로 필터)")
+    p.add_argument("filters", nargs="*")
+
+    p = sub.add_parser("clear", help="팩이 적용한 모드/로더를 정리합니다")
+    p.add_argument("pack")
+
+    p = sub.add_parser("gc", help="팩 중복 제거, 오래된 캐시/저장소 객체 정리")
+    p.add_argument("--dry-run", action="store_true", help="회수 가능한 용량만 보고합니다")
+
+    p = sub.add_parser("mpack", help=".mpack 팩 아카이브 생성/확인")
+    actions = p.add_subparsers(dest="action", required=True)
+    a = actions.add_parser("build", help="팩 또는 폴더를 .mpack 으로 묶습니다")
+    a.add_argument("source")
+    a.add_argument("output", nargs="?")
+    a = actions.add_parser("inspect", help="항목 목록을 출력합니다")
+    a.add_argument("file")
+    a = actions.add_parser("verify", help="모든 항목의 해시를 검사합니다")
+    a.add_argument("file")
+
+    p = sub.add_parser("delta", help="팩 버전 간 델타 생성/적용")
+    actions = p.add_subparsers(dest="action", required=True)
+    a = actions.add_parser("create", help="기준 버전에서 새 버전으로의 델타를 만듭니다")
+    a.add_argument("base")
+    a.add_argument("new")
+    a.add_argument("output", nargs="?")
+    a = actions.add_parser("apply", help="델타로 팩을 업데이트합니다")
+    a.add_argument("pack")
+    a.add_argument("file")
+    return parser
+
+
+def cli(argv: list[str]) -> int:
+    """Non-interactive entry point: main.py run <pack> | check <pack> | verify <pack> | profile <pack> | list | clear <pack> | gc | mpack ... | delta ...
+
+    Exit codes: 0 ok, 1 failed, 2 usage error.
+    """
+
+    args = build_parser().parse_args(argv)
+    config = load_config()
+    configure_logging(**config.get("logging", {}))
+
+    if args.command == "list":
+        cmd_args = args.filters
+    elif args.command == "profile":
+        cmd_args = [args.pack] + ([str(args.sessions)] if args.sessions else [])
+    elif args.command == "gc":
+        cmd_args = ["--dry-run"] if args.dry_run else []
+    elif args.command == "mpack":
+        if args.action == "build":
+            cmd_args = ["build", args.source] + ([args.output] if args.output else [])
+        else:
+            cmd_args = [args.action, args.file]
+    elif args.command == "delta":
+        if args.action == "create":
+            cmd_args = ["create", args.base, args.new] + ([args.output] if args.output else [])
+        else:
+            cmd_args = ["apply", args.pack, args.file]
+    else:
+        cmd_args = [args.pack]
+    return run_command(f"!{args.command}", cmd_args, config, interactive=False)
+
+
 def main():
+    if len(sys.argv) > 1:
+        try:
+            sys.exit(cli(sys.argv[1:]))
+        except KeyboardInterrupt:
+            sys.exit(130)
+
     print_banner()
     config = load_config()
+    configure_logging(**config.get("logging", {}))
     info("Modular 시작")
 
     while True:
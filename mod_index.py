@@ -0,0 +1,540 @@
+import io
+import json
+import os
+import re
+import zipfile
+
+import hash_cache
+
+CACHE_DIR = "cache"
+INDEX_FILE = "mods.json"
+INDEX_VERSION = 1
+
+FABRIC_METADATA = "fabric.mod.json"
+FORGE_METADATA = "META-INF/mods.toml"
+NEOFORGE_METADATA = "META-INF/neoforge.mods.toml"
+JARJAR_METADATA = "META-INF/jarjar/metadata.json"
+
+# Ids provided by the game / loader itself rather than by a jar in mods/.
+BUILTIN_IDS = {
+    "fabric": {"minecraft", "java", "fabricloader", "fabric-loader", "mixinextras"},
+    "forge": {"minecraft", "java", "forge", "javafml", "lowcodefml", "mclanguage", "fml"},
+    "neoforge": {"minecraft", "java", "neoforge", "forge", "javafml", "lowcodefml", "mclanguage", "fml"},
+}
+LOADER_IDS = {"fabricloader", "forge", "neoforge"}
+
+_MAX_NESTING = 3
+
+# In-process copy of cache/mods.json:
+# {"version": 1, "jars": {key: [mod record, ...]}}
+# where key is the jar's sha256 (or "crc32:<crc>:<size>" for zip members).
+_index: dict | None = None
+_dirty = False
+
+
+def _index_path() -> str:
+    return os.path.join(CACHE_DIR, INDEX_FILE)
+
+
+def _load_index() -> dict:
+    global _index
+    if _index is None:
+        try:
+            with open(_index_path(), "r", encoding="utf-8") as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+        if _index.get("version") != INDEX_VERSION or not isinstance(_index.get("jars"), dict):
+            _index = {"version": INDEX_VERSION, "jars": {}}
+    return _index
+
+
+def save():
+    global _dirty
+    if not _dirty or _index is None:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = _index_path() + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_index, f, ensure_ascii=False)
+    os.replace(tmp, _index_path())
+    _dirty = False
+
+
+def _read_text(zf: zipfile.ZipFile, name: str) -> str:
+    return zf.read(name).decode("utf-8-sig", errors="replace")
+
+
+def _manifest_version(zf: zipfile.ZipFile) -> str | None:
+    try:
+        text = _read_text(zf, "META-INF/MANIFEST.MF")
+    except KeyError:
+        return None
+    for line in text.splitlines():
+        if line.startswith("Implementation-Version:"):
+            return line.split(":", 1)[1].strip()
+    return None
+
+
+def _dep(dep_id: str, kind: str, version_range) -> dict:
+    return {"id": dep_id, "type": kind, "range": version_range}
+
+
+def _parse_fabric(zf: zipfile.ZipFile) -> tuple[list[dict], list[str]]:
+    # Some mods ship control characters inside strings; strict=False accepts them.
+    data = json.loads(_read_text(zf, FABRIC_METADATA), strict=False)
+    deps = []
+    for key, kind in (("depends", "depends"), ("breaks", "breaks"), ("conflicts", "conflicts")):
+        for dep_id, ranges in (data.get(key) or {}).items():
+            deps.append(_dep(dep_id, kind, ranges if isinstance(ranges, list) else [ranges]))
+
+    provides = [p if isinstance(p, str) else p.get("id") for p in data.get("provides", [])]
+    record = {
+        "id": data.get("id"),
+        "version": str(data.get("version", "")),
+        "platform": "fabric",
+        "syntax": "semver",
+        "provides": [p for p in provides if p],
+        "deps": deps,
+    }
+    nested = [j["file"] for j in data.get("jars", []) if isinstance(j, dict) and j.get("file")]
+    return [record], nested
+
+
+def _parse_toml(zf: zipfile.ZipFile, name: str, platform: str) -> tuple[list[dict], list[str]]:
+    import tomllib
+
+    data = tomllib.loads(_read_text(zf, name))
+    records = []
+    deps_table = data.get("dependencies") or {}
+    for mod in data.get("mods", []):
+        mod_id = mod.get("modId")
+        version = str(mod.get("version", ""))
+        if "${" in version:
+            version = _manifest_version(zf) or ""
+
+        deps = []
+        entries = deps_table.get(mod_id, []) if isinstance(deps_table, dict) else []
+        for entry in entries if isinstance(entries, list) else []:
+            if str(entry.get("side", "BOTH")).upper() == "SERVER":
+                continue
+            kind = str(entry.get("type", "")).lower()
+            if not kind:
+                kind = "required" if entry.get("mandatory", True) else "optional"
+            kind = {
+                "required": "depends",
+                "optional": "optional",
+                "incompatible": "breaks",
+                "discouraged": "conflicts",
+            }.get(kind, "optional")
+            deps.append(_dep(entry.get("modId"), kind, entry.get("versionRange", "")))
+
+        records.append({
+            "id": mod_id,
+            "version": version,
+            "platform": platform,
+            "syntax": "maven",
+            "provides": [],
+            "deps": deps,
+        })
+
+    nested = []
+    try:
+        jarjar = json.loads(_read_text(zf, JARJAR_METADATA))
+        nested = [j["path"] for j in jarjar.get("jars", []) if isinstance(j, dict) and j.get("path")]
+    except (KeyError, ValueError):
+        pass
+    return records, nested
+
+
+def _read_jar(zf: zipfile.ZipFile, depth: int = 0) -> list[dict]:
+    """Mod records declared by an open jar, including jar-in-jar mods."""
+
+    names = set(zf.namelist())
+    records: list[dict] = []
+    nested: list[str] = []
+    parsers = (
+        (FABRIC_METADATA, lambda: _parse_fabric(zf)),
+        (NEOFORGE_METADATA, lambda: _parse_toml(zf, NEOFORGE_METADATA, "neoforge")),
+        (FORGE_METADATA, lambda: _parse_toml(zf, FORGE_METADATA, "forge")),
+    )
+    for name, parse in parsers:
+        if name not in names:
+            continue
+        try:
+            found, inner = parse()
+        except (ValueError, AttributeError, TypeError) as e:
+            records.append({"platform": None, "error": f"{name}: {e}"})
+            continue
+        records.extend(r for r in found if r["id"])
+        nested.extend(inner)
+
+    if depth < _MAX_NESTING:
+        for name in dict.fromkeys(nested):
+            if name not in names:
+                continue
+            try:
+                with zipfile.ZipFile(io.BytesIO(zf.read(name))) as inner_zf:
+                    inner_records = _read_jar(inner_zf, depth + 1)
+            except zipfile.BadZipFile:
+                continue
+            for record in inner_records:
+                record["nested"] = True
+            records.extend(inner_records)
+    return records
+
+
+def read_mods(jar_path: str) -> list[dict]:
+    """Mod records for a jar on disk, cached by the jar's sha256."""
+
+    global _dirty
+    key = hash_cache.file_digest(jar_path)
+    jars = _load_index()["jars"]
+    if key not in jars:
+        try:
+            with zipfile.ZipFile(jar_path) as zf:
+                jars[key] = _read_jar(zf)
+        except zipfile.BadZipFile as e:
+            jars[key] = [{"platform": None, "error": str(e)}]
+        _dirty = True
+    return jars[key]
+
+
+def read_zip_member_mods(zf: zipfile.ZipFile, member: zipfile.ZipInfo) -> list[dict]:
+    """Mod records for a jar stored inside a pack zip, cached by CRC/size."""
+
+    global _dirty
+    key = f"crc32:{member.CRC:08x}:{member.file_size}"
+    jars = _load_index()["jars"]
+    if key not in jars:
+        try:
+            with zipfile.ZipFile(io.BytesIO(zf.read(member))) as inner:
+                jars[key] = _read_jar(inner)
+        except zipfile.BadZipFile as e:
+            jars[key] = [{"platform": None, "error": str(e)}]
+        _dirty = True
+    return jars[key]
+
+
+def read_archive_entry_mods(reader, entry: dict) -> list[dict]:
+    """Mod records for a jar inside a .mpack, cached by its recorded sha256."""
+
+    global _dirty
+    jars = _load_index()["jars"]
+    if entry["hash"] not in jars:
+        try:
+            with zipfile.ZipFile(io.BytesIO(reader.read(entry))) as inner:
+                jars[entry["hash"]] = _read_jar(inner)
+        except zipfile.BadZipFile as e:
+            jars[entry["hash"]] = [{"platform": None, "error": str(e)}]
+        _dirty = True
+    return jars[entry["hash"]]
+
+
+def _ident(part: str):
+    return (0, int(part), "") if part.isdigit() else (1, 0, part)
+
+
+def parse_version(text: str) -> tuple | None:
+    """(numbers, prerelease) for a semver-like version, None if unparseable.
+
+    Numbers may contain None for x/* wildcards; prerelease is None for a
+    release. "1.21-" parses as the lowest prerelease of 1.21.
+    """
+
+    text = text.strip().split("+", 1)[0]
+    core, dash, pre = text.partition("-")
+    numbers = []
+    for part in core.split("."):
+        if part.isdigit():
+            numbers.append(int(part))
+        elif part in ("x", "X", "*"):
+            numbers.append(None)
+        else:
+            return None
+    prerelease = tuple(_ident(p) for p in pre.split(".") if p) if dash else None
+    return numbers, prerelease
+
+
+def compare_versions(a: tuple, b: tuple) -> int:
+    width = max(len(a[0]), len(b[0]))
+    na = [n or 0 for n in a[0]] + [0] * (width - len(a[0]))
+    nb = [n or 0 for n in b[0]] + [0] * (width - len(b[0]))
+    if na != nb:
+        return -1 if na < nb else 1
+    if a[1] == b[1]:
+        return 0
+    if a[1] is None:
+        return 1
+    if b[1] is None:
+        return -1
+    return -1 if a[1] < b[1] else 1
+
+
+_PREDICATE = re.compile(r"^(>=|<=|>|<|=|~|\^)?\s*(.+)$")
+
+
+def _matches_predicate(version: tuple, predicate: str) -> bool | None:
+    if predicate in ("*", ""):
+        return True
+    m = _PREDICATE.match(predicate)
+    op, target_text = m.group(1) or "=", m.group(2)
+    target = parse_version(target_text)
+    if target is None:
+        return None
+
+    numbers = target[0]
+    if None in numbers:
+        # "1.21.x": every component before the wildcard must match.
+        fixed = numbers[:numbers.index(None)]
+        return (version[0] + [0] * len(fixed))[:len(fixed)] == fixed
+
+    cmp = compare_versions(version, target)
+    if op == "=":
+        return cmp == 0
+    if op == ">=":
+        return cmp >= 0
+    if op == "<=":
+        return cmp <= 0
+    if op == ">":
+        return cmp > 0
+    if op == "<":
+        return cmp < 0
+
+    # ~1.2.3 allows patch updates, ^1.2.3 minor ones.
+    keep = 2 if op == "~" and len(numbers) > 1 else 1
+    upper = (numbers[:keep - 1] + [numbers[keep - 1] + 1], ())
+    return cmp >= 0 and compare_versions(version, upper) < 0
+
+
+def _satisfies_semver(version: tuple, ranges: list) -> bool | None:
+    unknown = False
+    for alternative in ranges:
+        results = [_matches_predicate(version, p) for p in str(alternative).split()]
+        if all(results):
+            return True
+        if None in results and False not in results:
+            unknown = True
+    return None if unknown else False
+
+
+_MAVEN_RANGE = re.compile(r"([\[(])\s*([^,\])]*?)\s*(?:(,)\s*([^\])]*?)\s*)?([\])])")
+
+
+def _satisfies_maven(version: tuple, spec: str) -> bool | None:
+    spec = str(spec).strip()
+    if spec in ("", "*") or spec[0] not in "[(":
+        # A bare version is only a recommendation in Maven range syntax.
+        return True
+
+    unknown = False
+    for m in _MAVEN_RANGE.finditer(spec):
+        open_, low, comma, high, close = m.groups()
+        if not comma:
+            high = low
+        ok = True
+        for bound, inclusive, sign in ((low, open_ == "[", 1), (high, close == "]", -1)):
+            if not bound:
+                continue
+            target = parse_version(bound)
+            if target is None:
+                unknown = True
+                ok = False
+                break
+            cmp = compare_versions(version, target) * sign
+            if cmp < 0 or (cmp == 0 and not inclusive):
+                ok = False
+                break
+        if ok:
+            return True
+    return None if unknown else False
+
+
+def satisfies(version_text: str, version_range, syntax: str) -> bool | None:
+    """Whether version_text is inside version_range; None if undecidable."""
+
+    version = parse_version(version_text)
+    if version is None or None in version[0]:
+        return None
+    if syntax == "maven":
+        return _satisfies_maven(version, version_range)
+    return _satisfies_semver(version, version_range if isinstance(version_range, list) else [version_range])
+
+
+def _records_for(records: list[dict], loader: str) -> list[dict]:
+    """The records a loader would actually read from one jar."""
+
+    usable = [r for r in records if r.get("platform") == loader]
+    if not usable and loader == "neoforge":
+        # NeoForge before 20.5 still read META-INF/mods.toml.
+        usable = [r for r in records if r.get("platform") == "forge"]
+    return usable
+
+
+def build_graph(jars: dict[str, list[dict]], loader: str) -> dict:
+    """Combine per-jar records into a mod graph for one loader.
+
+    Returns {"mods": {id: {"version", "jar", "nested", "syntax"}},
+             "edges": [(mod id, dep record)], "duplicates": [(id, jar, jar)],
+             "foreign": [(jar, platforms)], "unreadable": [(jar, error)],
+             "plain": [jar]}.
+    """
+
+    graph = {"mods": {}, "edges": [], "duplicates": [], "foreign": [], "unreadable": [], "plain": []}
+    for jar, records in sorted(jars.items()):
+        errors = [r["error"] for r in records if r.get("error")]
+        if errors and len(errors) == len(records):
+            graph["unreadable"].append((jar, errors[0]))
+            continue
+        top_level = [r for r in records if not r.get("nested") and not r.get("error")]
+        if not top_level:
+            graph["plain"].append(jar)
+            continue
+        usable = _records_for(records, loader)
+        if not [r for r in usable if not r.get("nested")]:
+            graph["foreign"].append((jar, sorted({r["platform"] for r in top_level})))
+            continue
+
+        for record in usable:
+            node = {
+                "version": record["version"],
+                "jar": jar,
+                "nested": bool(record.get("nested")),
+                "syntax": record["syntax"],
+            }
+            for mod_id in [record["id"]] + record.get("provides", []):
+                existing = graph["mods"].get(mod_id)
+                if existing and not existing["nested"] and not node["nested"] and existing["jar"] != jar:
+                    graph["duplicates"].append((mod_id, existing["jar"], jar))
+                    continue
+                if existing and not existing["nested"]:
+                    continue
+                graph["mods"][mod_id] = node
+            if not record.get("nested"):
+                graph["edges"].extend((record["id"], dep) for dep in record["deps"] if dep.get("id"))
+    return graph
+
+
+def check_graph(graph: dict, meta: dict) -> dict:
+    """Validate a mod graph against the pack's mc_version / loader.
+
+    Returns {"errors": [...], "warnings": [...], "mods": n}.
+    """
+
+    loader = meta.get("loader")
+    builtin = BUILTIN_IDS.get(loader, set())
+    known_versions = {"minecraft": meta.get("mc_version")}
+    for loader_id in LOADER_IDS:
+        known_versions[loader_id] = meta.get("loader_version")
+
+    errors = []
+    warnings = []
+    for jar, error in graph["unreadable"]:
+        errors.append(f"{jar}: 메타데이터를 읽을 수 없습니다 ({error})")
+    for jar, platforms in graph["foreign"]:
+        errors.append(f"{jar}: {loader} 모드가 아닙니다 ({', '.join(p or '?' for p in platforms)})")
+    for mod_id, first, second in graph["duplicates"]:
+        errors.append(f"모드 '{mod_id}' 가 중복되었습니다: {first}, {second}")
+    for jar in graph["plain"]:
+        warnings.append(f"{jar}: 모드 메타데이터가 없습니다")
+
+    mods = graph["mods"]
+    for mod_id, dep in graph["edges"]:
+        target = dep["id"]
+        syntax = mods[mod_id]["syntax"] if mod_id in mods else "semver"
+        if target in mods:
+            version = mods[target]["version"]
+        elif target in builtin:
+            version = known_versions.get(target)
+        else:
+            version = None
+        present = target in mods or target in builtin
+        matched = satisfies(version, dep["range"], syntax) if version else None
+        wanted = dep["range"] if isinstance(dep["range"], str) else " || ".join(map(str, dep["range"]))
+
+        if dep["type"] == "depends":
+            if not present:
+                errors.append(f"{mod_id}: 필요한 모드 '{target}' ({wanted}) 가 없습니다")
+            elif matched is False:
+                errors.append(f"{mod_id}: '{target}' {wanted} 필요 (현재 {version})")
+        elif dep["type"] == "optional":
+            if present and matched is False:
+                errors.append(f"{mod_id}: '{target}' {wanted} 필요 (현재 {version})")
+        elif dep["type"] == "breaks":
+            if present and target not in builtin and matched is not False:
+                errors.append(f"{mod_id}: '{target}' {version} 와(과) 함께 사용할 수 없습니다")
+        elif dep["type"] == "conflicts":
+            if present and target not in builtin and matched is not False:
+                warnings.append(f"{mod_id}: '{target}' {version} 와(과) 충돌할 수 있습니다")
+
+    return {"errors": errors, "warnings": warnings, "mods": len(mods)}
+
+
+def _pack_jars(pack: dict, config: dict) -> dict[str, list[dict]]:
+    from apply_manager import _find_pack_mpack, _find_pack_zip, _resolve_pack_source_dir, get_copy_targets
+    from transfer import workers_from_config
+
+    targets = get_copy_targets(pack["meta"])
+    jars = {}
+    mpack_path = _find_pack_mpack(pack["path"], targets)
+    if mpack_path:
+        from mpack import MPackReader
+        with MPackReader(mpack_path) as reader:
+            for name, entry in reader.entries.items():
+                parts = name.split("/")
+                if parts[0] == "mods" and name.lower().endswith(".jar"):
+                    jars[parts[-1]] = read_archive_entry_mods(reader, entry)
+        return jars
+
+    zip_path = None
+    if config.get("zip_mode", "cache") == "stream":
+        zip_path = _find_pack_zip(pack["path"], targets)
+    if zip_path:
+        with zipfile.ZipFile(zip_path) as zf:
+            for member in zf.infolist():
+                parts = member.filename.split("/")
+                if "mods" in parts[:-1] and member.filename.lower().endswith(".jar"):
+                    jars[parts[-1]] = read_zip_member_mods(zf, member)
+        return jars
+
+    source = _resolve_pack_source_dir(pack["path"], targets, workers_from_config(config))
+    mods_dir = os.path.join(source, "mods")
+    if os.path.isdir(mods_dir):
+        for name in sorted(os.listdir(mods_dir)):
+            path = os.path.join(mods_dir, name)
+            if name.lower().endswith(".jar") and os.path.isfile(path):
+                jars[name] = read_mods(path)
+    return jars
+
+
+def check_pack(pack: dict, config: dict | None = None) -> dict:
+    """Read (or reuse) every jar's metadata and validate the pack."""
+
+    config = config or {}
+    meta = pack["meta"] if isinstance(pack.get("meta"), dict) else {}
+    jars = _pack_jars(pack, config)
+    report = check_graph(build_graph(jars, meta.get("loader")), meta) if meta.get("loader") else {
+        "errors": [], "warnings": [], "mods": 0,
+    }
+    save()
+    hash_cache.save()
+    return report
+
+
+def pack_mod_ids(pack: dict, config: dict | None = None) -> dict[str, str]:
+    """{mod id: jar file name} for every mod the pack ships, nested ones
+    included, without the loader's builtin ids."""
+
+    config = config or {}
+    loader = pack["meta"].get("loader") if isinstance(pack.get("meta"), dict) else None
+    ids = {}
+    for jar, records in sorted(_pack_jars(pack, config).items()):
+        for record in _records_for(records, loader) if loader else records:
+            if record.get("id"):
+                for mod_id in [record["id"]] + record.get("provides", []):
+                    ids.setdefault(mod_id, jar)
+    save()
+    hash_cache.save()
+    for mod_id in BUILTIN_IDS.get(loader, set()):
+        ids.pop(mod_id, None)
+    return ids
@@ -0,0 +1,227 @@
+import json
+import os
+import re
+
+from log_tailer import MilestoneTracker, line_time
+from tracing import percentile
+
+PROFILE_DIR = os.path.join("logs", "profiles")
+HISTORY_WINDOW = 10
+
+# A thread idle for longer than this between two lines is waiting, not loading.
+MAX_GAP = 30.0
+
+# debug.log has millisecond timestamps and every logger, so it is preferred.
+LOG_FILES = ("debug.log", "latest.log")
+
+# [time] [thread/LEVEL] followed by Forge's "[logger/MARKER]:", the debug.log
+# "(logger)" or vanilla's bare ":".
+_LINE = re.compile(
+    r"^\[(?P<time>[^\]]+)\] \[(?P<thread>.+?)/(?P<level>[A-Z]+)\]"
+    r"(?: \[(?P<logger>[^\]]*?)(?:/[^\]/]*)?\]:| \((?P<paren>[^)]*)\)|:) ?(?P<msg>.*)$"
+)
+# Mod construction as logged by FML (Forge / NeoForge).
+_CONSTRUCT_START = re.compile(r"Loading mod instance (\S+) of type")
+_CONSTRUCT_END = re.compile(r"Loaded mod instance (\S+) of type")
+# Entrypoint / init timing printed by the loader or the mod itself.
+_TOOK = re.compile(r"\btook\s+([\d.]+)\s*(ms|s)\b")
+# Mods without their own logger often prefix messages with "[Mod Name]".
+_TAG = re.compile(r"\[([^\]]{1,40})\]")
+_TOKEN = re.compile(r"[a-z0-9_\-]+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class _Attribution:
+    """Seconds per mod and phase ("init" / "resources") for one session."""
+
+    def __init__(self, mod_ids: dict[str, str]):
+        self.mod_ids = mod_ids
+        self.mods: dict[str, dict[str, float]] = {}
+
+    def mod_in(self, *texts: str) -> str | None:
+        for text in texts:
+            if not text:
+                continue
+            for token in _tokens(text):
+                if token in self.mod_ids:
+                    return token
+                if token.replace("-", "_") in self.mod_ids:
+                    return token.replace("-", "_")
+        return None
+
+    def add(self, mod_id: str, phase: str, seconds: float):
+        if seconds <= 0:
+            return
+        times = self.mods.setdefault(mod_id, {"init": 0.0, "resources": 0.0})
+        times[phase] += seconds
+
+
+def _session_log(game_dir: str, started_at: float | None) -> str | None:
+    for name in LOG_FILES:
+        path = os.path.join(game_dir, "logs", name)
+        try:
+            if started_at is None or os.path.getmtime(path) >= started_at:
+                return path
+        except OSError:
+            continue
+    return None
+
+
+def _parse(path: str, reference: float) -> list[dict]:
+    lines = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            m = _LINE.match(raw.rstrip("\r\n"))
+            if not m:
+                continue
+            line = m.groupdict()
+            line["ts"] = line_time(raw, reference)
+            line["logger"] = line["logger"] or line["paren"] or ""
+            lines.append(line)
+    return lines
+
+
+def attribute(lines: list[dict], mod_ids: dict[str, str]) -> dict:
+    """Split boot time between mods.
+
+    FML construction lines and "<mod> ... took N ms" lines are used as is
+    and replace the gap that ends at them. Any other time is charged per
+    thread to the mod that logged the line before the gap. Lines before the resource reload count as "init", lines
+    up to the main menu as "resources"; later lines are not boot time.
+    Returns {"boot": seconds or None, "mods": {id: {"init", "resources"}}}.
+    """
+
+    tracker = MilestoneTracker()
+    for line in lines:
+        tracker.feed(line["msg"], line["ts"])
+    reload_at = tracker.milestones.get("resource_reload")
+    menu_at = tracker.milestones.get("main_menu")
+
+    result = _Attribution(mod_ids)
+    constructing: dict[str, float] = {}
+    last: dict[str, tuple[float, str | None]] = {}
+    for line in lines:
+        ts = line["ts"]
+        if menu_at is not None and ts > menu_at:
+            break
+        phase = "resources" if reload_at is not None and ts >= reload_at else "init"
+        msg = line["msg"]
+
+        # A line that states its own duration covers the gap before it.
+        explicit = False
+        owner = None
+        m = _CONSTRUCT_START.search(msg)
+        if m and m.group(1) in mod_ids:
+            constructing[m.group(1)] = ts
+        m = _CONSTRUCT_END.search(msg)
+        if m and m.group(1) in constructing:
+            result.add(m.group(1), "init", ts - constructing.pop(m.group(1)))
+            explicit = True
+        m = _TOOK.search(msg)
+        if m:
+            mod_id = result.mod_in(msg[:m.start()], line["logger"])
+            if mod_id:
+                result.add(mod_id, phase, float(m.group(1)) / (1000.0 if m.group(2) == "ms" else 1.0))
+                explicit = True
+        elif not _CONSTRUCT_START.search(msg) and not _CONSTRUCT_END.search(msg):
+            tag = _TAG.match(msg)
+            owner = result.mod_in(line["logger"], tag.group(1) if tag else "")
+
+        previous = last.get(line["thread"])
+        if not explicit and previous and previous[1] and 0 < ts - previous[0] <= MAX_GAP:
+            result.add(previous[1], phase, ts - previous[0])
+        last[line["thread"]] = (ts, owner)
+
+    started = lines[0]["ts"] if lines else None
+    return {
+        "boot": menu_at - started if menu_at is not None and started is not None else None,
+        "mods": {
+            mod_id: {phase: round(v, 3) for phase, v in times.items()}
+            for mod_id, times in result.mods.items()
+        },
+    }
+
+
+def _history_path(pack_id: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{pack_id}.jsonl")
+
+
+def profile_session(pack: dict, game_dir: str, game, session_id: str, config: dict | None = None) -> dict | None:
+    """Attribute the finished session's boot time to mods and append it to
+    the pack's history. None if the game left no log for this session."""
+
+    from mod_index import pack_mod_ids
+
+    path = _session_log(game_dir, game.started_at)
+    if path is None:
+        return None
+    mod_ids = pack_mod_ids(pack, config)
+    record = attribute(_parse(path, game.exited_at or os.path.getmtime(path)), mod_ids)
+    record.update(session=session_id, started_at=game.started_at, log=os.path.basename(path))
+    record["jars"] = {mod_id: mod_ids[mod_id] for mod_id in record["mods"]}
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(_history_path(pack["id"]), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+def load_history(pack_id: str, limit: int | None = HISTORY_WINDOW) -> list[dict]:
+    """Profiled sessions of one pack, oldest first."""
+
+    records = []
+    try:
+        with open(_history_path(pack_id), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    return records[-limit:] if limit else records
+
+
+def _total(record: dict, mod_id: str) -> float:
+    times = record["mods"].get(mod_id)
+    return times["init"] + times["resources"] if times else 0.0
+
+
+def summarize(records: list[dict]) -> list[dict]:
+    """Per mod medians over the records, slowest first."""
+
+    mod_ids = {mod_id for record in records for mod_id in record["mods"]}
+    rows = []
+    for mod_id in mod_ids:
+        init = sorted(r["mods"].get(mod_id, {}).get("init", 0.0) for r in records)
+        resources = sorted(r["mods"].get(mod_id, {}).get("resources", 0.0) for r in records)
+        total = sorted(_total(r, mod_id) for r in records)
+        jar = next((r["jars"][mod_id] for r in reversed(records) if mod_id in r.get("jars", {})), None)
+        rows.append({
+            "mod": mod_id,
+            "jar": jar,
+            "init": percentile(init, 50),
+            "resources": percentile(resources, 50),
+            "total": percentile(total, 50),
+        })
+    rows.sort(key=lambda row: row["total"], reverse=True)
+    return rows
+
+
+def regressions(records: list[dict], ratio: float = 1.5, min_seconds: float = 0.25) -> list[dict]:
+    """Mods whose latest session is much slower than their earlier median."""
+
+    if len(records) < 2:
+        return []
+    latest, earlier = records[-1], records[:-1]
+    found = []
+    for mod_id in latest["mods"]:
+        before = percentile(sorted(_total(r, mod_id) for r in earlier), 50)
+        now = _total(latest, mod_id)
+        if now - before >= min_seconds and now >= before * ratio:
+            found.append({"mod": mod_id, "before": before, "now": now})
+    found.sort(key=lambda row: row["now"] - row["before"], reverse=True)
+    return found
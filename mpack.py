@@ -0,0 +1,277 @@
+import hashlib
+import json
+import lzma
+import mmap
+import os
+import struct
+import uuid
+
+from transfer import TransferEngine
+
+MPACK_EXTENSION = ".mpack"
+MAGIC = b"MPACK\r\n\x1a"
+FORMAT_VERSION = 1
+
+# magic, format version, flags, index offset, index length
+_HEADER = struct.Struct("<8sHHQQ")
+
+METHOD_STORED = "stored"
+METHOD_LZMA = "lzma"
+
+# Already compressed; LZMA would only burn CPU on these.
+STORED_EXTENSIONS = (".jar", ".zip", ".mpack", ".png", ".jpg", ".jpeg", ".ogg", ".gz", ".xz", ".7z")
+
+_BUFFER_SIZE = 256 * 1024
+# Slice of the mapping fed to hashlib / LZMA at a time while verifying.
+_VERIFY_CHUNK = 8 * 1024 * 1024
+
+
+class MPackError(ValueError):
+    pass
+
+
+def _method_for(path: str) -> str:
+    return METHOD_STORED if path.lower().endswith(STORED_EXTENSIONS) else METHOD_LZMA
+
+
+def _iter_files(src_dir: str, targets: list[str]):
+    """Yield (archive path, file path) for every target below src_dir."""
+
+    for name in targets:
+        top = os.path.join(src_dir, name)
+        if os.path.isfile(top):
+            yield name, top
+            continue
+        for root, dirs, files in os.walk(top):
+            dirs.sort()
+            for fname in sorted(files):
+                path = os.path.join(root, fname)
+                yield os.path.relpath(path, src_dir).replace(os.sep, "/"), path
+
+
+def _copy_stored(src: str, out) -> tuple[int, str]:
+    h = hashlib.sha256()
+    size = 0
+    with open(src, "rb") as f:
+        while True:
+            chunk = f.read(_BUFFER_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    return size, h.hexdigest()
+
+
+class MPackWriter:
+    """Write an archive entry by entry; the index is added on finish().
+
+    The file is assembled under a temporary name and only replaces
+    out_path once finished, so a failed build leaves nothing behind.
+    """
+
+    def __init__(self, out_path: str):
+        self.out_path = out_path
+        self.entries: list[dict] = []
+        self._tmp = f"{out_path}.{uuid.uuid4().hex}.tmp"
+        self._out = open(self._tmp, "wb")
+        self._out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+            os.remove(self._tmp)
+        return False
+
+    def _record(self, rel: str, size: int, digest: str, offset: int, method: str):
+        self.entries.append({
+            "path": rel,
+            "size": size,
+            "hash": digest,
+            "offset": offset,
+            "length": self._out.tell() - offset,
+            "method": method,
+        })
+
+    def add_file(self, rel: str, path: str):
+        """Add a file from disk, compressed according to its type."""
+
+        out = self._out
+        offset = out.tell()
+        method = _method_for(rel)
+        if method == METHOD_LZMA:
+            with open(path, "rb") as f:
+                data = f.read()
+            packed = lzma.compress(data, preset=6)
+            if len(packed) >= len(data):
+                method, packed = METHOD_STORED, data
+            out.write(packed)
+            size, digest = len(data), hashlib.sha256(data).hexdigest()
+        else:
+            size, digest = _copy_stored(path, out)
+        self._record(rel, size, digest, offset, method)
+
+    def add_entry(self, reader: "MPackReader", entry: dict):
+        """Copy an entry of another archive as-is, without recompressing it."""
+
+        offset = self._out.tell()
+        reader.copy_raw(entry, self._out)
+        self._record(entry["path"], entry["size"], entry["hash"], offset, entry["method"])
+
+    def finish(self, meta: dict | None = None) -> dict:
+        out = self._out
+        index = json.dumps(
+            {"meta": meta or {}, "entries": self.entries}, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        index_offset = out.tell()
+        out.write(index)
+        out.seek(0)
+        out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, index_offset, len(index)))
+        out.close()
+        self._out = None
+        os.replace(self._tmp, self.out_path)
+        return {
+            "entries": len(self.entries),
+            "size": sum(e["size"] for e in self.entries),
+            "packed": os.path.getsize(self.out_path),
+        }
+
+
+def build(src_dir: str, out_path: str, targets: list[str], meta: dict | None = None) -> dict:
+    """Pack the targets found in src_dir into out_path.
+
+    Jars and other compressed files are stored, everything else is LZMA
+    compressed (kept stored if that doesn't shrink it). Returns
+    {"entries", "size", "packed"}.
+    """
+
+    with MPackWriter(out_path) as writer:
+        for rel, path in _iter_files(src_dir, targets):
+            writer.add_file(rel, path)
+        return writer.finish(meta)
+
+
+class MPackReader:
+    """Random access to one .mpack through a read-only memory map.
+
+    Stored entries are written out straight from the mapping without an
+    intermediate copy; LZMA entries are decompressed on demand. Safe to
+    share between the transfer engine's threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < _HEADER.size:
+                raise MPackError(f"{path}: .mpack 헤더가 없습니다")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _flags, index_offset, index_length = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise MPackError(f"{path}: .mpack 파일이 아닙니다")
+            if version > FORMAT_VERSION:
+                raise MPackError(f"{path}: 지원하지 않는 .mpack 버전 {version}")
+            if index_offset + index_length > size:
+                raise MPackError(f"{path}: 인덱스가 잘렸습니다")
+            try:
+                index = json.loads(self._map[index_offset:index_offset + index_length].decode("utf-8"))
+                self.meta = index.get("meta", {})
+                self.entries = {e["path"]: e for e in index["entries"]}
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                raise MPackError(f"{path}: 인덱스를 읽을 수 없습니다 ({e})")
+            for entry in self.entries.values():
+                offset, length, entry_size = (entry.get(k) for k in ("offset", "length", "size"))
+                if (
+                    not all(isinstance(v, int) and v >= 0 for v in (offset, length, entry_size))
+                    or offset < _HEADER.size
+                    or offset + length > index_offset
+                    or entry.get("method") not in (METHOD_STORED, METHOD_LZMA)
+                ):
+                    raise MPackError(f"{path}: 항목 범위가 잘못되었습니다: {entry['path']}")
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def read(self, entry: dict | str) -> bytes:
+        if isinstance(entry, str):
+            entry = self.entries[entry]
+        start = entry["offset"]
+        end = start + entry["length"]
+        if entry["method"] == METHOD_LZMA:
+            # Decompressed straight from the mapping.
+            with memoryview(self._map) as view, view[start:end] as packed:
+                return lzma.decompress(packed)
+        return self._map[start:end]
+
+    def _chunks(self, entry: dict):
+        """The entry's stored bytes as slices of the mapping (no copies)."""
+
+        start = entry["offset"]
+        end = start + entry["length"]
+        with memoryview(self._map) as view:
+            for offset in range(start, end, _VERIFY_CHUNK):
+                with view[offset:min(offset + _VERIFY_CHUNK, end)] as chunk:
+                    yield chunk
+
+    def _entry_ok(self, entry: dict) -> bool:
+        h = hashlib.sha256()
+        size = 0
+        decompressor = lzma.LZMADecompressor() if entry["method"] == METHOD_LZMA else None
+        try:
+            for chunk in self._chunks(entry):
+                data = decompressor.decompress(chunk) if decompressor else chunk
+                h.update(data)
+                size += len(data)
+        except (lzma.LZMAError, EOFError):
+            return False
+        if decompressor is not None and not decompressor.eof:
+            return False
+        return size == entry["size"] and h.hexdigest() == entry["hash"]
+
+    def copy_raw(self, entry: dict, out):
+        """Write the entry's bytes exactly as stored (still compressed) to out."""
+
+        start = entry["offset"]
+        with memoryview(self._map) as view:
+            out.write(view[start:start + entry["length"]])
+
+    def extract(self, entry: dict, target: str):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            if entry["method"] == METHOD_STORED:
+                self.copy_raw(entry, f)
+            else:
+                f.write(self.read(entry))
+
+    def verify(self, engine: TransferEngine | None = None) -> list[str]:
+        """Paths whose content doesn't match the recorded size/sha256.
+
+        Entries are hashed in parallel on engine (a private one if None),
+        chunk by chunk straight from the mapping.
+        """
+
+        if engine is None:
+            with TransferEngine() as engine:
+                return self.verify(engine)
+        entries = list(self.entries.values())
+        for entry in entries:
+            engine.submit(self._entry_ok, entry, label=entry["path"])
+        return [entry["path"] for entry, ok in zip(entries, engine.wait()) if not ok]
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+
+from utils.colors import info
+
+
+class Step:
+    """One node of the pipeline graph.
+
+    fn(results) runs in a worker thread once every step named in deps has
+    finished; results maps step names to their return values. describe, if
+    given, turns the return value into span attributes. An always step runs
+    even if one of its deps failed, like a finally block; results then lacks
+    the failed steps.
+    """
+
+    def __init__(self, name: str, fn, deps: tuple[str, ...] = (), describe=None, traced: bool = True,
+                 always: bool = False):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.describe = describe
+        self.traced = traced
+        self.always = always
+
+
+class StepFailed(RuntimeError):
+    def __init__(self, name: str, exc: BaseException):
+        self.step = name
+        self.exc = exc
+        super().__init__(f"{name} 단계 실패: {exc}")
+
+
+def chain(steps: list[Step]) -> list[Step]:
+    """The same steps made to run one at a time, in list order."""
+
+    chained = []
+    for i, step in enumerate(steps):
+        deps = set(step.deps)
+        if i:
+            deps.add(steps[i - 1].name)
+        chained.append(Step(step.name, step.fn, tuple(sorted(deps)), step.describe, step.traced, step.always))
+    return chained
+
+
+def _check_graph(steps: list[Step]):
+    names = {s.name for s in steps}
+    if len(names) != len(steps):
+        raise ValueError("duplicate step names")
+    for s in steps:
+        missing = set(s.deps) - names
+        if missing:
+            raise ValueError(f"{s.name}: unknown dependencies {sorted(missing)}")
+
+    # Kahn's algorithm, only to reject cycles up front.
+    indegree = {s.name: len(s.deps) for s in steps}
+    ready = [n for n, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        name = ready.pop()
+        seen += 1
+        for s in steps:
+            if name in s.deps:
+                indegree[s.name] -= 1
+                if indegree[s.name] == 0:
+                    ready.append(s.name)
+    if seen != len(steps):
+        raise ValueError("dependency cycle in steps")
+
+
+def _settle(future: asyncio.Future, result, exc: BaseException | None):
+    if future.cancelled():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+def _in_thread(name: str, fn, *args) -> asyncio.Future:
+    """fn(*args) in a daemon thread.
+
+    Unlike asyncio.to_thread the loop never joins the thread on shutdown, so
+    Ctrl+C is not held up by a step that blocks until the game exits.
+    """
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _target():
+        try:
+            outcome = (fn(*args), None)
+        except BaseException as e:
+            outcome = (None, e)
+        try:
+            loop.call_soon_threadsafe(_settle, future, *outcome)
+        except RuntimeError:
+            pass  # Interrupted: the loop is already closed.
+
+    threading.Thread(target=_target, name=f"step-{name}", daemon=True).start()
+    return future
+
+
+async def _run(steps: list[Step], session=None, progress: bool = True) -> dict:
+    results: dict = {}
+    done_events = {s.name: asyncio.Event() for s in steps}
+    failed: dict[str, BaseException] = {}
+    total = len(steps)
+    finished = 0
+
+    async def _one(step: Step):
+        nonlocal finished
+        for dep in step.deps:
+            await done_events[dep].wait()
+        if not step.always and any(dep in failed for dep in step.deps):
+            failed[step.name] = failed[next(d for d in step.deps if d in failed)]
+            done_events[step.name].set()
+            return
+
+        start = time.time()
+        try:
+            results[step.name] = await _in_thread(step.name, step.fn, results)
+        except Exception as e:
+            failed[step.name] = e
+            done_events[step.name].set()
+            return
+        end = time.time()
+
+        if session is not None and step.traced:
+            attrs = step.describe(results[step.name]) if step.describe else {}
+            session.add_span(step.name, start, end, **(attrs or {}))
+        finished += 1
+        if progress:
+            info(f"[{finished}/{total}] {step.name} 완료 ({end - start:.2f}s)")
+        done_events[step.name].set()
+
+    await asyncio.gather(*(_one(s) for s in steps))
+
+    for step in steps:
+        if step.name in failed:
+            raise StepFailed(step.name, failed[step.name])
+    return results
+
+
+def run(steps: list[Step], session=None, progress: bool = True) -> dict:
+    """Run the step graph, overlapping every step whose dependencies are met.
+
+    Returns {step name: result}. If a step raises, its dependents other than
+    always steps are skipped and StepFailed is raised once everything else
+    has settled. Ctrl+C raises KeyboardInterrupt at once; steps still
+    running are abandoned.
+    """
+
+    _check_graph(steps)
+    return asyncio.run(_run(steps, session, progress))
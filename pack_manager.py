@@ -3,33 +3,146 @@ import json
 from utils.colors import warn
 
 PACKS_DIR = "packs"
+INDEX_DIR = "cache"
+INDEX_FILE = "packs.json"
+
+# In-process copy of cache/packs.json:
+# {"dir_mtime": ns, "dirs": [name, ...],
+#  "packs": {name: {"mtime": ns, "size": n, "meta": {...}}}}
+_index: dict | None = None
+
+
+def _index_path() -> str:
+    return os.path.join(INDEX_DIR, INDEX_FILE)
+
+
+def _load_index() -> dict:
+    global _index
+    if _index is None:
+        try:
+            with open(_index_path(), "r", encoding="utf-8") as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+        if not isinstance(_index.get("packs"), dict) or not isinstance(_index.get("dirs"), list):
+            _index = {"dir_mtime": None, "dirs": [], "packs": {}}
+    return _index
+
+
+def _save_index():
+    if _index is None:
+        return
+    tmp = _index_path() + ".tmp"
+    try:
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(_index, f, ensure_ascii=False)
+        os.replace(tmp, _index_path())
+    except OSError as e:
+        warn(f"팩 인덱스 저장 실패: {e}")
+
+
+def _entry(name: str, meta: dict) -> dict:
+    return {
+        "id": name,
+        "path": os.path.join(PACKS_DIR, name),
+        "meta": meta
+    }
+
+
+def _refresh(index: dict, name: str) -> bool | None:
+    """Revalidate one pack with a single stat of its manifest.
+
+    Returns True if the index changed, False if it was current, None if the
+    pack is gone or its manifest is unreadable.
+    """
+
+    manifest = os.path.join(PACKS_DIR, name, "manifest.json")
+    try:
+        st = os.stat(manifest)
+    except OSError:
+        return None if index["packs"].pop(name, None) is None else True
+
+    cached = index["packs"].get(name)
+    if cached and cached["mtime"] == st.st_mtime_ns and cached["size"] == st.st_size:
+        return False
+
+    try:
+        with open(manifest, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        warn(f"{name}: manifest 로딩 실패")
+        index["packs"].pop(name, None)
+        return None
+
+    index["packs"][name] = {"mtime": st.st_mtime_ns, "size": st.st_size, "meta": data}
+    return True
+
 
 def scan_packs():
-    packs = {}
+    """Return {id: pack} for every pack, revalidating the on-disk index.
+
+    The packs/ listing is skipped while its mtime is unchanged; each pack
+    costs one stat of its manifest unless that changed.
+    """
 
     if not os.path.exists(PACKS_DIR):
-        return packs
+        return {}
 
-    for name in os.listdir(PACKS_DIR):
-        path = os.path.join(PACKS_DIR, name)
-        manifest = os.path.join(path, "manifest.json")
+    index = _load_index()
+    changed = False
 
-        if not os.path.isdir(path) or not os.path.exists(manifest):
-            continue
+    dir_mtime = os.stat(PACKS_DIR).st_mtime_ns
+    if index.get("dir_mtime") == dir_mtime:
+        names = index["dirs"]
+    else:
+        names = sorted(
+            e.name for e in os.scandir(PACKS_DIR)
+            if e.is_dir() and not e.name.startswith(".")
+        )
+        for gone in set(index["packs"]) - set(names):
+            del index["packs"][gone]
+        index["dir_mtime"] = dir_mtime
+        index["dirs"] = names
+        changed = True
+
+    packs = {}
+    for name in names:
+        result = _refresh(index, name)
+        if result:
+            changed = True
+        if name in index["packs"]:
+            packs[name] = _entry(name, index["packs"][name]["meta"])
+
+    if changed:
+        _save_index()
+    return packs
 
-        try:
-            with open(manifest, "r", encoding="utf-8") as f:
-                data = json.load(f)
 
-            packs[name] = {
-                "id": name,
-                "path": path,
-                "meta": data
-            }
-        except:
-            warn(f"{name}: manifest 로딩 실패")
+def find_packs(mc_version: str | None = None, loader: str | None = None) -> dict:
+    """scan_packs() filtered by manifest mc_version and/or loader."""
 
+    packs = {}
+    for pid, pack in scan_packs().items():
+        meta = pack["meta"] if isinstance(pack["meta"], dict) else {}
+        if mc_version and meta.get("mc_version") != mc_version:
+            continue
+        if loader and meta.get("loader") != loader:
+            continue
+        packs[pid] = pack
     return packs
 
+
 def get_pack(pack_id: str):
-    return scan_packs().get(pack_id)
+    """Look up one pack by id, revalidating only that pack's manifest."""
+
+    if not pack_id or pack_id.startswith(".") or os.sep in pack_id or "/" in pack_id:
+        return None
+    if not os.path.isdir(os.path.join(PACKS_DIR, pack_id)):
+        return None
+
+    index = _load_index()
+    if _refresh(index, pack_id):
+        _save_index()
+    cached = index["packs"].get(pack_id)
+    return _entry(pack_id, cached["meta"]) if cached else None
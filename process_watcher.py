@@ -0,0 +1,229 @@
+import os
+import select
+import sys
+import threading
+import time
+from datetime import datetime
+
+import psutil
+
+DEFAULT_TARGET_PROCESSES = [
+    "MinecraftLauncher.exe",
+    "Minecraft.exe",
+    "javaw.exe"
+]
+
+START_SCAN_INTERVAL = 0.5
+
+# PIDs currently tracked by some GameProcess, so concurrent watchers (one
+# per instance) never latch onto the same game.
+_claimed: set[int] = set()
+_claimed_lock = threading.Lock()
+
+
+def target_processes(config: dict | None) -> list[str]:
+    names = (config or {}).get("target_processes")
+    if isinstance(names, list) and names:
+        return [str(n) for n in names]
+    return list(DEFAULT_TARGET_PROCESSES)
+
+
+def _now() -> float:
+    return time.time()
+
+
+def format_ts(ts: float | None) -> str:
+    if ts is None:
+        return "-"
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def _same_path(a: str, b: str) -> bool:
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def _runs_in(cmdline: list[str], game_dir: str) -> bool:
+    """True if the command line passes exactly game_dir as --gameDir."""
+
+    for i, arg in enumerate(cmdline):
+        if arg == "--gameDir" and i + 1 < len(cmdline):
+            value = cmdline[i + 1]
+        elif arg.startswith("--gameDir="):
+            value = arg.split("=", 1)[1]
+        else:
+            continue
+        if _same_path(value, game_dir):
+            return True
+    return False
+
+
+def scan(names: list[str], exclude: int | None = None, game_dir: str | None = None) -> psutil.Process | None:
+    """Single filtered pass over the process table.
+
+    Only 'name' is fetched unless game_dir is given, in which case
+    name-matching processes must be started with --gameDir game_dir.
+    """
+
+    wanted = set(names)
+    with _claimed_lock:
+        claimed = set(_claimed)
+    for p in psutil.process_iter(["name"]):
+        if p.info["name"] not in wanted or p.pid == exclude or p.pid in claimed:
+            continue
+        if game_dir:
+            try:
+                if not _runs_in(p.cmdline(), game_dir):
+                    continue
+            except psutil.Error:
+                continue
+        return p
+    return None
+
+
+def _wait_pidfd(pid: int, timeout: float | None) -> bool | None:
+    """Block on a Linux pidfd. None if pidfds aren't available."""
+
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        fd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return None
+    try:
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+        return bool(poller.poll(None if timeout is None else int(timeout * 1000)))
+    finally:
+        os.close(fd)
+
+
+class GameProcess:
+    """A tracked game process with millisecond start/exit timestamps.
+
+    The PID is found once; afterwards the watcher blocks on that process
+    (pidfd on Linux, psutil's native wait elsewhere) instead of rescanning
+    the whole process table. When the tracked process exits but another
+    target is still alive (e.g. the launcher handed off to javaw.exe), one
+    filtered rescan picks it up and the wait continues on that PID.
+    """
+
+    def __init__(self, names: list[str], popen=None, game_dir: str | None = None):
+        self.names = list(names)
+        self.popen = popen
+        self.game_dir = game_dir
+        self.process: psutil.Process | None = None
+        self.name: str | None = None
+        self.started_at: float | None = None
+        self.detected_at: float | None = None
+        self.exited_at: float | None = None
+        self._cancelled = threading.Event()
+        if popen is not None:
+            self._track(psutil.Process(popen.pid))
+
+    @property
+    def pid(self) -> int | None:
+        return self.process.pid if self.process else None
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.exited_at is None
+
+    def _track(self, proc: psutil.Process):
+        with _claimed_lock:
+            if self.process is not None:
+                _claimed.discard(self.process.pid)
+            _claimed.add(proc.pid)
+        self.process = proc
+        try:
+            self.name = proc.name()
+        except psutil.Error:
+            self.name = None
+        if self.started_at is None:
+            self.detected_at = _now()
+            try:
+                self.started_at = proc.create_time()
+            except psutil.Error:
+                self.started_at = self.detected_at
+
+    def wait_start(self, interval: float = START_SCAN_INTERVAL, timeout: float | None = None) -> bool:
+        """Scan until a target process appears. False on timeout or stop()."""
+
+        deadline = None if timeout is None else _now() + timeout
+        while self.process is None:
+            proc = scan(self.names, game_dir=self.game_dir)
+            if proc is not None:
+                self._track(proc)
+                break
+            if self._cancelled.is_set() or (deadline is not None and _now() >= deadline):
+                return False
+            self._cancelled.wait(interval)
+        return True
+
+    def stop(self) -> bool:
+        """Stop waiting for the game to start, or terminate it if it is
+        running. True if a process was terminated."""
+
+        self._cancelled.set()
+        proc = self.process
+        if proc is None or self.exited_at is not None:
+            return False
+        try:
+            proc.terminate()
+        except psutil.Error:
+            return False
+        return True
+
+    def _wait_one(self, timeout: float | None) -> bool:
+        proc = self.process
+        if self.popen is not None and proc.pid == self.popen.pid:
+            import subprocess
+            try:
+                self.popen.wait(timeout)
+                return True
+            except subprocess.TimeoutExpired:
+                return False
+
+        if sys.platform.startswith("linux"):
+            done = _wait_pidfd(proc.pid, timeout)
+            if done is not None:
+                return done
+        try:
+            proc.wait(timeout)
+            return True
+        except psutil.TimeoutExpired:
+            return False
+        except psutil.NoSuchProcess:
+            return True
+
+    def wait_exit(self, timeout: float | None = None) -> bool:
+        """Block until no target process is left. False on timeout."""
+
+        deadline = None if timeout is None else _now() + timeout
+        while self.process is not None:
+            remaining = None if deadline is None else max(0.0, deadline - _now())
+            if not self._wait_one(remaining):
+                return False
+            exited = _now()
+            successor = scan(self.names, exclude=self.process.pid, game_dir=self.game_dir)
+            if successor is None:
+                self.exited_at = exited
+                with _claimed_lock:
+                    _claimed.discard(self.process.pid)
+                return True
+            self._track(successor)
+        return True
+
+    def summary(self) -> dict:
+        duration = None
+        if self.started_at is not None and self.exited_at is not None:
+            duration = self.exited_at - self.started_at
+        return {
+            "pid": self.pid,
+            "name": self.name,
+            "started_at": self.started_at,
+            "detected_at": self.detected_at,
+            "exited_at": self.exited_at,
+            "duration": duration,
+        }
@@ -0,0 +1,117 @@
+import json
+import os
+
+import trash
+from deploy_state import DEPLOY_MANIFEST
+
+STAGING_DIR = ".modular-staging"
+PREVIOUS_DIR = ".modular-previous"
+ROLLBACK_TMP_DIR = ".modular-rollback"
+JOURNAL_FILE = ".modular-swap.json"
+
+
+def staging_dir(minecraft_path: str) -> str:
+    return os.path.join(minecraft_path, STAGING_DIR)
+
+
+def previous_dir(minecraft_path: str) -> str:
+    return os.path.join(minecraft_path, PREVIOUS_DIR)
+
+
+def _journal_path(minecraft_path: str) -> str:
+    return os.path.join(minecraft_path, JOURNAL_FILE)
+
+
+def reset_staging(minecraft_path: str) -> str:
+    path = staging_dir(minecraft_path)
+    trash.discard(path, minecraft_path)
+    os.makedirs(path)
+    return path
+
+
+def _swap_in(minecraft_path: str, incoming: str, outgoing: str, names: list[str]):
+    """For each name: live -> outgoing/name, then incoming/name -> live.
+
+    Every step is a rename within minecraft_path. A journal is kept while the
+    swap runs so recover() can finish it after a crash.
+    """
+
+    os.makedirs(outgoing, exist_ok=True)
+    journal = _journal_path(minecraft_path)
+    with open(journal, "w", encoding="utf-8") as f:
+        json.dump({"incoming": incoming, "names": names}, f, ensure_ascii=False)
+
+    for name in names:
+        live = os.path.join(minecraft_path, name)
+        if os.path.lexists(live):
+            os.replace(live, os.path.join(outgoing, name))
+        staged = os.path.join(incoming, name)
+        if os.path.lexists(staged):
+            os.replace(staged, live)
+
+    os.remove(journal)
+
+
+def recover(minecraft_path: str) -> bool:
+    """Finish a swap interrupted by a crash. True if one was pending."""
+
+    journal = _journal_path(minecraft_path)
+    try:
+        with open(journal, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except OSError:
+        return False
+    except ValueError:
+        os.remove(journal)
+        return False
+
+    for name in data.get("names", []):
+        live = os.path.join(minecraft_path, name)
+        staged = os.path.join(data["incoming"], name)
+        if not os.path.lexists(live) and os.path.lexists(staged):
+            os.replace(staged, live)
+    os.remove(journal)
+    return True
+
+
+def _names(minecraft_path: str, dirs: list[str], targets: list[str]) -> list[str]:
+    names = []
+    for name in list(targets) + [DEPLOY_MANIFEST]:
+        if any(os.path.lexists(os.path.join(d, name)) for d in dirs):
+            names.append(name)
+    return names
+
+
+def switch(minecraft_path: str, targets: list[str]):
+    """Swap the staged targets in; the replaced layout becomes the rollback point."""
+
+    stage = staging_dir(minecraft_path)
+    prev = previous_dir(minecraft_path)
+    trash.discard(prev, minecraft_path)
+
+    names = _names(minecraft_path, [stage, minecraft_path], targets)
+    _swap_in(minecraft_path, stage, prev, names)
+    trash.discard(stage, minecraft_path)
+
+
+def rollback(minecraft_path: str, targets: list[str]) -> bool:
+    """Exchange the live layout with the rollback point. False if none exists.
+
+    Rolling back twice returns to where you started.
+    """
+
+    prev = previous_dir(minecraft_path)
+    tmp = os.path.join(minecraft_path, ROLLBACK_TMP_DIR)
+    if not os.path.isdir(prev) and os.path.isdir(tmp):
+        # Crashed right after moving the rollback point aside.
+        os.replace(tmp, prev)
+    if not os.path.isdir(prev):
+        return False
+
+    trash.discard(tmp, minecraft_path)
+    os.replace(prev, tmp)
+
+    names = _names(minecraft_path, [tmp, minecraft_path], targets)
+    _swap_in(minecraft_path, tmp, prev, names)
+    trash.discard(tmp, minecraft_path)
+    return True
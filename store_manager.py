@@ -0,0 +1,101 @@
+import errno
+import os
+import shutil
+import sys
+import uuid
+
+from hash_cache import file_digest
+
+STORE_DIR = "store"
+OBJECTS_DIR = os.path.join(STORE_DIR, "objects")
+
+# Files with these extensions are never rewritten by the game, so they can be
+# hardlinked straight from the store. Everything else (configs, options.txt,
+# ...) may be edited in place by mods and must get its own data blocks.
+IMMUTABLE_EXTENSIONS = (".jar", ".zip", ".mpack")
+
+_FICLONE = 0x40049409
+
+
+def object_path(digest: str) -> str:
+    return os.path.join(OBJECTS_DIR, digest[:2], digest)
+
+
+def has_object(digest: str) -> bool:
+    return os.path.exists(object_path(digest))
+
+
+def ingest(path: str) -> str:
+    """Add path to the store (once) and return its digest."""
+
+    digest = file_digest(path)
+    obj = object_path(digest)
+    if os.path.exists(obj):
+        return digest
+
+    os.makedirs(os.path.dirname(obj), exist_ok=True)
+    tmp = f"{obj}.{uuid.uuid4().hex}.tmp"
+    try:
+        shutil.copy2(path, tmp)
+        os.replace(tmp, obj)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return digest
+
+
+def is_immutable(path: str) -> bool:
+    return path.lower().endswith(IMMUTABLE_EXTENSIONS)
+
+
+def _try_hardlink(src: str, dst: str) -> bool:
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
+
+
+def _try_reflink(src: str, dst: str) -> bool:
+    """Clone src into dst with FICLONE (btrfs, xfs, bcachefs, ...)."""
+
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+    except OSError as e:
+        if os.path.exists(dst):
+            os.remove(dst)
+        if e.errno not in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY):
+            raise
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def link_or_copy(src: str, dst: str, hardlink: bool = True) -> str:
+    """Materialize src at dst as cheaply as possible.
+
+    Returns the method that was used: "hardlink", "reflink" or "copy".
+    """
+
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if hardlink and _try_hardlink(src, dst):
+        return "hardlink"
+    if _try_reflink(src, dst):
+        return "reflink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def deploy(digest: str, dst: str) -> str:
+    """Place the store object digest at dst."""
+
+    return link_or_copy(object_path(digest), dst, hardlink=is_immutable(dst))
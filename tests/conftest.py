@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _workdir(tmp_path_factory):
+    """cache/, store/ and logs/ are relative to the working directory; keep
+    them out of the checkout."""
+
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("workdir"))
+    yield
+    from utils.logger import flush
+    flush()
+    os.chdir(previous)
+
+
+def _write_files(root, files: dict) -> str:
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data if isinstance(data, bytes) else data.encode("utf-8"))
+    return root
+
+
+def _read_files(root, skip: tuple = ()) -> dict:
+    return {
+        p.relative_to(root).as_posix(): p.read_bytes()
+        for p in root.rglob("*") if p.is_file() and p.relative_to(root).parts[0] not in skip
+    }
+
+
+@pytest.fixture
+def write_files():
+    """write_files(root, {rel: bytes | str}) creates the files below root."""
+
+    return _write_files
+
+
+@pytest.fixture
+def read_files():
+    """read_files(root, skip=(top-level names,)) -> {rel: bytes}."""
+
+    return _read_files
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import time
+
+import pytest
+
+import deploy_state
+import dedup
+import store_manager
+import trash
+
+JAR = b"PK\x03\x04 create" * 1024
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch, write_files):
+    """packs/ and store/ in a fresh working directory."""
+
+    monkeypatch.chdir(tmp_path)
+    write_files(tmp_path, {
+        "packs/a/mods/create.jar": JAR,
+        "packs/b/mods/create.jar": JAR,
+        "packs/a/config/create.toml": b"scale = 1",
+        # An extraction whose zip is gone.
+        "packs/a/.cache/old/mods/x.jar": b"x" * 4096,
+    })
+    kept = hashlib.sha256(b"deployed").hexdigest()
+    orphan = hashlib.sha256(b"orphan").hexdigest()
+    write_files(tmp_path, {
+        os.path.relpath(store_manager.object_path(kept)): b"deployed",
+        os.path.relpath(store_manager.object_path(orphan)): b"orphan",
+        os.path.relpath(store_manager.object_path(orphan)) + ".1234.tmp": b"ingest",
+    })
+    old = time.time() - dedup.STALE_TMP_AGE - 60
+    os.utime(store_manager.object_path(orphan) + ".1234.tmp", (old, old))
+
+    mc = tmp_path / "minecraft"
+    mc.mkdir()
+    deploy_state.save_deployment(str(mc), "a", {"mods/deployed.jar": {"hash": kept}})
+    return {"mc": str(mc), "kept": kept, "orphan": orphan}
+
+
+def test_gc_links_duplicates_and_prunes(tree):
+    stats = dedup.gc(tree["mc"])
+    assert trash.wait_idle(5)
+
+    a = os.stat(os.path.join("packs", "a", "mods", "create.jar"))
+    b = os.stat(os.path.join("packs", "b", "mods", "create.jar"))
+    assert (a.st_dev, a.st_ino) == (b.st_dev, b.st_ino)
+    assert stats["linked"] == 1 and stats["extractions"] == 1 and stats["objects"] == 2
+    assert stats["freed"] >= len(JAR) + 4096
+
+    assert not os.path.exists(os.path.join("packs", "a", ".cache", "old"))
+    assert not os.path.exists(os.path.join("packs", "a", trash.TRASH_DIR))
+    assert os.path.exists(store_manager.object_path(tree["kept"]))
+    assert not os.path.exists(store_manager.object_path(tree["orphan"]))
+    assert not os.path.exists(store_manager.object_path(tree["orphan"]) + ".1234.tmp")
+    # The configs are never linked: the game may edit them in place.
+    assert os.stat(os.path.join("packs", "a", "config", "create.toml")).st_nlink == 1
+
+
+def test_gc_dry_run_changes_nothing(tree, read_files, tmp_path):
+    before = read_files(tmp_path)
+
+    stats = dedup.gc(tree["mc"], dry_run=True)
+
+    assert stats["linked"] == 0 and stats["freed"] == 0
+    assert stats["reclaimable"] >= len(JAR) + 4096
+    assert read_files(tmp_path, skip=("cache",)) == {k: v for k, v in before.items() if not k.startswith("cache/")}
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import shutil
+
+import pytest
+
+import delta
+from delta import DeltaError, listing_digest
+from mpack import MPackWriter
+
+
+BASE = {
+    "mods/create.jar": b"create 0.5.0",
+    "mods/jei.jar": b"jei 15",
+    "config/create/client.toml": b"scale = 1",
+    "config/old.toml": b"old",
+}
+NEW = {
+    "mods/create.jar": b"create 0.5.1",
+    "mods/jei.jar": b"jei 15",
+    "config/create/client.toml": b"scale = 1",
+    "config/sodium.json": b"{}",
+}
+
+
+def _manifest(meta=None) -> dict:
+    return {"manifest.json": json.dumps(meta or {"id": "p"})}
+
+
+@pytest.fixture
+def versions(tmp_path, write_files):
+    base = write_files(tmp_path / "base", dict(BASE, **_manifest()))
+    new = write_files(tmp_path / "new", dict(NEW, **_manifest({"id": "p", "mc_version": "1.20.1"})))
+    out = tmp_path / "p.mdelta"
+    stats = delta.create(str(base), str(new), str(out))
+    return base, new, out, stats
+
+
+def test_create_holds_only_changes(versions):
+    _, _, _, stats = versions
+
+    assert (stats["added"], stats["changed"], stats["removed"]) == (1, 1, 1)
+    assert stats["entries"] == 2
+
+
+def test_apply_to_directory(versions, tmp_path, read_files):
+    base, new, out, _ = versions
+    pack = tmp_path / "installed"
+    shutil.copytree(base, pack)
+
+    stats = delta.apply(str(out), str(pack))
+
+    assert stats["status"] == "updated"
+    assert read_files(pack, skip=("manifest.json",)) == NEW
+    assert not (pack / "config" / "old.toml").exists()
+    assert json.loads((pack / "manifest.json").read_text(encoding="utf-8"))["mc_version"] == "1.20.1"
+    assert delta.apply(str(out), str(pack))["status"] == "current"
+
+
+def test_apply_rejects_other_base(versions, tmp_path, write_files):
+    _, _, out, _ = versions
+    other = write_files(tmp_path / "other", dict(BASE, **_manifest(), **{"mods/create.jar": b"create 0.4"}))
+
+    with pytest.raises(DeltaError, match="mods/create.jar"):
+        delta.apply(str(out), str(other))
+    assert (other / "mods" / "create.jar").read_bytes() == b"create 0.4"
+    assert (other / "config" / "old.toml").exists()
+
+
+def _crafted_delta(tmp_path, write_files, added=(), removed=(), changed=None) -> str:
+    """A delta built by hand against BASE, as an attacker could."""
+
+    payload = write_files(tmp_path / "payload", {"evil": b"evil"})
+    out = str(tmp_path / "evil.mdelta")
+    files = {rel: hashlib.sha256(data).hexdigest() for rel, data in BASE.items()}
+    with MPackWriter(out) as writer:
+        for rel in list(added) + list(changed or {}):
+            writer.add_file(rel, str(payload / "evil"))
+        writer.finish({"delta": {
+            "format": delta.DELTA_FORMAT,
+            "pack": "p",
+            "base": listing_digest(files),
+            "target": listing_digest(dict(files, evil="x")),
+            "added": list(added),
+            "removed": list(removed),
+            "changed": changed or {},
+            "manifest": {},
+        }})
+    return out
+
+
+@pytest.mark.parametrize("added, removed", [
+    (["mods/../../../outside.txt"], []),
+    ([], ["mods/../../../victim.txt"]),
+    (["mods/../../../outside.txt"], ["mods/../../../victim.txt"]),
+    (["mods/./x.jar"], []),
+    (["manifest.json"], []),
+])
+def test_apply_rejects_paths_outside_the_pack(tmp_path, write_files, read_files, added, removed):
+    root = tmp_path / "root"
+    pack = write_files(root / "packs" / "p", dict(BASE, **_manifest()))
+    write_files(root, {"victim.txt": b"keep me"})
+    before = read_files(root)
+    out = _crafted_delta(tmp_path, write_files, added, removed)
+
+    with pytest.raises(DeltaError):
+        delta.apply(out, str(pack))
+
+    assert read_files(root) == before
+
+
+@pytest.mark.parametrize("added, removed, changed", [
+    (["mods/jei.jar"], [], None),
+    ([], ["mods/ghost.jar"], None),
+    ([], [], {"mods/create.jar": "0" * 64}),
+    ([], [], {"mods/ghost.jar": "0" * 64}),
+])
+def test_apply_rejects_paths_that_do_not_fit_the_base(tmp_path, write_files, read_files, added, removed, changed):
+    pack = write_files(tmp_path / "pack", dict(BASE, **_manifest()))
+    before = read_files(pack)
+    out = _crafted_delta(tmp_path, write_files, added, removed, changed)
+
+    with pytest.raises(DeltaError, match="기준 버전"):
+        delta.apply(out, str(pack))
+
+    assert read_files(pack) == before
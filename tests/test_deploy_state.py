@@ -0,0 +1,76 @@
+import os
+
+import deploy_state
+import trash
+from apply_manager import apply_pack
+
+CONFIG = {"transfer_workers": 2}
+
+
+def test_manifest_round_trip(tmp_path):
+    target = tmp_path / "file"
+    target.write_bytes(b"x")
+    record = deploy_state.file_record(str(target), "h1")
+
+    deploy_state.save_deployment(str(tmp_path), "p", {"mods/file": record})
+
+    assert deploy_state.load_deployment(str(tmp_path)) == {"pack": "p", "files": {"mods/file": record}}
+    deploy_state.clear_deployment(str(tmp_path))
+    assert deploy_state.load_deployment(str(tmp_path)) == {}
+
+
+def test_unreadable_manifest_is_empty(tmp_path):
+    (tmp_path / deploy_state.DEPLOY_MANIFEST).write_text("{not json", encoding="utf-8")
+
+    assert deploy_state.load_deployment(str(tmp_path)) == {}
+
+
+def test_is_current(tmp_path):
+    target = tmp_path / "file"
+    target.write_bytes(b"x")
+    record = deploy_state.file_record(str(target), "h1")
+
+    assert deploy_state.is_current(str(target), record, "h1")
+    assert not deploy_state.is_current(str(target), record, "h2")
+    assert not deploy_state.is_current(str(target), None, "h1")
+
+    target.write_bytes(b"xy")
+    assert not deploy_state.is_current(str(target), record, "h1")
+    os.remove(target)
+    assert not deploy_state.is_current(str(target), record, "h1")
+
+
+def test_apply_only_writes_the_difference(tmp_path, write_files):
+    pack = tmp_path / "pack"
+    mc = tmp_path / "minecraft"
+    mc.mkdir()
+    write_files(pack, {"mods/a.jar": b"a1", "mods/b.jar": b"b1", "config/c.toml": b"c1"})
+
+    stats = apply_pack(str(pack), str(mc), {"id": "p"}, CONFIG)
+    assert (stats["added"], stats["unchanged"]) == (3, 0)
+
+    stats = apply_pack(str(pack), str(mc), {"id": "p"}, CONFIG)
+    assert (stats["added"], stats["replaced"], stats["removed"], stats["unchanged"]) == (0, 0, 0, 3)
+
+    # A changed and a removed pack file, plus a deployed file edited in place.
+    write_files(pack, {"mods/a.jar": b"a2"})
+    os.remove(pack / "mods" / "b.jar")
+    (mc / "config" / "c.toml").write_bytes(b"edited")
+
+    stats = apply_pack(str(pack), str(mc), {"id": "p"}, CONFIG)
+    assert (stats["added"], stats["replaced"], stats["removed"], stats["unchanged"]) == (0, 2, 1, 0)
+    assert (mc / "mods" / "a.jar").read_bytes() == b"a2"
+    assert (mc / "config" / "c.toml").read_bytes() == b"c1"
+    assert not (mc / "mods" / "b.jar").exists()
+    assert set(deploy_state.load_deployment(str(mc))["files"]) == {"mods/a.jar", "config/c.toml"}
+
+
+def test_apply_replaces_a_directory_with_a_file(tmp_path, write_files):
+    pack = write_files(tmp_path / "pack", {"config/create.toml": b"scale = 1"})
+    mc = write_files(tmp_path / "minecraft", {"config/create.toml/client.toml": b"old"})
+
+    apply_pack(str(pack), str(mc), {"id": "p"}, CONFIG)
+
+    assert (mc / "config" / "create.toml").read_bytes() == b"scale = 1"
+    assert trash.wait_idle(5)
+    assert not (mc / trash.TRASH_DIR).exists()
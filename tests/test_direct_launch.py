@@ -0,0 +1,168 @@
+import json
+import os
+import sys
+
+import pytest
+
+import direct_launch
+from direct_launch import LaunchError, _expand, _rules_allow, build_command, launch, resolve_version
+from log_tailer import StreamTailer
+
+VANILLA = "1.21"
+FABRIC = "fabric-loader-0.16.5-1.21"
+
+
+def _write_version(mc, version_id, data):
+    path = mc / "versions" / version_id / f"{version_id}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict(data, id=version_id)), encoding="utf-8")
+
+
+@pytest.fixture
+def mc(tmp_path):
+    root = tmp_path / "minecraft"
+    _write_version(root, VANILLA, {
+        "mainClass": "net.minecraft.client.main.Main",
+        "type": "release",
+        "assetIndex": {"id": "17"},
+        "libraries": [
+            {"name": "org.ow2.asm:asm:9.6"},
+            {"name": "com.google.guava:guava:32.1.2-jre"},
+            {"name": "org.lwjgl:lwjgl:3.3.3", "rules": [{"action": "allow", "os": {"name": "nowhere"}}]},
+        ],
+        "arguments": {
+            "game": [
+                "--username", "${auth_player_name}",
+                "--gameDir", "${game_directory}",
+                {"rules": [{"action": "allow", "features": {"is_demo_user": True}}], "value": "--demo"},
+            ],
+            "jvm": ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"],
+        },
+    })
+    _write_version(root, FABRIC, {
+        "inheritsFrom": VANILLA,
+        "mainClass": "net.fabricmc.loader.impl.launch.knot.KnotClient",
+        "libraries": [
+            {"name": "net.fabricmc:fabric-loader:0.16.5"},
+            {"name": "org.ow2.asm:asm:9.7"},
+        ],
+        "arguments": {"game": [], "jvm": ["-DFabricMcEmu= net.minecraft.client.main.Main "]},
+    })
+    return root
+
+
+def _install_libraries(mc, version_id):
+    version = resolve_version(str(mc), version_id)
+    for lib in version["libraries"]:
+        if _rules_allow(lib.get("rules")):
+            path = mc / "libraries" / direct_launch._library_path(lib)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"")
+    jar = mc / "versions" / version["jar"] / f"{version['jar']}.jar"
+    jar.write_bytes(b"")
+
+
+def test_resolve_version_inherits_from_parent(mc):
+    version = resolve_version(str(mc), FABRIC)
+
+    assert version["id"] == FABRIC
+    assert version["mainClass"] == "net.fabricmc.loader.impl.launch.knot.KnotClient"
+    assert version["assetIndex"] == {"id": "17"}
+    assert version["jar"] == VANILLA
+    assert "inheritsFrom" not in version
+    # Parent arguments first, then the child's.
+    assert version["arguments"]["jvm"][0] == "-Djava.library.path=${natives_directory}"
+    assert version["arguments"]["jvm"][-1] == "-DFabricMcEmu= net.minecraft.client.main.Main "
+    assert version["arguments"]["game"][:2] == ["--username", "${auth_player_name}"]
+
+
+def test_resolve_version_child_library_overrides_parent(mc):
+    names = [lib["name"] for lib in resolve_version(str(mc), FABRIC)["libraries"]]
+
+    assert names[:2] == ["net.fabricmc:fabric-loader:0.16.5", "org.ow2.asm:asm:9.7"]
+    assert "org.ow2.asm:asm:9.6" not in names
+    assert "com.google.guava:guava:32.1.2-jre" in names
+
+
+def test_resolve_version_missing_parent(mc):
+    _write_version(mc, "orphan", {"inheritsFrom": "1.0", "mainClass": "Main"})
+
+    with pytest.raises(LaunchError):
+        resolve_version(str(mc), "orphan")
+
+
+def test_rules_allow(monkeypatch):
+    monkeypatch.setattr(direct_launch, "_os_name", lambda: "linux")
+
+    assert _rules_allow(None)
+    assert _rules_allow([])
+    assert _rules_allow([{"action": "allow"}])
+    assert _rules_allow([{"action": "allow", "os": {"name": "linux"}}])
+    assert not _rules_allow([{"action": "allow", "os": {"name": "osx"}}])
+    assert not _rules_allow([{"action": "allow"}, {"action": "disallow", "os": {"name": "linux"}}])
+    assert _rules_allow([{"action": "allow"}, {"action": "disallow", "os": {"name": "windows"}}])
+    # Launcher features (demo mode, custom resolution...) are never enabled.
+    assert not _rules_allow([{"action": "allow", "features": {"is_demo_user": True}}])
+
+
+def test_expand_placeholders():
+    args = [
+        "--username", "${auth_player_name}",
+        "${unknown}",
+        "-Dpath=${natives_directory}/x",
+        {"rules": [{"action": "allow"}], "value": ["--width", "${width}"]},
+        {"rules": [{"action": "allow", "features": {"has_custom_resolution": True}}], "value": "--fullscreen"},
+    ]
+    expanded = _expand(args, {"auth_player_name": "Steve", "natives_directory": "/n", "width": 854})
+
+    assert expanded == ["--username", "Steve", "${unknown}", "-Dpath=/n/x", "--width", "854"]
+
+
+def test_build_command(mc, tmp_path):
+    _install_libraries(mc, FABRIC)
+    game_dir = str(tmp_path / "game")
+
+    command = build_command(str(mc), FABRIC, game_dir, {"java_path": "java", "player_name": "Steve"}, ["-Xmx2G"])
+
+    assert command[:2] == ["java", "-Xmx2G"]
+    main = command.index("net.fabricmc.loader.impl.launch.knot.KnotClient")
+    classpath = command[command.index("-cp") + 1].split(os.pathsep)
+    assert classpath[-1].endswith(os.path.join("versions", VANILLA, f"{VANILLA}.jar"))
+    assert not any("asm-9.6" in entry for entry in classpath)
+    assert not any("lwjgl" in entry for entry in classpath)
+    game = command[main + 1:]
+    assert game == ["--username", "Steve", "--gameDir", game_dir]
+
+
+def test_build_command_missing_library(mc, tmp_path):
+    with pytest.raises(LaunchError, match="라이브러리"):
+        build_command(str(mc), FABRIC, str(tmp_path / "game"), {"java_path": "java"})
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="the stub java is a shebang script")
+def test_launch_streams_stdout_to_tailer(mc, tmp_path):
+    _install_libraries(mc, FABRIC)
+    args_file = tmp_path / "args.json"
+    java = tmp_path / "java"
+    java.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os, sys\n"
+        f"json.dump({{'argv': sys.argv[1:], 'cwd': os.getcwd()}}, open({str(args_file)!r}, 'w'))\n"
+        "print('[12:00:00] [main/INFO]: Loading 3 mods:', flush=True)\n"
+        "print('[12:00:01] [Render thread/INFO]: Reloading ResourceManager: vanilla', flush=True)\n"
+        "print('[12:00:02] [Render thread/INFO]: Sound engine started', flush=True)\n",
+        encoding="utf-8",
+    )
+    java.chmod(0o755)
+    game_dir = tmp_path / "game"
+
+    popen = launch(str(mc), FABRIC, str(game_dir), {"java_path": str(java)}, ["-Xmx2G"])
+    tailer = StreamTailer(popen.stdout).start()
+    assert popen.wait(10) == 0
+    tailer.stop()
+
+    assert set(tailer.milestones) == {"mod_init", "resource_reload", "main_menu"}
+    assert tailer.milestones["mod_init"] < tailer.milestones["main_menu"]
+    launched = json.loads(args_file.read_text(encoding="utf-8"))
+    assert launched["argv"][0] == "-Xmx2G"
+    assert os.path.samefile(launched["cwd"], game_dir)
@@ -0,0 +1,39 @@
+from jvm_tuning import MAX_HEAP_MB, MIN_HEAP_MB, gc_flags, heap_mb, java_version
+
+MB = 1024 * 1024
+
+
+def test_heap_mb_small_pack_gets_minimum():
+    assert heap_mb(0, 0) == MIN_HEAP_MB
+    assert heap_mb(20, 50 * MB) == MIN_HEAP_MB
+
+
+def test_heap_mb_grows_with_pack_in_512_steps():
+    # 1024 + 16 * 200 + 1.5 * 800 = 5424 -> 5632
+    assert heap_mb(200, 800 * MB) == 5632
+    assert heap_mb(200, 800 * MB) % 512 == 0
+    assert heap_mb(300, 800 * MB) > heap_mb(200, 800 * MB)
+
+
+def test_heap_mb_is_capped():
+    assert heap_mb(2000, 8000 * MB) == MAX_HEAP_MB
+    # Half of a 16 GiB host.
+    assert heap_mb(400, 2000 * MB, host_mb=16384) == 8192
+    # Physical memory minus the reserve, when that is smaller than half.
+    assert heap_mb(400, 2000 * MB, host_mb=3000) == 1024
+
+
+def test_java_version():
+    assert java_version({"mc_version": "1.20.1"}) == 17
+    assert java_version({"mc_version": "1.20.6"}) == 21
+    assert java_version({"mc_version": "1.17.1"}) == 16
+    assert java_version({"mc_version": "1.12.2"}) == 8
+    assert java_version({}) == 17
+    assert java_version({"mc_version": "1.20.1", "jvm": {"java": 21}}) == 21
+
+
+def test_gc_flags():
+    assert "-XX:+ZGenerational" not in gc_flags("zgc", 17)
+    assert gc_flags("zgc", 21)[:2] == ["-XX:+UseZGC", "-XX:+ZGenerational"]
+    assert "-XX:+UseG1GC" in gc_flags("zgc", 8)
+    assert gc_flags("default", 21) == []
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from log_tailer import MilestoneTracker, line_time
+
+
+def _ts(*args) -> float:
+    return datetime(*args).timestamp()
+
+
+def test_line_time_without_timestamp_is_received():
+    received = _ts(2024, 10, 12, 15, 0, 0)
+
+    assert line_time("Sound engine started", received) == received
+    assert line_time("[main/INFO]: no time here", received) == received
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("[14:59:58] [main/INFO]: Loading 3 mods", _ts(2024, 10, 12, 14, 59, 58)),
+    ("[14:59:58.250] [main/INFO]: Loading 3 mods", _ts(2024, 10, 12, 14, 59, 58, 250000)),
+    ("[12Oct2024 14:59:58.250] [main/INFO] [cpw.mods.modlauncher.Launcher/MODLAUNCHER]: x",
+     _ts(2024, 10, 12, 14, 59, 58, 250000)),
+])
+def test_line_time_parses_time_of_day(line, expected):
+    assert line_time(line, _ts(2024, 10, 12, 15, 0, 0)) == pytest.approx(expected)
+
+
+def test_line_time_wraps_midnight():
+    received = _ts(2024, 10, 13, 0, 0, 5)
+
+    assert line_time("[23:59:59] [main/INFO]: x", received) == pytest.approx(_ts(2024, 10, 12, 23, 59, 59))
+    assert line_time("[00:00:01] [main/INFO]: x", received) == pytest.approx(_ts(2024, 10, 13, 0, 0, 1))
+
+
+def test_tracker_keeps_first_match_and_spans():
+    received = _ts(2024, 10, 12, 15, 0, 0)
+    seen = []
+    tracker = MilestoneTracker(lambda name, ts: seen.append(name))
+    for line in [
+        "[14:59:50] [main/INFO]: Loading 3 mods:",
+        "[14:59:55] [Render thread/INFO]: Sound engine started",
+        "[14:59:57] [Render thread/INFO]: Sound engine started",
+    ]:
+        tracker.feed(line, received)
+
+    assert seen == ["mod_init", "main_menu"]
+    started = _ts(2024, 10, 12, 14, 59, 45)
+    spans = tracker.spans(started)
+    assert [name for name, _, _ in spans] == ["to_mod_init", "time_to_menu"]
+    assert spans[-1][2] - spans[-1][1] == pytest.approx(10.0)
+    assert tracker.spans(None) == []
@@ -0,0 +1,75 @@
+import pytest
+
+from mod_profile import _parse, attribute
+
+MODS = {"create": "create-0.5.1.jar", "jei": "jei-15.2.jar", "sodium": "sodium-0.5.8.jar"}
+
+
+def _line(ts, msg, thread="main", logger=""):
+    return {"ts": float(ts), "msg": msg, "thread": thread, "logger": logger}
+
+
+def test_construction_time_is_attributed():
+    lines = [
+        _line(0, "Loading mod instance create of type com.simibubi.create.Create", "modloading-worker-0"),
+        _line(1.25, "Loaded mod instance create of type com.simibubi.create.Create", "modloading-worker-0"),
+        _line(5, "Sound engine started", "Render thread"),
+    ]
+    result = attribute(lines, MODS)
+
+    assert result["mods"] == {"create": {"init": 1.25, "resources": 0.0}}
+    assert result["boot"] == 5
+
+
+def test_gap_goes_to_previous_mod_per_phase():
+    lines = [
+        _line(0, "Loading 3 mods:"),
+        _line(1, "Registering blocks", logger="create"),
+        _line(2.5, "Done"),
+        _line(3, "Reloading ResourceManager: vanilla, create", "Render thread"),
+        _line(4, "[JEI] Starting plugins", "Render thread"),
+        _line(6, "Sound engine started", "Render thread"),
+    ]
+    result = attribute(lines, MODS)
+
+    assert result["mods"]["create"] == {"init": pytest.approx(1.5), "resources": 0.0}
+    assert result["mods"]["jei"] == {"init": 0.0, "resources": pytest.approx(2.0)}
+
+
+def test_took_line_is_not_double_counted():
+    lines = [
+        _line(0, "Loading 3 mods:"),
+        _line(1, "Initializing", logger="sodium"),
+        _line(5, "sodium init took 4000 ms"),
+        _line(6, "Sound engine started"),
+    ]
+    result = attribute(lines, MODS)
+
+    assert result["mods"]["sodium"]["init"] == pytest.approx(4.0)
+
+
+def test_lines_after_main_menu_are_ignored():
+    lines = [
+        _line(0, "Loading 3 mods:"),
+        _line(1, "Sound engine started"),
+        _line(2, "Loaded mod instance create of type x"),
+        _line(3, "create tick took 900 ms"),
+    ]
+
+    assert attribute(lines, MODS)["mods"] == {}
+
+
+def test_parse_log_formats(tmp_path):
+    log = tmp_path / "debug.log"
+    log.write_text(
+        "[12Oct2024 14:00:00.100] [main/INFO] [net.minecraftforge.fml.loading.ModSorter/LOADING]: Found 3 mods\n"
+        "[14:00:01] [Worker-Main-1/DEBUG] (create) Registering blocks\n"
+        "[14:00:02] [Render thread/INFO]: Sound engine started\n"
+        "  at some.stack.Trace\n",
+        encoding="utf-8",
+    )
+    lines = _parse(str(log), log.stat().st_mtime)
+
+    assert [line["logger"] for line in lines] == ["net.minecraftforge.fml.loading.ModSorter", "create", ""]
+    assert [line["thread"] for line in lines] == ["main", "Worker-Main-1", "Render thread"]
+    assert lines[1]["msg"] == "Registering blocks"
@@ -0,0 +1,118 @@
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+from mpack import _HEADER, MAGIC, METHOD_LZMA, METHOD_STORED, MPackError, MPackReader, build
+from transfer import TransferEngine
+
+
+def _jar_bytes() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("a/A.class", b"\xca\xfe\xba\xbe" * 64)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def pack(tmp_path, write_files):
+    return write_files(tmp_path / "pack", {
+        "mods/create.jar": _jar_bytes(),
+        "config/create/client.toml": "[client]\nscale = 1\n" * 200,
+        "notes.txt": "not a target",
+    })
+
+
+def _rewrite_index(path, edit):
+    """Rewrite the archive's index through edit(index)."""
+
+    data = path.read_bytes()
+    _magic, version, flags, offset, length = _HEADER.unpack_from(data, 0)
+    index = json.loads(data[offset:offset + length])
+    edit(index)
+    raw = json.dumps(index).encode("utf-8")
+    path.write_bytes(_HEADER.pack(MAGIC, version, flags, offset, len(raw)) + data[_HEADER.size:offset] + raw)
+
+
+def test_round_trip(pack, tmp_path):
+    out = str(tmp_path / "pack.mpack")
+    stats = build(str(pack), out, ["mods", "config"], {"id": "p"})
+
+    assert stats["entries"] == 2
+    with MPackReader(out) as reader:
+        assert reader.meta == {"id": "p"}
+        assert set(reader.entries) == {"mods/create.jar", "config/create/client.toml"}
+        assert reader.entries["mods/create.jar"]["method"] == METHOD_STORED
+        assert reader.entries["config/create/client.toml"]["method"] == METHOD_LZMA
+        assert reader.verify() == []
+        for rel, entry in reader.entries.items():
+            original = (pack / rel).read_bytes()
+            assert reader.read(rel) == original
+            assert entry["hash"] == hashlib.sha256(original).hexdigest()
+            target = tmp_path / "out" / rel
+            reader.extract(entry, str(target))
+            assert target.read_bytes() == original
+
+
+def test_verify_reports_corrupt_entry(pack, tmp_path):
+    out = tmp_path / "pack.mpack"
+    build(str(pack), str(out), ["mods", "config"])
+    with MPackReader(str(out)) as reader:
+        entry = dict(reader.entries["mods/create.jar"])
+
+    data = bytearray(out.read_bytes())
+    data[entry["offset"] + entry["length"] // 2] ^= 0xFF
+    out.write_bytes(bytes(data))
+
+    with MPackReader(str(out)) as reader, TransferEngine(4) as engine:
+        assert reader.verify(engine) == ["mods/create.jar"]
+
+
+def test_verify_reports_corrupt_lzma_entry(pack, tmp_path):
+    out = tmp_path / "pack.mpack"
+    build(str(pack), str(out), ["mods", "config"])
+    with MPackReader(str(out)) as reader:
+        entry = dict(reader.entries["config/create/client.toml"])
+
+    data = bytearray(out.read_bytes())
+    data[entry["offset"] + entry["length"] - 1] ^= 0xFF
+    out.write_bytes(bytes(data))
+
+    with MPackReader(str(out)) as reader:
+        assert reader.verify() == ["config/create/client.toml"]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("offset", -8),
+    ("length", -1),
+    ("size", -1),
+    ("offset", 0),
+    ("length", 1 << 40),
+    ("method", "zstd"),
+])
+def test_rejects_bad_entry_bounds(pack, tmp_path, field, value):
+    out = tmp_path / "pack.mpack"
+    build(str(pack), str(out), ["mods", "config"])
+    _rewrite_index(out, lambda index: index["entries"][0].update({field: value}))
+
+    with pytest.raises(MPackError):
+        MPackReader(str(out))
+
+
+def test_rejects_bad_files(pack, tmp_path):
+    not_mpack = tmp_path / "x.mpack"
+    not_mpack.write_bytes(b"PK\x03\x04" + b"\0" * 64)
+    with pytest.raises(MPackError):
+        MPackReader(str(not_mpack))
+
+    out = tmp_path / "pack.mpack"
+    build(str(pack), str(out), ["mods", "config"])
+    truncated = tmp_path / "truncated.mpack"
+    truncated.write_bytes(out.read_bytes()[:-10])
+    with pytest.raises(MPackError):
+        MPackReader(str(truncated))
+    # The failed reader must not keep the file open (Windows can't delete it).
+    os.remove(truncated)
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from orchestrator import Step, StepFailed, chain, run
+
+
+def _record(log, name, result=None):
+    def fn(results):
+        log.append(name)
+        return result
+    return fn
+
+
+def _fail(results):
+    raise ValueError("boom")
+
+
+def test_dependencies_run_first_and_results_are_passed():
+    log = []
+    steps = [
+        Step("b", lambda r: log.append("b") or r["a"] + 1, deps=("a",)),
+        Step("a", _record(log, "a", 1)),
+    ]
+
+    assert run(steps, progress=False) == {"a": 1, "b": 2}
+    assert log == ["a", "b"]
+
+
+def test_independent_steps_overlap():
+    barrier = threading.Barrier(2, timeout=5)
+    steps = [Step("a", lambda r: barrier.wait()), Step("b", lambda r: barrier.wait())]
+
+    run(steps, progress=False)
+
+
+def test_failure_skips_dependents_but_runs_always_steps():
+    log = []
+    steps = [
+        Step("apply", _fail),
+        Step("ensure_loader", _record(log, "ensure_loader")),
+        Step("launch", _record(log, "launch"), deps=("apply", "ensure_loader")),
+        Step("play", _record(log, "play"), deps=("launch",)),
+        Step("cleanup", lambda r: log.append(("cleanup", sorted(r))), deps=("play",), always=True),
+    ]
+
+    with pytest.raises(StepFailed) as info:
+        run(steps, progress=False)
+
+    assert info.value.step == "apply"
+    assert isinstance(info.value.exc, ValueError)
+    assert "launch" not in log and "play" not in log
+    # The cleanup ran last, after everything it waits on had settled.
+    assert log[-1] == ("cleanup", ["ensure_loader"])
+
+
+def test_failing_always_step_is_reported():
+    steps = [Step("play", _record([], "play")), Step("cleanup", _fail, deps=("play",), always=True)]
+
+    with pytest.raises(StepFailed) as info:
+        run(steps, progress=False)
+    assert info.value.step == "cleanup"
+
+
+def test_chain_keeps_list_order_and_always():
+    log = []
+    steps = chain([
+        Step("slow", lambda r: time.sleep(0.1) or log.append("slow")),
+        Step("fast", _record(log, "fast")),
+        Step("cleanup", _record(log, "cleanup"), always=True),
+    ])
+
+    assert [s.deps for s in steps] == [(), ("slow",), ("fast",)]
+    assert steps[-1].always
+    run(steps, progress=False)
+    assert log == ["slow", "fast", "cleanup"]
+
+
+def test_rejects_bad_graphs():
+    with pytest.raises(ValueError):
+        run([Step("a", _fail, deps=("b",)), Step("b", _fail, deps=("a",))], progress=False)
+    with pytest.raises(ValueError):
+        run([Step("a", _fail, deps=("missing",))], progress=False)
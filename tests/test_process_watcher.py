@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from process_watcher import GameProcess, _runs_in, scan
+
+
+def test_runs_in_matches_exact_game_dir(tmp_path):
+    game_dir = str(tmp_path / "instances" / "battle")
+
+    assert _runs_in(["java", "--gameDir", game_dir, "--width", "854"], game_dir)
+    assert _runs_in(["java", f"--gameDir={game_dir}"], game_dir)
+    assert _runs_in(["java", "--gameDir", game_dir + os.sep], game_dir)
+    assert not _runs_in(["java", "--gameDir", game_dir + "-pack"], game_dir)
+    assert not _runs_in(["java", "--assetsDir", game_dir], game_dir)
+    assert not _runs_in(["java", "--gameDir"], game_dir)
+
+
+@pytest.fixture
+def games(tmp_path):
+    """Two fake games, started from instances/battle and instances/battle-pack."""
+
+    procs = {}
+    for name in ("battle", "battle-pack"):
+        game_dir = str(tmp_path / "instances" / name)
+        procs[game_dir] = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)", "--gameDir", game_dir])
+    yield procs
+    for proc in procs.values():
+        proc.kill()
+        proc.wait()
+
+
+def test_scan_picks_the_instance_by_game_dir(games, tmp_path):
+    name = psutil.Process(next(iter(games.values())).pid).name()
+    battle = str(tmp_path / "instances" / "battle")
+
+    found = None
+    deadline = time.time() + 5
+    while found is None and time.time() < deadline:
+        found = scan([name], game_dir=battle)
+    assert found is not None and found.pid == games[battle].pid
+
+
+def test_wait_start_times_out(tmp_path):
+    game = GameProcess(["no-such-game.exe"], game_dir=str(tmp_path))
+
+    assert not game.wait_start(interval=0.05, timeout=0.2)
+    assert game.process is None
+
+
+def test_stop_terminates_running_game(games, tmp_path):
+    battle = str(tmp_path / "instances" / "battle")
+    name = psutil.Process(games[battle].pid).name()
+    game = GameProcess([name], game_dir=battle)
+
+    assert game.wait_start(interval=0.05, timeout=5)
+    assert game.pid == games[battle].pid
+    assert game.stop()
+    assert game.wait_exit(5)
+    assert games[battle].wait(5) != 0
+    assert games[str(tmp_path / "instances" / "battle-pack")].poll() is None
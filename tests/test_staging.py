@@ -0,0 +1,68 @@
+import json
+import os
+
+import deploy_state
+import staging
+import trash
+from apply_manager import apply_pack, rollback_pack
+
+CONFIG = {"transfer_workers": 2, "deploy_mode": "staged"}
+TARGETS = ["mods", "config"]
+
+
+def _live(mc, read_files):
+    assert trash.wait_idle(5)
+    skip = (staging.STAGING_DIR, staging.PREVIOUS_DIR, staging.ROLLBACK_TMP_DIR, trash.TRASH_DIR,
+            deploy_state.DEPLOY_MANIFEST)
+    return read_files(mc, skip=skip)
+
+
+def test_switch_and_rollback(tmp_path, write_files, read_files):
+    mc = tmp_path / "minecraft"
+    mc.mkdir()
+    old = write_files(tmp_path / "old", {"mods/a.jar": b"a1", "config/c.toml": b"c1"})
+    new = write_files(tmp_path / "new", {"mods/a.jar": b"a2", "mods/b.jar": b"b1"})
+
+    apply_pack(str(old), str(mc), {"id": "old"}, CONFIG)
+    apply_pack(str(new), str(mc), {"id": "new"}, CONFIG)
+    assert _live(mc, read_files) == {"mods/a.jar": b"a2", "mods/b.jar": b"b1"}
+    assert not os.path.exists(staging.staging_dir(str(mc)))
+
+    assert rollback_pack(str(mc), TARGETS)
+    assert _live(mc, read_files) == {"mods/a.jar": b"a1", "config/c.toml": b"c1"}
+    assert deploy_state.load_deployment(str(mc))["pack"] == "old"
+
+    # Rolling back twice returns to where you started.
+    assert rollback_pack(str(mc), TARGETS)
+    assert _live(mc, read_files) == {"mods/a.jar": b"a2", "mods/b.jar": b"b1"}
+    assert deploy_state.load_deployment(str(mc))["pack"] == "new"
+
+
+def test_rollback_without_previous_layout(tmp_path):
+    assert not staging.rollback(str(tmp_path), TARGETS)
+
+
+def test_recover_finishes_interrupted_swap(tmp_path, write_files, read_files):
+    mc = tmp_path / "minecraft"
+    stage = staging.staging_dir(str(mc))
+    # Crashed after "mods" went live and "config" was moved out, before the
+    # staged "config" was renamed in.
+    write_files(mc, {
+        "mods/a.jar": b"new",
+        f"{staging.PREVIOUS_DIR}/mods/a.jar": b"old",
+        f"{staging.PREVIOUS_DIR}/config/c.toml": b"old",
+        f"{staging.STAGING_DIR}/config/c.toml": b"new",
+    })
+    (mc / staging.JOURNAL_FILE).write_text(json.dumps({"incoming": stage, "names": TARGETS}), encoding="utf-8")
+
+    assert staging.recover(str(mc))
+    assert _live(mc, read_files) == {"mods/a.jar": b"new", "config/c.toml": b"new"}
+    assert not (mc / staging.JOURNAL_FILE).exists()
+    assert not staging.recover(str(mc))
+
+
+def test_recover_drops_unreadable_journal(tmp_path):
+    (tmp_path / staging.JOURNAL_FILE).write_text("{", encoding="utf-8")
+
+    assert not staging.recover(str(tmp_path))
+    assert not (tmp_path / staging.JOURNAL_FILE).exists()
@@ -0,0 +1,65 @@
+import os
+
+import trash
+
+
+def test_discard_moves_out_of_the_way_and_reclaims(tmp_path, write_files):
+    root = write_files(tmp_path / "minecraft", {"mods/a.jar": b"a", "mods/sub/b.jar": b"b"})
+
+    assert trash.discard(str(root / "mods"), str(root))
+    # Gone from its place at once; the rename target may still exist.
+    assert not (root / "mods").exists()
+    assert trash.wait_idle(5)
+    assert not os.path.exists(trash.trash_dir(str(root)))
+
+
+def test_discard_missing_path(tmp_path):
+    assert trash.discard(str(tmp_path / "nothing"), str(tmp_path))
+    assert not os.path.exists(trash.trash_dir(str(tmp_path)))
+
+
+def test_discard_deletes_in_place_when_rename_fails(tmp_path, write_files, monkeypatch):
+    root = write_files(tmp_path / "minecraft", {"config/a.toml": b"a"})
+
+    def cross_device(src, dst):
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(trash.os, "rename", cross_device)
+
+    assert not trash.discard(str(root / "config"), str(root))
+    assert not (root / "config").exists()
+
+
+def test_resume_reclaims_trash_left_by_a_crash(tmp_path, write_files):
+    roots = [tmp_path / "minecraft", tmp_path / "packs" / "p"]
+    for root in roots:
+        write_files(root, {
+            f"{trash.TRASH_DIR}/0123-mods/a.jar": b"a",
+            f"{trash.TRASH_DIR}/4567-options.txt": b"o",
+            "mods/kept.jar": b"k",
+        })
+
+    trash.resume([str(root) for root in roots] + [str(tmp_path / "missing")])
+
+    assert trash.wait_idle(5)
+    for root in roots:
+        assert not (root / trash.TRASH_DIR).exists()
+        assert (root / "mods" / "kept.jar").read_bytes() == b"k"
+
+
+def test_failed_delete_is_kept_for_the_next_resume(tmp_path, write_files, monkeypatch):
+    root = write_files(tmp_path / "minecraft", {"mods/a.jar": b"a"})
+    real_delete = trash._delete
+
+    def locked(path):
+        raise PermissionError(13, "in use", path)
+
+    monkeypatch.setattr(trash, "_delete", locked)
+    trash.discard(str(root / "mods"), str(root))
+    assert trash.wait_idle(5)
+    assert len(os.listdir(trash.trash_dir(str(root)))) == 1
+
+    monkeypatch.setattr(trash, "_delete", real_delete)
+    trash.resume([str(root)])
+    assert trash.wait_idle(5)
+    assert not os.path.exists(trash.trash_dir(str(root)))
@@ -0,0 +1,50 @@
+import io
+import os
+import zipfile
+
+import deploy_state
+from apply_manager import apply_pack
+from verify import problems, verify_pack
+
+CONFIG = {"transfer_workers": 2}
+
+
+def _jar_bytes() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("a/A.class", b"\xca\xfe\xba\xbe")
+    return buf.getvalue()
+
+
+def test_checks_deployed_files_of_a_pack_without_manifest_id(tmp_path, write_files):
+    pack_path = write_files(tmp_path / "packs" / "plain", {
+        "manifest.json": "{}",
+        "mods/a.jar": _jar_bytes(),
+        "config/c.toml": b"c1",
+    })
+    mc = tmp_path / "minecraft"
+    mc.mkdir()
+    pack = {"id": "plain", "path": str(pack_path), "meta": {}}
+
+    apply_pack(pack["path"], str(mc), pack["meta"], CONFIG)
+    assert deploy_state.load_deployment(str(mc))["pack"] == "plain"
+
+    report = verify_pack(pack, str(mc), CONFIG)
+    assert report["deployed"]
+    assert problems(report) == []
+
+    os.remove(mc / "mods" / "a.jar")
+    report = verify_pack(pack, str(mc), CONFIG)
+    assert report["missing"] == ["mods/a.jar"]
+    assert problems(report) == ["적용되지 않은 파일: mods/a.jar"]
+
+
+def test_skips_deployed_files_of_another_pack(tmp_path, write_files):
+    pack_path = write_files(tmp_path / "packs" / "plain", {"mods/a.jar": _jar_bytes()})
+    mc = tmp_path / "minecraft"
+    mc.mkdir()
+
+    apply_pack(str(pack_path), str(mc), {}, CONFIG, pack_id="other")
+
+    report = verify_pack({"id": "plain", "path": str(pack_path), "meta": {}}, str(mc), CONFIG)
+    assert not report["deployed"]
@@ -0,0 +1,150 @@
+import json
+import math
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+TRACE_DIR = os.path.join("logs", "traces")
+SESSIONS_FILE = os.path.join("logs", "sessions.jsonl")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = math.floor(k)
+    hi = math.ceil(k)
+    if lo == hi:
+        return sorted_values[int(k)]
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class Session:
+    """Spans of one !run, persisted as a line of logs/sessions.jsonl."""
+
+    def __init__(self, pack_id: str):
+        self.id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.pack = pack_id
+        self.started_at = time.time()
+        self.spans: list[dict] = []
+
+    def add_span(self, name: str, start: float, end: float, **attrs) -> dict:
+        """Record a span from wall-clock start/end timestamps (seconds)."""
+
+        span = {"name": name, "start": start, "duration": max(0.0, end - start), "attrs": attrs}
+        self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time a block; the yielded dict can be filled with extra attrs."""
+
+        start = time.time()
+        t0 = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            span = self.add_span(name, start, start, **attrs)
+            span["duration"] = time.perf_counter() - t0
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "pack": self.pack,
+            "started_at": self.started_at,
+            "spans": self.spans,
+        }
+
+    def finish(self):
+        os.makedirs(os.path.dirname(SESSIONS_FILE), exist_ok=True)
+        with open(SESSIONS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+
+def load_sessions(pack_id: str | None = None, limit: int | None = None) -> list[dict]:
+    """Persisted sessions, oldest first, optionally for one pack / last N."""
+
+    sessions = []
+    try:
+        with open(SESSIONS_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue
+                if pack_id is None or data.get("pack") == pack_id:
+                    sessions.append(data)
+    except OSError:
+        return []
+    return sessions[-limit:] if limit else sessions
+
+
+def find_session(session_id: str) -> dict | None:
+    sessions = load_sessions()
+    if session_id == "last":
+        return sessions[-1] if sessions else None
+    for data in sessions:
+        if data.get("id") == session_id:
+            return data
+    return None
+
+
+def phase_stats(sessions: list[dict]) -> dict:
+    """{phase: {count, p50, p90, p99, max}} over the given sessions."""
+
+    durations: dict[str, list[float]] = {}
+    for data in sessions:
+        for span in data.get("spans", []):
+            durations.setdefault(span["name"], []).append(span["duration"])
+
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": values[-1],
+        }
+    return stats
+
+
+def to_chrome_trace(data: dict) -> dict:
+    """Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+
+    events = []
+    for span in data.get("spans", []):
+        events.append({
+            "name": span["name"],
+            "cat": "modular",
+            "ph": "X",
+            "ts": int(span["start"] * 1_000_000),
+            "dur": int(span["duration"] * 1_000_000),
+            "pid": 1,
+            "tid": 1,
+            "args": span.get("attrs", {}),
+        })
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"session": data.get("id"), "pack": data.get("pack")},
+    }
+
+
+def export(data: dict, fmt: str = "json", path: str | None = None) -> str:
+    """Write a session as plain JSON or Chrome trace; returns the path."""
+
+    if fmt not in ("json", "chrome"):
+        raise ValueError(f"unknown trace format: {fmt}")
+    if path is None:
+        suffix = ".trace.json" if fmt == "chrome" else ".json"
+        path = os.path.join(TRACE_DIR, f"{data['id']}{suffix}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    payload = to_chrome_trace(data) if fmt == "chrome" else data
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,173 @@
+import os
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 4)
+
+# Files at least this big are split into CHUNK_SIZE pieces copied in parallel.
+CHUNK_THRESHOLD = 64 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024 * 1024
+_BUFFER_SIZE = 256 * 1024
+
+
+class TransferError(RuntimeError):
+    """One or more jobs failed; errors are listed in submission order."""
+
+    def __init__(self, errors: list[tuple[str, BaseException]]):
+        self.errors = errors
+        lines = [f"{label}: {exc}" for label, exc in errors]
+        super().__init__(f"{len(errors)}개 작업 실패\n" + "\n".join(lines))
+
+
+def workers_from_config(config: dict | None) -> int:
+    try:
+        workers = int((config or {}).get("transfer_workers", DEFAULT_WORKERS))
+    except (TypeError, ValueError):
+        return DEFAULT_WORKERS
+    return max(1, workers)
+
+
+def _copy_range(src: str, dst: str, offset: int, length: int):
+    with open(src, "rb") as fs, open(dst, "r+b") as fd:
+        fs.seek(offset)
+        fd.seek(offset)
+        while length > 0:
+            buf = fs.read(min(_BUFFER_SIZE, length))
+            if not buf:
+                raise OSError(f"파일이 복사 도중 줄어들었습니다: {src}")
+            fd.write(buf)
+            length -= len(buf)
+
+
+class TransferEngine:
+    """Bounded thread pool shared by apply_pack and zip extraction.
+
+    Jobs are submitted with submit()/copy() and collected with wait(), which
+    returns results in submission order and raises TransferError listing
+    every failure (also in submission order). Use as a context manager.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.workers = max(1, workers or DEFAULT_WORKERS)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transfer")
+        # Bound the number of queued jobs so huge packs don't build an
+        # unbounded backlog of futures.
+        self._slots = threading.BoundedSemaphore(self.workers * 4)
+        self._jobs: list[tuple[str, object]] = []
+        self._finalizers: list[tuple[str, object]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def submit(self, fn, *args, label: str | None = None):
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _f: self._slots.release())
+        self._jobs.append((label or getattr(fn, "__name__", "job"), future))
+        return future
+
+    def copy(self, src: str, dst: str):
+        """Copy src to dst (metadata included), chunked for large files."""
+
+        size = os.path.getsize(src)
+        if size < CHUNK_THRESHOLD or self.workers == 1:
+            self.submit(shutil.copy2, src, dst, label=src)
+            return
+
+        with open(dst, "wb") as f:
+            f.truncate(size)
+        for offset in range(0, size, CHUNK_SIZE):
+            length = min(CHUNK_SIZE, size - offset)
+            self.submit(_copy_range, src, dst, offset, length, label=f"{src}@{offset}")
+        self._finalizers.append((src, lambda: shutil.copystat(src, dst)))
+
+    def wait(self) -> list:
+        jobs, self._jobs = self._jobs, []
+        finalizers, self._finalizers = self._finalizers, []
+
+        results = []
+        errors = []
+        for label, future in jobs:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                errors.append((label, e))
+
+        if not errors:
+            for label, fn in finalizers:
+                try:
+                    fn()
+                except Exception as e:
+                    errors.append((label, e))
+
+        if errors:
+            raise TransferError(errors)
+        return results
+
+
+class ZipReader:
+    """Thread-safe member extraction from one zip.
+
+    Each worker thread reads through its own ZipFile handle so members are
+    decompressed concurrently instead of serializing on one file object.
+    """
+
+    def __init__(self, zip_path: str):
+        self.zip_path = zip_path
+        self._local = threading.local()
+        self._handles = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _handle(self) -> zipfile.ZipFile:
+        zf = getattr(self._local, "zf", None)
+        if zf is None:
+            zf = self._local.zf = zipfile.ZipFile(self.zip_path, "r")
+            with self._lock:
+                self._handles.append(zf)
+        return zf
+
+    def extract(self, member: zipfile.ZipInfo, target: str):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with self._handle().open(member) as fs, open(target, "wb") as fd:
+            shutil.copyfileobj(fs, fd, _BUFFER_SIZE)
+
+    def read(self, member: zipfile.ZipInfo) -> bytes:
+        """Whole member; zipfile checks its CRC while reading."""
+
+        return self._handle().read(member)
+
+    def close(self):
+        with self._lock:
+            handles, self._handles = self._handles, []
+        for zf in handles:
+            zf.close()
+
+
+def extract_zip(zip_path: str, members: list[zipfile.ZipInfo], dest_for, engine: TransferEngine):
+    """Extract members in parallel; dest_for(member) gives the output path."""
+
+    with ZipReader(zip_path) as reader:
+        for member in members:
+            engine.submit(reader.extract, member, dest_for(member), label=member.filename)
+        engine.wait()
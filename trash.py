@@ -0,0 +1,128 @@
+import os
+import shutil
+import threading
+import uuid
+
+from utils.logger import log
+
+TRASH_DIR = ".modular-trash"
+
+_lock = threading.Lock()
+_pending: set[str] = set()
+_wakeup = threading.Event()
+_idle = threading.Event()
+_idle.set()
+_reclaimer: threading.Thread | None = None
+
+
+def trash_dir(root: str) -> str:
+    return os.path.join(root, TRASH_DIR)
+
+
+def _delete(path: str):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def discard(path: str, root: str) -> bool:
+    """Get path out of the way now and delete it in the background.
+
+    path is renamed into root's trash directory, so root must be on the same
+    filesystem. If the rename isn't possible the path is deleted right away
+    (errors propagate as they would from rmtree). Returns True if trashed.
+    """
+
+    if not os.path.lexists(path):
+        return True
+    trash = trash_dir(root)
+    target = os.path.join(trash, f"{uuid.uuid4().hex}-{os.path.basename(path)}")
+    with _lock:
+        try:
+            os.makedirs(trash, exist_ok=True)
+            os.rename(path, target)
+            trashed = True
+        except OSError:
+            trashed = False
+        else:
+            _pending.add(trash)
+            _idle.clear()
+
+    if not trashed:
+        _delete(path)
+        return False
+    _ensure_reclaimer()
+    _wakeup.set()
+    return True
+
+
+def _sweep(trash: str):
+    try:
+        names = os.listdir(trash)
+    except OSError:
+        return
+    for name in names:
+        try:
+            _delete(os.path.join(trash, name))
+        except OSError as e:
+            # Left in place; the next resume() retries it.
+            log("WARN", f"휴지통 삭제 실패: {name} ({e})")
+
+    with _lock:
+        if trash not in _pending:
+            try:
+                os.rmdir(trash)
+            except OSError:
+                pass
+
+
+def _run():
+    while True:
+        _wakeup.wait()
+        _wakeup.clear()
+        while True:
+            with _lock:
+                if not _pending:
+                    _idle.set()
+                    break
+                trash = _pending.pop()
+            _sweep(trash)
+
+
+def _ensure_reclaimer():
+    global _reclaimer
+    with _lock:
+        if _reclaimer is None:
+            _reclaimer = threading.Thread(target=_run, name="trash-reclaimer", daemon=True)
+            _reclaimer.start()
+
+
+def child_dirs(path: str) -> list[str]:
+    try:
+        return [os.path.join(path, name) for name in os.listdir(path)]
+    except OSError:
+        return []
+
+
+def resume(roots: list[str]):
+    """Queue trash left behind by an earlier run (e.g. after a crash)."""
+
+    found = False
+    with _lock:
+        for root in roots:
+            trash = trash_dir(root)
+            if os.path.isdir(trash):
+                _pending.add(trash)
+                found = True
+        if found:
+            _idle.clear()
+    if found:
+        _ensure_reclaimer()
+        _wakeup.set()
+
+
+def wait_idle(timeout: float | None = None) -> bool:
+    """Block until everything trashed so far is deleted."""
+
+    return _idle.wait(timeout)
@@ -1,15 +1,165 @@
+import atexit
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 
 LOG_DIR = "logs"
 LOG_FILE = "session.log"
 
+FLUSH_INTERVAL = 0.5          # seconds between batched writes
+MAX_BYTES = 1024 * 1024       # rotate session.log past this size ...
+MAX_AGE = 7 * 24 * 3600       # ... or once its first line is this old
+BACKUP_COUNT = 10             # rotated segments to keep
+COMPRESS = True               # gzip rotated segments
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_writer: threading.Thread | None = None
+_start_lock = threading.Lock()
+
+
+def configure(max_bytes: int | None = None, max_age: float | None = None,
+              backup_count: int | None = None, compress: bool | None = None,
+              flush_interval: float | None = None):
+    global MAX_BYTES, MAX_AGE, BACKUP_COUNT, COMPRESS, FLUSH_INTERVAL
+    if max_bytes is not None:
+        MAX_BYTES = max_bytes
+    if max_age is not None:
+        MAX_AGE = max_age
+    if backup_count is not None:
+        BACKUP_COUNT = backup_count
+    if compress is not None:
+        COMPRESS = compress
+    if flush_interval is not None:
+        FLUSH_INTERVAL = flush_interval
+
+
+def _segment_start(path: str) -> float:
+    """Time of the first line in path (now if empty/unparseable)."""
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            first = f.readline()
+        return datetime.strptime(first[1:20], _TS_FORMAT).timestamp()
+    except (OSError, ValueError):
+        return time.time()
+
+
+class _Writer:
+    def __init__(self):
+        self.path = os.path.join(LOG_DIR, LOG_FILE)
+        self.file = None
+        self.started = 0.0
+
+    def _open(self):
+        os.makedirs(LOG_DIR, exist_ok=True)
+        self.started = _segment_start(self.path)
+        self.file = open(self.path, "a", encoding="utf-8", errors="backslashreplace")
+
+    def _needs_rotation(self) -> bool:
+        if self.file.tell() >= MAX_BYTES:
+            return True
+        return self.file.tell() > 0 and time.time() - self.started >= MAX_AGE
+
+    def _rotate(self):
+        self.file.close()
+        self.file = None
+
+        stamp = datetime.fromtimestamp(self.started).strftime("%Y%m%d-%H%M%S")
+        base, ext = os.path.splitext(LOG_FILE)
+        rotated = os.path.join(LOG_DIR, f"{base}-{stamp}{ext}")
+        n = 1
+        while os.path.exists(rotated) or os.path.exists(rotated + ".gz"):
+            rotated = os.path.join(LOG_DIR, f"{base}-{stamp}-{n}{ext}")
+            n += 1
+        os.replace(self.path, rotated)
+
+        if COMPRESS:
+            import gzip
+            import shutil
+            with open(rotated, "rb") as fs, gzip.open(rotated + ".gz", "wb") as fd:
+                shutil.copyfileobj(fs, fd)
+            os.remove(rotated)
+
+        segments = sorted(
+            f for f in os.listdir(LOG_DIR)
+            if f.startswith(f"{base}-") and (f.endswith(ext) or f.endswith(ext + ".gz"))
+        )
+        for old in segments[:-BACKUP_COUNT] if BACKUP_COUNT > 0 else segments:
+            os.remove(os.path.join(LOG_DIR, old))
+
+    def write(self, lines: list[str]):
+        if self.file is None:
+            self._open()
+        self.file.write("".join(lines))
+        self.file.flush()
+        if self._needs_rotation():
+            self._rotate()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def _run():
+    writer = _Writer()
+    while True:
+        item = _queue.get()
+        lines = []
+        waiters = []
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        while True:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break
+            lines.append(item)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+        if lines:
+            try:
+                writer.write(lines)
+            except Exception:
+                # Drop the batch rather than the writer thread; the file
+                # is reopened on the next write.
+                writer.close()
+        for event in waiters:
+            event.set()
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is not None:
+        return
+    with _start_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_run, name="log-writer", daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+
 def log(level: str, message: str):
-    os.makedirs(LOG_DIR, exist_ok=True)
-    path = os.path.join(LOG_DIR, LOG_FILE)
+    """Queue one line for the background writer; never touches the disk."""
+
+    timestamp = datetime.now().strftime(_TS_FORMAT)
+    _queue.put(f"[{timestamp}] [{level}] {message}\n")
+    _ensure_writer()
+
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{timestamp}] [{level}] {message}\n"
+def flush(timeout: float | None = 5.0):
+    """Block until every line queued so far is written."""
 
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(line)
+    if _writer is None:
+        return
+    done = threading.Event()
+    _queue.put(done)
+    done.wait(timeout)
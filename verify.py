@@ -0,0 +1,232 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+
+import deploy_state
+import hash_cache
+from store_manager import is_immutable
+from transfer import TransferEngine, ZipReader, workers_from_config
+
+CACHE_DIR = "cache"
+VERIFIED_FILE = "verified.json"
+
+# Digests of jars/archives that already passed a full CRC check. Content is
+# immutable per digest, so a pass never needs repeating.
+_verified: set | None = None
+_verified_lock = threading.Lock()
+_dirty = False
+
+
+def _verified_path() -> str:
+    return os.path.join(CACHE_DIR, VERIFIED_FILE)
+
+
+def _load_verified() -> set:
+    global _verified
+    if _verified is None:
+        try:
+            with open(_verified_path(), "r", encoding="utf-8") as f:
+                _verified = set(json.load(f))
+        except (OSError, ValueError, TypeError):
+            _verified = set()
+    return _verified
+
+
+def _save_verified():
+    global _dirty
+    if not _dirty or _verified is None:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = _verified_path() + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(sorted(_verified), f)
+    os.replace(tmp, _verified_path())
+    _dirty = False
+
+
+def _mark_verified(digest: str):
+    global _dirty
+    with _verified_lock:
+        _load_verified().add(digest)
+        _dirty = True
+
+
+def _is_verified(digest: str) -> bool:
+    with _verified_lock:
+        return digest in _load_verified()
+
+
+def _test_zip(source) -> str | None:
+    """CRC-check every member; returns the first problem or None."""
+
+    try:
+        with zipfile.ZipFile(source) as zf:
+            bad = zf.testzip()
+    except (zipfile.BadZipFile, OSError, EOFError) as e:
+        return str(e) or type(e).__name__
+    return f"CRC 불일치: {bad}" if bad else None
+
+
+def _check_jar_file(path: str, digest: str) -> str | None:
+    if _is_verified(digest):
+        return None
+    problem = _test_zip(path)
+    if problem is None:
+        _mark_verified(digest)
+    return problem
+
+
+def _check_jar_entry(reader, entry: dict) -> str | None:
+    if _is_verified(entry["hash"]):
+        return None
+    problem = _test_zip(io.BytesIO(reader.read(entry)))
+    if problem is None:
+        _mark_verified(entry["hash"])
+    return problem
+
+
+def _check_zip_member(reader: ZipReader, member: zipfile.ZipInfo) -> tuple[str | None, str | None]:
+    """(sha256, problem) of one member of a streamed pack zip."""
+
+    try:
+        data = reader.read(member)
+    except (zipfile.BadZipFile, OSError, EOFError) as e:
+        return None, str(e) or type(e).__name__
+    digest = hashlib.sha256(data).hexdigest()
+    if not member.filename.lower().endswith(".jar") or _is_verified(digest):
+        return digest, None
+    problem = _test_zip(io.BytesIO(data))
+    if problem is None:
+        _mark_verified(digest)
+    return digest, problem
+
+
+def _zip_listing(zip_path: str, targets: list[str], engine: TransferEngine):
+    """Hash the pack zip's members in place, as zip_mode="stream" deploys
+    them, instead of extracting the archive into .cache."""
+
+    with zipfile.ZipFile(zip_path) as zf:
+        members = [
+            m for m in zf.infolist()
+            if not m.is_dir() and m.filename.replace("\\", "/").split("/", 1)[0] in targets
+        ]
+    with ZipReader(zip_path) as reader:
+        for member in members:
+            engine.submit(_check_zip_member, reader, member, label=member.filename)
+        results = engine.wait()
+    listing = {}
+    problems = {}
+    for member, (digest, problem) in zip(members, results):
+        rel = member.filename.replace("\\", "/")
+        listing[rel] = digest
+        if problem:
+            problems[rel] = problem
+    return listing, problems
+
+
+def _source_listing(pack: dict, config: dict, engine: TransferEngine):
+    """{rel: sha256} of what the pack deploys, plus jar problems by rel.
+
+    Reads the pack's .mpack index, hashes a streamed zip's members, or
+    hashes the loose / extracted files in parallel.
+    """
+
+    from apply_manager import _find_pack_mpack, _find_pack_zip, _resolve_pack_source_dir, get_copy_targets
+    from mpack import MPackReader, _iter_files
+
+    targets = get_copy_targets(pack["meta"])
+    mpack_path = _find_pack_mpack(pack["path"], targets)
+    if mpack_path:
+        with MPackReader(mpack_path) as reader:
+            listing = {rel: e["hash"] for rel, e in reader.entries.items() if rel.split("/", 1)[0] in targets}
+            archive_digest = hash_cache.file_digest(mpack_path)
+            if not _is_verified(archive_digest):
+                bad = reader.verify(engine)
+                if bad:
+                    return listing, {rel: "해시 불일치" for rel in bad}
+                _mark_verified(archive_digest)
+            jars = [rel for rel in listing if rel.lower().endswith(".jar")]
+            for rel in jars:
+                engine.submit(_check_jar_entry, reader, reader.entries[rel], label=rel)
+            return listing, {rel: p for rel, p in zip(jars, engine.wait()) if p}
+
+    if config.get("zip_mode", "cache") == "stream":
+        zip_path = _find_pack_zip(pack["path"], targets)
+        if zip_path:
+            return _zip_listing(zip_path, targets, engine)
+
+    source = _resolve_pack_source_dir(pack["path"], targets, workers_from_config(config))
+    files = list(_iter_files(source, targets))
+    for rel, path in files:
+        engine.submit(hash_cache.file_digest, path, label=path)
+    listing = {rel: digest for (rel, _), digest in zip(files, engine.wait())}
+
+    jars = [(rel, path) for rel, path in files if rel.lower().endswith(".jar")]
+    for rel, path in jars:
+        engine.submit(_check_jar_file, path, listing[rel], label=path)
+    problems = {rel: p for (rel, _), p in zip(jars, engine.wait()) if p}
+    return listing, problems
+
+
+def _deployed_files(minecraft_path: str, targets: list[str]) -> dict:
+    from mpack import _iter_files
+    return dict(_iter_files(minecraft_path, targets))
+
+
+def verify_pack(pack: dict, minecraft_path: str | None, config: dict | None = None) -> dict:
+    """Check the pack's files/jars and, if it is the deployed pack, that
+    minecraft_path holds exactly those files.
+
+    Returns {"files", "corrupt": {rel: reason}, "deployed": bool,
+    "missing": [...], "mismatched": [...], "extra": [...], "modified": [...],
+    "seconds"}. Configs and other mutable files the game may have rewritten
+    only end up in "modified"; jars that differ are "mismatched"/"extra".
+    """
+
+    from apply_manager import get_copy_targets
+
+    config = config or {}
+    started = time.perf_counter()
+    report = {
+        "files": 0, "corrupt": {}, "deployed": False,
+        "missing": [], "mismatched": [], "extra": [], "modified": [],
+    }
+
+    with TransferEngine(workers_from_config(config)) as engine:
+        listing, report["corrupt"] = _source_listing(pack, config, engine)
+        report["files"] = len(listing)
+
+        deployment = deploy_state.load_deployment(minecraft_path) if minecraft_path else {}
+        if deployment.get("pack") == pack["id"]:
+            report["deployed"] = True
+            deployed = _deployed_files(minecraft_path, get_copy_targets(pack["meta"]))
+            present = sorted(rel for rel in listing if rel in deployed)
+            for rel in present:
+                engine.submit(hash_cache.file_digest, deployed[rel], label=rel)
+            digests = engine.wait()
+            changed = [rel for rel, d in zip(present, digests) if d != listing[rel]]
+            extra = sorted(rel for rel in deployed if rel not in listing)
+            report["mismatched"] = [rel for rel in changed if is_immutable(rel)]
+            report["extra"] = [rel for rel in extra if is_immutable(rel)]
+            missing = sorted(rel for rel in listing if rel not in deployed)
+            report["missing"] = [rel for rel in missing if is_immutable(rel)]
+            report["modified"] = [rel for rel in changed + extra + missing if not is_immutable(rel)]
+
+    hash_cache.save()
+    _save_verified()
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+def problems(report: dict) -> list[str]:
+    """Human-readable list of everything wrong in a verify_pack report."""
+
+    lines = [f"손상된 파일: {rel} ({reason})" for rel, reason in sorted(report["corrupt"].items())]
+    lines += [f"적용된 파일 내용 불일치: {rel}" for rel in report["mismatched"]]
+    lines += [f"적용되지 않은 파일: {rel}" for rel in report["missing"]]
+    lines += [f"팩에 없는 파일: {rel}" for rel in report["extra"]]
+    return lines